@@ -0,0 +1,195 @@
+"""
+AI 쿼리 동시성 제어
+
+- 사용자별 락: 같은 사용자의 대화 턴은 한 번에 하나씩 순서대로 실행
+- 전역 세마포어: 워커당 동시에 실행되는 에이전트 수 제한
+- 대기열 제한: 대기열이 가득 차면 429(사용자별) / 503(전역)으로 거절
+  (check_admission이 자리를 바로 예약하고, 예약은 slot()이 넘겨받음)
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from settings import settings
+
+# ==================== 동시성 설정 ====================
+AGENT_MAX_CONCURRENT_RUNS = settings.agent_max_concurrent_runs  # 워커당 동시 실행 에이전트 수
+AGENT_MAX_QUEUE_DEPTH = settings.agent_max_queue_depth  # 전역 대기열 최대 길이
+AGENT_MAX_QUEUED_TURNS_PER_USER = settings.agent_max_queued_turns_per_user  # 사용자별 대기 가능한 턴 수
+AGENT_QUEUE_TIMEOUT = settings.agent_queue_timeout  # 대기열 최대 대기 시간 (초)
+
+
+class AgentQueueFullError(Exception):
+    """대기열이 가득 차서 요청을 받을 수 없는 경우"""
+    def __init__(self, message: str, status_code: int, retry_after: int = 1):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _UserTurnLock:
+    """사용자별 락과 대기 중인 턴 수"""
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pending = 0  # 실행 중 + 대기 중인 턴 수
+
+
+class AgentAdmission:
+    """check_admission이 예약한 대기열 자리 (slot()이 넘겨받거나 release()로 반환)"""
+    def __init__(self, limiter: "AgentRunLimiter", user_id: str, user_lock: _UserTurnLock):
+        self.limiter = limiter
+        self.user_id = user_id
+        self.user_lock = user_lock
+        self.state = "reserved"  # reserved -> claimed | released
+
+    def claim(self):
+        """slot()이 예약을 넘겨받음 (한 번만 가능)"""
+        if self.state != "reserved":
+            raise RuntimeError(f"이미 사용했거나 반환한 예약입니다: {self.state}")
+        self.state = "claimed"
+
+    def release(self):
+        """실행을 시작하지 못한 예약 반환 (이미 넘겨받았거나 반환했으면 아무것도 하지 않음)"""
+        if self.state != "reserved":
+            return
+        self.state = "released"
+        self.limiter._cancel_admission(self)
+
+
+class AgentRunLimiter:
+    """
+    사용자별 턴 직렬화 + 전역 동시 실행 제한
+
+    slot()은 사용자 락을 먼저 잡고 전역 슬롯을 기다리므로,
+    같은 사용자의 대기 중인 턴이 전역 슬롯을 차지하지 않습니다.
+    """
+    def __init__(
+        self,
+        max_concurrent: int = AGENT_MAX_CONCURRENT_RUNS,
+        max_queue_depth: int = AGENT_MAX_QUEUE_DEPTH,
+        max_queued_per_user: int = AGENT_MAX_QUEUED_TURNS_PER_USER,
+        queue_timeout: float = AGENT_QUEUE_TIMEOUT,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue_depth = max_queue_depth
+        self.max_queued_per_user = max_queued_per_user
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._user_locks: Dict[str, _UserTurnLock] = {}
+        self._running = 0
+        self._waiting = 0
+        self._metrics: Dict[str, float] = {
+            "admitted": 0,
+            "rejected_user_busy": 0,
+            "rejected_queue_full": 0,
+            "queue_timeouts": 0,
+            "queue_wait_count": 0,
+            "queue_wait_total_ms": 0.0,
+            "queue_wait_max_ms": 0.0,
+        }
+
+    def check_admission(self, user_id: str) -> AgentAdmission:
+        """
+        대기열 자리를 예약합니다. 가득 차 있으면 AgentQueueFullError (429 사용자별 / 503 전역)
+        (스트리밍 응답을 시작하기 전에 거절하기 위해 사용)
+
+        검사와 예약 사이에 await가 없으므로 한꺼번에 들어온 요청도 한도를 넘지 못합니다.
+        돌려받은 예약은 slot()에 넘기거나, 실행하지 않게 되면 release()로 반환해야 합니다.
+        """
+        user_lock = self._user_locks.get(user_id)
+        if user_lock is not None and user_lock.pending > self.max_queued_per_user:
+            self._metrics["rejected_user_busy"] += 1
+            raise AgentQueueFullError(
+                "이전 질문을 처리 중입니다. 잠시 후 다시 시도하세요.",
+                status_code=429,
+            )
+        if self._waiting >= self.max_queue_depth:
+            self._metrics["rejected_queue_full"] += 1
+            raise AgentQueueFullError(
+                "서버가 혼잡합니다. 잠시 후 다시 시도하세요.",
+                status_code=503,
+                retry_after=5,
+            )
+        user_lock = self._user_locks.setdefault(user_id, _UserTurnLock())
+        user_lock.pending += 1
+        self._waiting += 1
+        return AgentAdmission(self, user_id, user_lock)
+
+    @asynccontextmanager
+    async def slot(self, user_id: str, admission: Optional[AgentAdmission] = None):
+        """
+        사용자 턴 순서와 전역 슬롯을 확보한 뒤 블록 실행
+        admission이 없으면 여기서 check_admission으로 예약하고, 있으면 그 예약을 넘겨받음
+        """
+        if admission is None:
+            admission = self.check_admission(user_id)
+        admission.claim()
+        user_lock = admission.user_lock
+        started = time.monotonic()
+        acquired_global = False
+        try:
+            try:
+                await asyncio.wait_for(self._acquire(user_lock), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._metrics["queue_timeouts"] += 1
+                raise AgentQueueFullError(
+                    f"{self.queue_timeout}초 동안 실행 순서를 얻지 못했습니다.",
+                    status_code=503,
+                    retry_after=5,
+                )
+            finally:
+                self._waiting -= 1
+                self._record_wait(started)
+            acquired_global = True
+            self._running += 1
+            self._metrics["admitted"] += 1
+            try:
+                yield
+            finally:
+                self._running -= 1
+        finally:
+            if acquired_global:
+                self._semaphore.release()
+                user_lock.lock.release()
+            self._leave(user_id, user_lock)
+
+    def _cancel_admission(self, admission: "AgentAdmission"):
+        """slot()에 넘겨지지 않은 예약 반환"""
+        self._waiting -= 1
+        self._leave(admission.user_id, admission.user_lock)
+
+    def _leave(self, user_id: str, user_lock: _UserTurnLock):
+        user_lock.pending -= 1
+        if user_lock.pending == 0 and self._user_locks.get(user_id) is user_lock:
+            del self._user_locks[user_id]
+
+    async def _acquire(self, user_lock: _UserTurnLock):
+        """사용자 락 -> 전역 세마포어 순서로 획득 (취소되면 잡은 것을 되돌림)"""
+        await user_lock.lock.acquire()
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            user_lock.lock.release()
+            raise
+
+    def _record_wait(self, started: float):
+        waited_ms = (time.monotonic() - started) * 1000
+        self._metrics["queue_wait_count"] += 1
+        self._metrics["queue_wait_total_ms"] += waited_ms
+        self._metrics["queue_wait_max_ms"] = max(self._metrics["queue_wait_max_ms"], waited_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """동시성/대기열 지표 조회"""
+        stats: Dict[str, Any] = dict(self._metrics)
+        stats["running"] = self._running
+        stats["waiting"] = self._waiting
+        stats["active_users"] = len(self._user_locks)
+        stats["max_concurrent"] = self.max_concurrent
+        stats["max_queue_depth"] = self.max_queue_depth
+        stats["queue_wait_avg_ms"] = (
+            stats["queue_wait_total_ms"] / stats["queue_wait_count"]
+            if stats["queue_wait_count"] else 0.0
+        )
+        return stats
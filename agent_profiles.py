@@ -0,0 +1,91 @@
+"""
+ClaudeAgentOptions 프로필 레지스트리
+
+모델 + 도구 구성 + 시스템 프롬프트 조합(프로필)마다 ClaudeAgentOptions 템플릿을
+시작 시 한 번만 만들어 두고, 요청마다 resume만 바꾼 복사본을 사용합니다.
+복사본의 list/dict(mcp_servers, allowed_tools, env 등)도 새로 만들므로 요청에서 바꿔도 템플릿에 남지 않고,
+MCP 서버 인스턴스 같은 객체만 템플릿과 공유합니다. (요청마다 서버를 다시 만들지 않도록)
+(증분 스트리밍 요청은 include_partial_messages도 복사본에서만 켭니다.)
+"""
+
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, List, Optional
+from claude_agent_sdk import ClaudeAgentOptions
+from settings import settings
+
+DEFAULT_AGENT_PROFILE = settings.default_agent_profile
+
+
+class UnknownProfileError(KeyError):
+    """등록되지 않은 프로필을 요청한 경우"""
+
+
+def _copy_containers(value: Any) -> Any:
+    """중첩된 list/dict만 새로 만들고 그 안의 객체(MCP 서버 인스턴스 등)는 그대로 공유"""
+    if isinstance(value, dict):
+        return {key: _copy_containers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class AgentProfile:
+    """이름이 붙은 옵션 템플릿"""
+    name: str
+    options: ClaudeAgentOptions
+
+    def build_options(self, resume: Optional[str] = None, include_partial_messages: bool = False) -> ClaudeAgentOptions:
+        """resume(과 부분 메시지 여부)만 설정한 요청용 옵션 복사본 생성 (list/dict 필드도 복사)"""
+        containers = {
+            field.name: _copy_containers(value)
+            for field in fields(self.options)
+            if isinstance(value := getattr(self.options, field.name), (dict, list))
+        }
+        return replace(
+            self.options,
+            resume=resume,
+            include_partial_messages=include_partial_messages,
+            **containers,
+        )
+
+
+class AgentProfileRegistry:
+    """
+    프로필 이름 -> 옵션 템플릿
+    """
+    def __init__(self):
+        self._profiles: Dict[str, AgentProfile] = {}
+
+    def register(self, name: str, options: ClaudeAgentOptions) -> AgentProfile:
+        """프로필 등록 (resume이 설정된 템플릿은 허용하지 않음)"""
+        if options.resume is not None:
+            raise ValueError("프로필 템플릿에는 resume을 설정할 수 없습니다.")
+        profile = AgentProfile(name=name, options=options)
+        self._profiles[name] = profile
+        return profile
+
+    def get(self, name: Optional[str] = None) -> AgentProfile:
+        """프로필 조회 (name이 없으면 기본 프로필)"""
+        name = name or DEFAULT_AGENT_PROFILE
+        profile = self._profiles.get(name)
+        if profile is None:
+            raise UnknownProfileError(name)
+        return profile
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._profiles
+
+    def names(self) -> List[str]:
+        """등록된 프로필 이름 목록"""
+        return list(self._profiles)
+
+    def is_loaded(self) -> bool:
+        return bool(self._profiles)
+
+
+# 전역 프로필 레지스트리
+_profile_registry = AgentProfileRegistry()
+def get_profile_registry() -> AgentProfileRegistry:
+    """전역 프로필 레지스트리를 가져오기"""
+    return _profile_registry
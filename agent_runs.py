@@ -0,0 +1,184 @@
+"""
+HTTP 연결과 분리된 에이전트 실행(run)
+
+에이전트 턴은 백그라운드 작업으로 실행되어 run별 이벤트 버퍼(ReplayStream)에 쌓입니다.
+- 브라우저 탭을 닫아도 실행은 끝까지 진행되고, 결과는 버퍼에 남음 (끝난 뒤 SSE_REPLAY_TTL초 보관)
+- 같은 run을 여러 연결이 동시에 구독해도 에이전트는 한 번만 실행 (fan-out)
+- 다시 연결하면 Last-Event-ID(또는 after) 이후의 이벤트부터 이어서 받음
+
+/api/mcp/query-sse도 내부적으로 run을 만들고 바로 구독하는 방식입니다.
+이 경우에는 구독자가 모두 끊기고 SSE_DISCONNECT_GRACE초 안에 다시 연결하지 않으면
+실행을 취소합니다. (보는 사람이 없는 응답에 토큰/CPU를 쓰지 않도록)
+POST /api/mcp/runs로 시작한 run은 끊겨도 계속 실행되며 DELETE로만 취소합니다.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+from agent_limiter import AgentAdmission
+from generator import ai_stream_generator
+from sse import SSEEvent, ReplayStream, ReplayStreamRegistry
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+SSE_DISCONNECT_GRACE = settings.sse_disconnect_grace  # 마지막 구독자가 끊긴 뒤 취소까지 재연결을 기다리는 시간 (초)
+
+RUN_STATUSES = ("running", "completed", "failed", "cancelled")
+
+
+class AgentRun(ReplayStream):
+    """에이전트 실행 한 번 (이벤트 버퍼 + 실행 상태)"""
+    def __init__(
+        self,
+        user_id: str,
+        profile: Optional[str] = None,
+        incremental: bool = False,
+        cancel_on_disconnect: bool = False,
+    ):
+        super().__init__(owner=user_id)
+        self.user_id = user_id
+        self.profile = profile
+        self.incremental = incremental
+        self.cancel_on_disconnect = cancel_on_disconnect
+        self.status = "running"
+        self.cancel_reason: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.completed_at: Optional[datetime] = None
+
+    def cancel(self, reason: str) -> bool:
+        """
+        실행 취소 (이미 끝났으면 False)
+        작업 취소가 SDK 클라이언트까지 전달되어 interrupt 후 폐기되고, 사용자 슬롯도 반환됩니다.
+        """
+        if self.finished or self.task is None or self.task.done():
+            return False
+        self._set_status("cancelled")
+        self.cancel_reason = reason
+        self.task.cancel()
+        return True
+
+    async def publish(self, event: SSEEvent):
+        if event.type == "done":
+            self._set_status("completed")
+        elif event.type == "error":
+            self._set_status("failed")
+        await super().publish(event)
+
+    async def finish(self):
+        if self.status == "cancelled" and not self.finished:
+            # 남아 있는 구독자(다른 탭 등)에게 취소를 알림
+            await super().publish(SSEEvent.error("실행이 취소되었습니다.", code="cancelled"))
+        # done/error 없이 끝난 경우(결과 메시지 없음)도 완료로 처리
+        self._set_status("completed")
+        await super().finish()
+
+    def _set_status(self, status: str):
+        if self.status == "running":
+            self.status = status
+            self.completed_at = datetime.utcnow()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상태 조회 응답"""
+        return {
+            "run_id": self.id,
+            "user_id": self.user_id,
+            "profile": self.profile,
+            "incremental": self.incremental,
+            "status": self.status,
+            "cancel_reason": self.cancel_reason,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "last_event_id": f"{self.id}:{self.last_seq}" if self.last_seq else None,
+            "events": self.last_seq,
+            "viewers": self.viewers,
+        }
+
+
+class AgentRunManager(ReplayStreamRegistry):
+    """
+    run_id -> AgentRun
+    """
+    def __init__(self, disconnect_grace: float = SSE_DISCONNECT_GRACE, **kwargs):
+        super().__init__(**kwargs)
+        self.disconnect_grace = disconnect_grace
+        self._grace_tasks: Set[asyncio.Task] = set()
+        self._metrics.update({"cancelled_disconnect": 0, "cancelled_by_user": 0})
+
+    def start_run(
+        self,
+        prompt: str,
+        user_id: str,
+        profile: Optional[str] = None,
+        incremental: bool = False,
+        cancel_on_disconnect: bool = False,
+        admission: Optional[AgentAdmission] = None,
+    ) -> AgentRun:
+        """
+        run을 등록하고 백그라운드에서 에이전트 실행 시작
+        admission: check_admission으로 예약한 대기열 자리 (실행이 넘겨받음)
+        실행이 예약을 넘겨받기 전에 끝나면(시작 전 취소, 시작 실패) 예약을 반환합니다.
+        """
+        try:
+            run = AgentRun(user_id, profile, incremental, cancel_on_disconnect)
+            self.add(run)
+            run.start(ai_stream_generator(prompt, user_id, profile, incremental, admission))
+        except BaseException:
+            if admission is not None:
+                admission.release()
+            raise
+        if admission is not None:
+            run.task.add_done_callback(lambda _: admission.release())
+        return run
+
+    def cancel_run(self, run: AgentRun) -> bool:
+        """사용자 요청으로 실행 취소 (DELETE /api/mcp/runs/{id})"""
+        cancelled = run.cancel("user")
+        if cancelled:
+            self._metrics["cancelled_by_user"] += 1
+            logger.info("🛑 실행 취소: run_id=%s user_id=%s", run.id, run.user_id)
+        return cancelled
+
+    def on_viewer_left(self, stream: ReplayStream):
+        """연결과 묶인 run은 구독자가 모두 끊기면 유예 시간 뒤 취소"""
+        run = stream
+        if not run.cancel_on_disconnect or run.viewers > 0 or run.finished:
+            return
+        task = asyncio.create_task(self._cancel_if_abandoned(run))
+        self._grace_tasks.add(task)
+        task.add_done_callback(self._grace_tasks.discard)
+
+    async def _cancel_if_abandoned(self, run: AgentRun):
+        if self.disconnect_grace > 0:
+            await asyncio.sleep(self.disconnect_grace)
+        # 유예 시간 안에 Last-Event-ID로 다시 연결했으면 계속 실행
+        if run.viewers == 0 and run.cancel("disconnected"):
+            self._metrics["cancelled_disconnect"] += 1
+            logger.info("🔌 연결이 끊겨 실행 취소: run_id=%s user_id=%s", run.id, run.user_id)
+
+    async def shutdown(self):
+        for task in list(self._grace_tasks):
+            task.cancel()
+        for run in list(self._streams.values()):
+            run.cancel("shutdown")
+        await super().shutdown()
+
+    def get_run(self, run_id: str, user_id: str) -> Optional[AgentRun]:
+        """run 조회 (다른 사용자의 run은 없는 것으로 처리)"""
+        run = self.get(run_id)
+        if run is None or run.user_id != user_id:
+            return None
+        return run
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        statuses = {status: 0 for status in RUN_STATUSES}
+        for run in self._streams.values():
+            statuses[run.status] = statuses.get(run.status, 0) + 1
+        stats["runs_by_status"] = statuses
+        return stats
+
+
+# 전역 에이전트 실행 레지스트리
+agent_runs = AgentRunManager()
@@ -0,0 +1,79 @@
+"""
+인증 사용자(principal) 캐시
+
+get_current_user가 요청마다 DB에서 사용자를 다시 읽지 않도록
+인증에 필요한 최소 정보(id, is_active, is_admin)를 짧은 TTL로 캐시합니다.
+사용자 수정/삭제 시 crud에서 명시적으로 무효화합니다.
+(프로세스 내부 캐시이므로 다른 워커에는 TTL이 지나야 반영됩니다.)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from ttl_store import LRUTTLStore
+from settings import settings
+
+# ==================== 인증 캐시 설정 ====================
+AUTH_CACHE_TTL = settings.auth_cache_ttl  # 캐시 유효 시간 (초)
+AUTH_CACHE_MAX_ENTRIES = settings.auth_cache_max_entries  # 최대 캐시 사용자 수
+# true이면 토큰에 서명된 is_active/is_admin 클레임을 만료 시까지 신뢰 (DB/캐시 조회 없음)
+AUTH_TRUST_TOKEN_CLAIMS = settings.auth_trust_token_claims
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """인증된 사용자의 최소 정보"""
+    id: int
+    is_active: bool
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user) -> "AuthPrincipal":
+        return cls(id=user.id, is_active=user.is_active, is_admin=user.is_admin)
+
+
+class AuthPrincipalCache:
+    """
+    user_id -> AuthPrincipal TTL 캐시
+    """
+    def __init__(self, max_entries: int = AUTH_CACHE_MAX_ENTRIES, ttl: float = AUTH_CACHE_TTL):
+        self._store: LRUTTLStore[int, AuthPrincipal] = LRUTTLStore(
+            max_entries=max_entries, ttl=ttl, sliding=False
+        )
+        # 조회 중에 무효화가 일어나면 DB에서 읽은 (이미 오래된) 권한을 캐시하지 않도록 세대 번호 사용
+        self._generation = 0
+        self._invalidations = 0
+        self._claims_trusted = 0
+
+    def get(self, user_id: int) -> Optional[AuthPrincipal]:
+        return self._store.get(user_id)
+
+    def begin_load(self) -> int:
+        """DB 조회 직전에 호출, 반환값을 set()에 넘김"""
+        return self._generation
+
+    def set(self, principal: AuthPrincipal, generation: Optional[int] = None):
+        """DB에서 읽은 인증 정보를 캐시 (조회 중 무효화가 있었으면 저장하지 않음)"""
+        if generation is not None and generation != self._generation:
+            return
+        self._store.set(principal.id, principal)
+
+    def invalidate(self, user_id: int):
+        """사용자 정보가 바뀌었을 때 캐시 제거"""
+        self._generation += 1
+        if self._store.pop(user_id) is not None:
+            self._invalidations += 1
+
+    def record_claims_trusted(self):
+        self._claims_trusted += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중률/무효화 지표 조회"""
+        stats = self._store.get_stats()
+        stats["invalidations"] = self._invalidations
+        stats["claims_trusted"] = self._claims_trusted
+        stats["trust_token_claims"] = AUTH_TRUST_TOKEN_CLAIMS
+        return stats
+
+
+# 전역 인증 캐시
+auth_principal_cache = AuthPrincipalCache()
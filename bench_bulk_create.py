@@ -0,0 +1,80 @@
+"""
+사용자 대량 생성 벤치마크 - 단건 생성 반복 vs bulk_create_users
+
+같은 수의 사용자를 create_user 반복(행마다 해싱 1번 + INSERT/COMMIT)과
+bulk_create_users(청크 단위 병렬 해싱 + 다중 행 INSERT)로 만들어 처리량을 비교합니다.
+해싱 비용이 지배적이므로 PASSWORD_BCRYPT_ROUNDS를 낮춰 DB 쪽 차이만 볼 수도 있습니다.
+
+사용법:
+    $> python bench_bulk_create.py --users 500
+    $> PASSWORD_BCRYPT_ROUNDS=4 DATABASE_URL="sqlite:///bench.db" python bench_bulk_create.py --users 5000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+from database import Base, async_engine, AsyncSessionLocal
+from password_hasher import password_hasher
+from schemas import UserCreate
+import crud_async
+
+
+def make_users(count: int, prefix: str) -> List[UserCreate]:
+    return [
+        UserCreate(
+            email=f"{prefix}{i}@example.com",
+            username=f"{prefix}{i}",
+            full_name=f"Bulk User {i}",
+            password="benchmark-password",
+        )
+        for i in range(count)
+    ]
+
+
+async def run_single(users: List[UserCreate]) -> float:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for user in users:
+            await crud_async.create_user(db, user)
+    return time.perf_counter() - started
+
+
+async def run_bulk(users: List[UserCreate], chunk_size: int) -> float:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        results = await crud_async.bulk_create_users(db, users, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for result in results if result["status"] != "created")
+    if failed:
+        print(f"⚠️ 실패한 행: {failed}")
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="단건 생성 반복 vs 대량 생성 벤치마크")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=crud_async.BULK_CREATE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    password_hasher.start()
+    try:
+        # 실행마다 겹치지 않는 이메일/사용자명 사용
+        run_id = uuid.uuid4().hex[:8]
+        single = await run_single(make_users(args.users, f"single{run_id}_"))
+        bulk = await run_bulk(make_users(args.users, f"bulk{run_id}_"), args.chunk_size)
+    finally:
+        password_hasher.shutdown()
+        await async_engine.dispose()
+
+    print(f"{'방식':<20} {'시간 (s)':>10} {'rows/s':>10}")
+    print(f"{'create_user 반복':<20} {single:>10.2f} {args.users / single:>10.1f}")
+    print(f"{'bulk_create_users':<20} {bulk:>10.2f} {args.users / bulk:>10.1f}")
+    print(f"속도 향상: x{single / bulk:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
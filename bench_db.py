@@ -0,0 +1,101 @@
+"""
+DB 경로 벤치마크 - 동기(스레드풀) vs 비동기(AsyncSession)
+
+같은 사용자 조회를 두 경로로 처리하는 엔드포인트를 만들고
+동시 요청을 보내 requests/sec 와 p50/p99 지연 시간을 비교합니다.
+
+사용법:
+    $> python bench_db.py --requests 2000 --concurrency 50
+    $> DATABASE_URL="sqlite:///bench.db" python bench_db.py
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+import httpx
+from fastapi import FastAPI, Depends
+from sqlalchemy import select, func, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import Base, engine, SessionLocal, get_db, get_async_db
+from models import User
+import crud
+import crud_async
+from bench_utils import percentile
+
+bench_app = FastAPI()
+
+@bench_app.get("/sync/users/{user_id}")
+def sync_get_user(user_id: int, db: Session = Depends(get_db)):
+    user = crud.get_user(db, user_id)
+    return {"id": user.id if user else None}
+
+@bench_app.get("/async/users/{user_id}")
+async def async_get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    user = await crud_async.get_user(db, user_id)
+    return {"id": user.id if user else None}
+
+
+def seed_users(count: int, chunk_size: int = 10000) -> int:
+    """벤치마크용 사용자 데이터 생성 (이미 있으면 건너뜀), 최대 id 반환"""
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        existing = db.execute(select(func.count(User.id))).scalar()
+        for start in range(existing, count, chunk_size):
+            db.execute(insert(User), [
+                {
+                    "email": f"bench{i}@example.com",
+                    "username": f"bench{i}",
+                    "full_name": f"Bench User {i}",
+                    "hashed_password": "x",
+                }
+                for i in range(start, min(start + chunk_size, count))
+            ])
+            db.commit()
+        return db.execute(select(func.max(User.id))).scalar()
+
+
+async def run(path: str, max_id: int, total: int, concurrency: int):
+    latencies: List[float] = []
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = iter(range(total))
+
+        async def worker():
+            for _ in queue:
+                user_id = random.randint(1, max_id)
+                started = time.perf_counter()
+                response = await client.get(f"{path}/{user_id}")
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"{path:<14} {total / elapsed:>9.1f} req/s   "
+        f"p50 {percentile(latencies, 50):>7.2f} ms   p99 {percentile(latencies, 99):>7.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="동기/비동기 DB 경로 벤치마크")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    max_id = seed_users(args.users)
+    # 워밍업 후 측정
+    await run("/sync/users", max_id, min(100, args.requests), args.concurrency)
+    await run("/async/users", max_id, min(100, args.requests), args.concurrency)
+    print("-" * 60)
+    await run("/sync/users", max_id, args.requests, args.concurrency)
+    await run("/async/users", max_id, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
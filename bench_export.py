@@ -0,0 +1,48 @@
+"""
+사용자 내보내기 처리량 벤치마크
+
+/api/users/export가 사용하는 스트리밍 생성기를 직접 소비하면서
+초당 행 수(rows/sec)와 최대 메모리 사용량을 측정합니다.
+
+사용법:
+    $> python bench_export.py --users 500000 --format csv
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from bench_db import seed_users
+from user_export import iter_users_export, parse_export_fields
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="NDJSON/CSV 내보내기 처리량 측정")
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    seed_users(args.users)
+    fields = parse_export_fields()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = 0
+    total_bytes = 0
+    async for chunk in iter_users_export(args.format, fields, batch_size=args.batch_size):
+        rows += chunk.count("\n")
+        total_bytes += len(chunk.encode())
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if args.format == "csv":
+        rows -= 1  # 헤더
+    print(f"형식: {args.format}, 배치: {args.batch_size}")
+    print(f"{rows} rows / {elapsed:.2f}s = {rows / elapsed:,.0f} rows/sec ({total_bytes / elapsed / 1024 / 1024:.1f} MiB/s)")
+    print(f"최대 메모리: {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
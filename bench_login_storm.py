@@ -0,0 +1,101 @@
+"""
+로그인 폭주 부하 테스트
+
+로그인 요청을 대량으로 보내는 동안 다른 엔드포인트(/api/stats, /api/users/{id})의
+지연 시간이 유지되는지 확인합니다. 서버를 먼저 실행한 뒤 사용하세요.
+
+사용법:
+    $> uvicorn main:app --host 127.0.0.1 --port 8000
+    $> python bench_login_storm.py --base-url http://127.0.0.1:8000 --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+import httpx
+from bench_utils import percentile
+
+EMAIL = "storm@example.com"
+USERNAME = "login_storm"
+PASSWORD = "storm-password"
+
+
+async def probe(client: httpx.AsyncClient, user_id: int, stop: asyncio.Event, latencies: List[float]):
+    """가벼운 엔드포인트를 계속 호출하며 지연 시간 측정"""
+    while not stop.is_set():
+        for path in ("/api/stats", f"/api/users/{user_id}"):
+            started = time.perf_counter()
+            await client.get(path)
+            latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def login_storm(client: httpx.AsyncClient, total: int, concurrency: int) -> List[int]:
+    """동시에 로그인 요청을 보내고 상태 코드 목록 반환"""
+    statuses: List[int] = []
+    queue = iter(range(total))
+
+    async def worker():
+        for _ in queue:
+            response = await client.post("/api/login", json={"email": EMAIL, "password": PASSWORD})
+            statuses.append(response.status_code)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses
+
+
+def report(label: str, latencies: List[float]):
+    if not latencies:
+        print(f"{label:<14} 측정값 없음")
+        return
+    print(
+        f"{label:<14} n={len(latencies):<5} "
+        f"p50 {percentile(latencies, 50):>8.2f} ms   p99 {percentile(latencies, 99):>8.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 다른 엔드포인트 지연 시간 측정")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        # 테스트 사용자 준비
+        await client.post("/api/users", json={"email": EMAIL, "username": USERNAME, "password": PASSWORD})
+        response = await client.get("/api/users/search/by-email", params={"email": EMAIL})
+        response.raise_for_status()
+        user_id = response.json()["id"]
+
+        # 1) 기준선: 로그인 없이 측정
+        baseline: List[float] = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, user_id, stop, baseline))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        await task
+
+        # 2) 로그인 폭주 중 측정
+        during: List[float] = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, user_id, stop, during))
+        started = time.perf_counter()
+        statuses = await login_storm(client, args.logins, args.concurrency)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await task
+
+        stats = (await client.get("/api/stats/password-hasher")).json()
+
+    print(f"로그인 {len(statuses)}건 / {elapsed:.2f}s ({len(statuses) / elapsed:.1f} req/s)")
+    print("상태 코드:", {code: statuses.count(code) for code in sorted(set(statuses))})
+    report("기준선", baseline)
+    report("로그인 폭주 중", during)
+    print("해싱 풀:", stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+페이지네이션 벤치마크 - OFFSET vs 키셋(커서)
+
+큰 users 테이블에서 페이지 깊이별로 한 페이지를 읽는 시간을 비교합니다.
+OFFSET은 깊이에 비례해 느려지고, 키셋은 깊이와 관계없이 일정해야 합니다.
+
+사용법:
+    $> python bench_pagination.py --users 500000 --limit 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+from sqlalchemy import select
+from database import AsyncSessionLocal
+from models import User
+from bench_db import seed_users
+import crud_async
+
+
+async def time_page(coro_factory, repeat: int) -> float:
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="OFFSET/키셋 페이지네이션 깊이별 지연 시간")
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    max_id = seed_users(args.users)
+    depths = [0, 1000, 10000, 100000, args.users // 2, args.users - args.limit]
+    depths = sorted({d for d in depths if 0 <= d < max_id})
+
+    print(f"{'depth':>10} {'offset (ms)':>12} {'cursor (ms)':>12}")
+    async with AsyncSessionLocal() as db:
+        for depth in depths:
+            # 같은 위치의 키셋 커서: depth 번째 행의 id
+            after_id = (await db.execute(
+                select(User.id).order_by(User.id).offset(depth).limit(1)
+            )).scalar() if depth else None
+            after = (after_id,) if after_id is not None else None
+
+            offset_ms = await time_page(lambda: crud_async.get_users(db, skip=depth, limit=args.limit), args.repeat)
+            cursor_ms = await time_page(lambda: crud_async.get_users_after(db, after=after, limit=args.limit), args.repeat)
+            print(f"{depth:>10} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+비밀번호 해싱 비용 벤치마크
+
+해싱 방식/비용 설정별로 해시 생성과 검증에 걸리는 시간을 측정합니다.
+노드별 로그인 CPU 비용을 조정할 때 PASSWORD_* 환경 변수 값을 고르는 데 사용합니다.
+
+사용법:
+    $> python bench_password.py --iterations 5
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict, List
+from security import build_crypt_context
+
+# (이름, build_crypt_context 인자)
+PROFILES: List[tuple] = [
+    ("bcrypt rounds=10", {"schemes": ["bcrypt"], "bcrypt_rounds": 10}),
+    ("bcrypt rounds=12", {"schemes": ["bcrypt"], "bcrypt_rounds": 12}),
+    ("bcrypt rounds=14", {"schemes": ["bcrypt"], "bcrypt_rounds": 14}),
+    ("argon2 m=19MiB t=2 p=1", {"schemes": ["argon2"], "argon2_memory_cost": 19456, "argon2_time_cost": 2, "argon2_parallelism": 1}),
+    ("argon2 m=64MiB t=3 p=4", {"schemes": ["argon2"], "argon2_memory_cost": 65536, "argon2_time_cost": 3, "argon2_parallelism": 4}),
+]
+
+
+def measure(kwargs: Dict, iterations: int) -> Dict[str, float]:
+    context = build_crypt_context(**kwargs)
+    hash_times: List[float] = []
+    verify_times: List[float] = []
+    hashed = context.hash("benchmark-password")
+    for _ in range(iterations):
+        started = time.perf_counter()
+        hashed = context.hash("benchmark-password")
+        hash_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        context.verify("benchmark-password", hashed)
+        verify_times.append((time.perf_counter() - started) * 1000)
+    return {
+        "hash_ms": statistics.median(hash_times),
+        "verify_ms": statistics.median(verify_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비밀번호 해싱 방식별 비용 측정")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'설정':<26} {'hash (ms)':>10} {'verify (ms)':>12} {'logins/s/core':>14}")
+    for name, kwargs in PROFILES:
+        try:
+            result = measure(kwargs, args.iterations)
+        except Exception as e:  # argon2-cffi 미설치 등
+            print(f"{name:<26} 건너뜀: {e}")
+            continue
+        print(
+            f"{name:<26} {result['hash_ms']:>10.1f} {result['verify_ms']:>12.1f} "
+            f"{1000 / result['verify_ms']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+사용자 검색 벤치마크 - 접두어(인덱스) vs 부분 문자열(전체 스캔)
+
+큰 users 테이블에서 search_users(LIKE 'q%')와 LIKE '%q%' 검색의 지연 시간을 비교합니다.
+접두어 검색은 테이블 크기와 관계없이 빨라야 하고, 부분 문자열 검색은 행 수에 비례해 느려집니다.
+MySQL에서는 --fulltext로 FULLTEXT 랭킹 검색도 측정합니다.
+
+사용법:
+    $> python bench_search.py --users 500000
+    $> DATABASE_URL="sqlite:///bench.db" python bench_search.py --users 200000 --queries 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, List
+from sqlalchemy import select, or_
+from database import AsyncSessionLocal
+from models import User
+from bench_db import seed_users
+from bench_utils import percentile
+import crud_async
+
+
+async def measure(name: str, queries: List[str], run: Callable[[str], Awaitable[list]]):
+    latencies: List[float] = []
+    rows = 0
+    for q in queries:
+        started = time.perf_counter()
+        rows += len(await run(q))
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{name:<24} p50 {percentile(latencies, 50):>8.2f} ms   p99 {percentile(latencies, 99):>8.2f} ms   "
+        f"평균 결과 {rows / len(queries):>5.1f}건"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="접두어 검색 vs 부분 문자열 검색 지연 시간")
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--fulltext", action="store_true", help="MySQL FULLTEXT 랭킹 검색도 측정")
+    args = parser.parse_args()
+
+    seed_users(args.users)
+    # seed_users 데이터: username=bench{i}, email=bench{i}@example.com, full_name="Bench User {i}"
+    numbers = [str(random.randrange(args.users)) for _ in range(args.queries)]
+    username_queries = [f"bench{n[:4]}" for n in numbers]
+    full_name_queries = [f"Bench User {n[:4]}" for n in numbers]
+
+    async with AsyncSessionLocal() as db:
+        async def contains(q: str) -> list:
+            # 비교용: 인덱스를 쓸 수 없는 부분 문자열 검색
+            pattern = f"%{q}%"
+            stmt = (
+                select(User)
+                .where(or_(User.username.like(pattern), User.email.like(pattern), User.full_name.like(pattern)))
+                .order_by(User.id)
+                .limit(args.limit)
+            )
+            return list((await db.execute(stmt)).scalars().all())
+
+        async def contains_miss(q: str) -> list:
+            # 결과가 적은 검색어는 LIMIT으로 일찍 끝나지 않고 전체를 읽음
+            return await contains(q + "-없음")
+
+        await measure("prefix username", username_queries,
+                      lambda q: crud_async.search_users(db, q, ["username"], limit=args.limit))
+        await measure("prefix full_name", full_name_queries,
+                      lambda q: crud_async.search_users(db, q, ["full_name"], limit=args.limit))
+        await measure("prefix 전체 필드", username_queries,
+                      lambda q: crud_async.search_users(db, q, limit=args.limit))
+        await measure("prefix 결과 없음", [q + "-없음" for q in username_queries],
+                      lambda q: crud_async.search_users(db, q, limit=args.limit))
+        await measure("contains (%q%)", username_queries, contains)
+        await measure("contains 결과 없음", username_queries, contains_miss)
+        if args.fulltext:
+            await measure("fulltext", username_queries,
+                          lambda q: crud_async.search_users_fulltext(db, q, limit=args.limit))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
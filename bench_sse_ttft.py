@@ -0,0 +1,82 @@
+"""
+AI 스트리밍 첫 토큰 시간(TTFT) 벤치마크 - 블록 모드 vs 증분(incremental) 모드
+
+/api/mcp/query-sse를 두 모드로 번갈아 호출하면서
+요청 후 첫 텍스트 이벤트까지의 시간, 전체 응답 시간, 이벤트 수/바이트를 비교합니다.
+서버를 먼저 실행한 뒤 사용하세요. (실제 Claude API를 호출합니다)
+
+사용법:
+    $> uvicorn main:app --host 127.0.0.1 --port 8000
+    $> python bench_sse_ttft.py --base-url http://127.0.0.1:8000 --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+import httpx
+from bench_utils import percentile
+
+DEFAULT_QUERY = "1부터 5까지의 숫자를 더하는 과정을 한 단계씩 자세히 설명해 주세요"
+
+
+async def run_once(client: httpx.AsyncClient, query: str, user_id: str, incremental: bool) -> Dict[str, float]:
+    """한 번 호출하고 TTFT/전체 시간(ms), 이벤트 수, 응답 바이트 수 반환"""
+    params = {"query": query, "user_id": user_id, "incremental": str(incremental).lower()}
+    started = time.perf_counter()
+    ttft = None
+    events = 0
+    size = 0
+    event_type = "message"
+    async with client.stream("GET", "/api/mcp/query-sse", params=params) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            size += len(line.encode("utf-8")) + 1
+            if line.startswith("event: "):
+                event_type = line[len("event: "):]
+                continue
+            if not line.startswith("data: "):
+                continue
+            events += 1
+            data = json.loads(line[len("data: "):])
+            if ttft is None and event_type in ("text", "delta", "tool_result") and data.get("text"):
+                ttft = (time.perf_counter() - started) * 1000
+            if event_type in ("done", "error"):
+                break
+    total = (time.perf_counter() - started) * 1000
+    return {"ttft": ttft if ttft is not None else total, "total": total, "events": events, "bytes": size}
+
+
+def report(label: str, results: List[Dict[str, float]]):
+    ttft = [r["ttft"] for r in results]
+    total = [r["total"] for r in results]
+    print(
+        f"{label:<12} TTFT p50 {percentile(ttft, 50):>8.0f} ms  p99 {percentile(ttft, 99):>8.0f} ms   "
+        f"전체 p50 {percentile(total, 50):>8.0f} ms   "
+        f"이벤트 {sum(r['events'] for r in results) / len(results):>6.1f}개  "
+        f"{sum(r['bytes'] for r in results) / len(results):>8.0f} B"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="블록 모드 vs 증분 모드 첫 토큰 시간")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--query", default=DEFAULT_QUERY)
+    args = parser.parse_args()
+
+    results: Dict[bool, List[Dict[str, float]]] = {False: [], True: []}
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=None) as client:
+        for i in range(args.runs):
+            # 모드를 번갈아 실행해 API 지연 변화가 한쪽에만 반영되지 않게 함
+            for incremental in (False, True):
+                result = await run_once(client, args.query, f"bench-ttft-{i}-{int(incremental)}", incremental)
+                results[incremental].append(result)
+
+    report("block", results[False])
+    report("incremental", results[True])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,12 @@
+"""
+벤치마크 스크립트 공통 도구
+"""
+
+from typing import List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """백분위 값 (nearest-rank, 예: pct=99 -> p99)"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
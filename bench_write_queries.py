@@ -0,0 +1,75 @@
+"""
+쓰기 경로 쿼리 수 / 지연 시간 측정
+
+create_user / update_user / delete_user 한 번에 실행되는 SQL 문장 수와 평균 지연 시간을 측정합니다.
+(count_queries는 before_cursor_execute 이벤트로 문장을 셉니다.)
+
+사용법:
+    $> python bench_write_queries.py --iterations 50
+    $> PASSWORD_BCRYPT_ROUNDS=4 DATABASE_URL="sqlite:///bench.db" python bench_write_queries.py
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List
+from database import Base, async_engine, AsyncSessionLocal
+from db_metrics import count_queries
+from password_hasher import password_hasher
+from schemas import UserCreate, UserUpdate
+import crud_async
+
+
+def summarize(name: str, samples: List[List[str]], latencies: List[float]):
+    kinds = Counter(kind for queries in samples for kind in queries)
+    per_op = ", ".join(f"{kind} {count / len(samples):.1f}" for kind, count in sorted(kinds.items()))
+    avg_queries = sum(len(queries) for queries in samples) / len(samples)
+    avg_ms = sum(latencies) / len(latencies)
+    print(f"{name:<14} {avg_queries:>8.1f} {avg_ms:>10.2f}   {per_op}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="쓰기 작업당 쿼리 수 측정")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    password_hasher.start()
+
+    samples: Dict[str, List[List[str]]] = {"create_user": [], "update_user": [], "delete_user": []}
+    latencies: Dict[str, List[float]] = {name: [] for name in samples}
+
+    async def measure(name: str, coro):
+        with count_queries() as queries:
+            started = time.perf_counter()
+            result = await coro
+            latencies[name].append((time.perf_counter() - started) * 1000)
+        samples[name].append(queries)
+        return result
+
+    try:
+        run_id = uuid.uuid4().hex[:8]
+        async with AsyncSessionLocal() as db:
+            for i in range(args.iterations):
+                user = await measure("create_user", crud_async.create_user(db, UserCreate(
+                    email=f"write{run_id}_{i}@example.com",
+                    username=f"write{run_id}_{i}",
+                    password="benchmark-password",
+                )))
+                # 해싱 비용을 빼고 DB 왕복만 보도록 비밀번호는 바꾸지 않음
+                await measure("update_user", crud_async.update_user(db, user.id, UserUpdate(full_name=f"Writer {i}")))
+                await measure("delete_user", crud_async.delete_user(db, user.id))
+    finally:
+        password_hasher.shutdown()
+        await async_engine.dispose()
+
+    print(f"{'작업':<14} {'쿼리/회':>8} {'평균 ms':>10}   문장 종류별 평균")
+    for name in samples:
+        summarize(name, samples[name], latencies[name])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,261 @@
+"""
+ClaudeSDKClient 풀 - 사용자별로 연결된 클라이언트를 재사용
+
+매 요청마다 CLI 서브프로세스를 띄우고 MCP 핸드셰이크를 하는 대신,
+사용자마다 연결된(warm) 클라이언트 하나를 유지하고 다음 쿼리에서 재사용합니다.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Set
+from claude_agent_sdk import ClaudeSDKClient
+from settings import settings
+
+# ==================== 풀 설정 ====================
+CLIENT_POOL_MAX_CLIENTS = settings.client_pool_max_clients  # 동시에 살아있는 서브프로세스 최대 수
+CLIENT_POOL_IDLE_TIMEOUT = settings.client_pool_idle_timeout  # 유휴 클라이언트 종료 시간 (초)
+CLIENT_POOL_ACQUIRE_TIMEOUT = settings.client_pool_acquire_timeout  # 클라이언트 대기 최대 시간 (초)
+
+
+class ClientPoolTimeoutError(Exception):
+    """풀에서 클라이언트를 제한 시간 안에 얻지 못한 경우"""
+
+
+class PooledClient:
+    """
+    풀에 보관되는 클라이언트 항목
+
+    클라이언트의 connect/disconnect는 전용 owner 태스크 안에서만 수행합니다.
+    (SDK 내부 task group은 연결한 태스크와 같은 태스크에서 종료되어야 합니다.)
+    """
+    def __init__(self, user_id: str, options_key: Any):
+        self.user_id = user_id
+        self.options_key = options_key
+        self.client: Any = None
+        self.in_use = False
+        self.last_used = time.monotonic()
+        self.ready = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.owner_task: Optional[asyncio.Task] = None
+        self.error: Optional[BaseException] = None
+        self.discard_on_release = False
+
+
+class ClientPool:
+    """
+    사용자별 ClaudeSDKClient 풀
+
+    client_factory는 ClaudeSDKClient와 같은 인터페이스(비동기 컨텍스트 매니저,
+    query(), receive_response(), interrupt())를 가진 객체를 만들면 되므로 테스트에서는
+    가짜 클라이언트를 넣어 사용할 수 있습니다.
+    """
+    def __init__(
+        self,
+        client_factory: Callable[..., Any] = ClaudeSDKClient,
+        max_clients: int = CLIENT_POOL_MAX_CLIENTS,
+        idle_timeout: float = CLIENT_POOL_IDLE_TIMEOUT,
+        acquire_timeout: float = CLIENT_POOL_ACQUIRE_TIMEOUT,
+    ):
+        self.client_factory = client_factory
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.clients: Dict[str, PooledClient] = {}
+        self._condition = asyncio.Condition()
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._closing_tasks: Set[asyncio.Task] = set()
+        self._metrics: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "closed": 0,
+            "idle_evictions": 0,
+            "capacity_evictions": 0,
+            "acquire_timeouts": 0,
+            "acquire_wait_count": 0,
+            "acquire_wait_total_ms": 0.0,
+            "acquire_wait_max_ms": 0.0,
+        }
+
+    # ---------- 수명 주기 ----------
+    def start(self):
+        """유휴 클라이언트 정리 태스크 시작"""
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reap_idle_loop())
+
+    async def shutdown(self):
+        """정리 태스크를 멈추고 모든 클라이언트 종료"""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        async with self._condition:
+            for entry in list(self.clients.values()):
+                self._close_entry(entry)
+        if self._closing_tasks:
+            await asyncio.gather(*self._closing_tasks, return_exceptions=True)
+
+    # ---------- 클라이언트 획득/반환 ----------
+    @asynccontextmanager
+    async def acquire(self, user_id: str, options, options_key: Any = None):
+        """
+        사용자 클라이언트를 빌려옵니다.
+
+        블록이 정상 종료되면 클라이언트는 풀로 돌아가고,
+        예외/취소로 끝나면 응답이 중간에 남아 있을 수 있으므로 폐기합니다.
+        """
+        entry = await self._checkout(user_id, options, options_key)
+        try:
+            yield entry.client
+        except BaseException:
+            await self._release(entry, discard=True)
+            raise
+        else:
+            await self._release(entry, discard=False)
+
+    async def _checkout(self, user_id: str, options, options_key: Any) -> PooledClient:
+        started = time.monotonic()
+        deadline = started + self.acquire_timeout
+        async with self._condition:
+            while True:
+                entry = self.clients.get(user_id)
+                if entry is not None and entry.options_key != options_key and not entry.in_use:
+                    # 옵션(프로필)이 바뀌면 기존 클라이언트는 재사용할 수 없음
+                    self._close_entry(entry)
+                    entry = None
+
+                if entry is not None and not entry.in_use:
+                    entry.in_use = True
+                    self._metrics["hits"] += 1
+                    self._record_wait(started)
+                    return entry
+
+                if entry is None and self._make_room():
+                    entry = PooledClient(user_id, options_key)
+                    entry.in_use = True
+                    self.clients[user_id] = entry
+                    self._metrics["misses"] += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["acquire_timeouts"] += 1
+                    self._record_wait(started)
+                    raise ClientPoolTimeoutError(
+                        f"{self.acquire_timeout}초 안에 클라이언트를 얻지 못했습니다. (user_id={user_id})"
+                    )
+                try:
+                    await asyncio.wait_for(self._condition.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+        # 연결은 락 밖에서 수행 (느린 서브프로세스 시작이 다른 사용자를 막지 않도록)
+        entry.owner_task = asyncio.create_task(self._own_client(entry, options))
+        try:
+            await entry.ready.wait()
+        except BaseException:
+            await self._release(entry, discard=True)
+            raise
+        if entry.error is not None:
+            await self._release(entry, discard=True)
+            raise entry.error
+        self._metrics["created"] += 1
+        self._record_wait(started)
+        return entry
+
+    async def _release(self, entry: PooledClient, discard: bool):
+        async with self._condition:
+            entry.in_use = False
+            entry.last_used = time.monotonic()
+            if discard or entry.discard_on_release:
+                self._close_entry(entry)
+            self._condition.notify_all()
+
+    async def discard(self, user_id: str):
+        """사용자의 클라이언트를 폐기 (사용 중이면 반환 시점에 폐기되도록 표시)"""
+        async with self._condition:
+            entry = self.clients.get(user_id)
+            if entry is None:
+                return
+            if entry.in_use:
+                entry.discard_on_release = True
+            else:
+                self._close_entry(entry)
+
+    # ---------- 내부 동작 ----------
+    async def _own_client(self, entry: PooledClient, options):
+        """클라이언트 연결부터 종료까지 같은 태스크에서 관리"""
+        try:
+            async with self.client_factory(options=options) as client:
+                entry.client = client
+                entry.ready.set()
+                await entry.closing.wait()
+        except BaseException as e:
+            if not entry.ready.is_set():
+                entry.error = e
+                entry.ready.set()
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            if entry.client is not None:
+                self._metrics["closed"] += 1
+
+    def _make_room(self) -> bool:
+        """새 클라이언트 자리가 있는지 확인하고, 없으면 가장 오래된 유휴 클라이언트 정리"""
+        if len(self.clients) < self.max_clients:
+            return True
+        idle = [e for e in self.clients.values() if not e.in_use]
+        if not idle:
+            return False
+        oldest = min(idle, key=lambda e: e.last_used)
+        self._close_entry(oldest)
+        self._metrics["capacity_evictions"] += 1
+        return True
+
+    def _close_entry(self, entry: PooledClient):
+        """풀에서 제거하고 owner 태스크에 종료 신호 전달 (condition 락 안에서 호출)"""
+        self._forget(entry)
+        entry.closing.set()
+        if entry.owner_task is not None and not entry.owner_task.done():
+            self._closing_tasks.add(entry.owner_task)
+            entry.owner_task.add_done_callback(self._closing_tasks.discard)
+
+    def _forget(self, entry: PooledClient):
+        if self.clients.get(entry.user_id) is entry:
+            del self.clients[entry.user_id]
+
+    async def _reap_idle_loop(self):
+        interval = max(self.idle_timeout / 2, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            await self.close_idle()
+
+    async def close_idle(self):
+        """idle_timeout 동안 사용되지 않은 클라이언트 종료"""
+        now = time.monotonic()
+        async with self._condition:
+            for entry in list(self.clients.values()):
+                if not entry.in_use and now - entry.last_used >= self.idle_timeout:
+                    self._close_entry(entry)
+                    self._metrics["idle_evictions"] += 1
+            self._condition.notify_all()
+
+    def _record_wait(self, started: float):
+        waited_ms = (time.monotonic() - started) * 1000
+        self._metrics["acquire_wait_count"] += 1
+        self._metrics["acquire_wait_total_ms"] += waited_ms
+        self._metrics["acquire_wait_max_ms"] = max(self._metrics["acquire_wait_max_ms"], waited_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 지표 조회"""
+        stats: Dict[str, Any] = dict(self._metrics)
+        lookups = stats["hits"] + stats["misses"]
+        stats["live_clients"] = len(self.clients)
+        stats["in_use"] = sum(1 for e in self.clients.values() if e.in_use)
+        stats["max_clients"] = self.max_clients
+        stats["reuse_hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["acquire_wait_avg_ms"] = (
+            stats["acquire_wait_total_ms"] / stats["acquire_wait_count"]
+            if stats["acquire_wait_count"] else 0.0
+        )
+        return stats
@@ -1,10 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, insert, update
 from typing import Optional, List
-from models import User
+from models import User, utcnow
 from schemas import UserCreate, UserUpdate 
-from security import get_password_hash, verify_password
-from datetime import datetime
+from security import get_password_hash, verify_and_update_password
+from auth_cache import auth_principal_cache
 
 from sqlalchemy.orm import Session
 from sqlalchemy import select
@@ -44,38 +44,62 @@ def get_active_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]
 
 # 사용자 생성
 def create_user(db: Session, user: UserCreate) -> User:
-    """새로운 사용자를 생성합니다."""
-    hashed_password = get_password_hash(user.password)
-    db_user = User(
-        email=user.email,
-        username=user.username,
-        full_name=user.full_name,
-        hashed_password=hashed_password
-    )
-    db.add(db_user)
+    """
+    새로운 사용자를 생성합니다.
+    기본값(created_at/updated_at 등)을 미리 채워 INSERT 한 번으로 처리하고,
+    응답은 이미 아는 값과 INSERT로 받은 id로 만듭니다. (커밋 후 refresh SELECT 없음)
+    """
+    now = utcnow()
+    values = {
+        "email": user.email,
+        "username": user.username,
+        "full_name": user.full_name,
+        "hashed_password": get_password_hash(user.password),
+        "is_active": True,
+        "is_admin": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+    result = db.execute(insert(User).values(**values))
     db.commit()
-    db.refresh(db_user)
-    return db_user
+    # 세션에 올리지 않은 객체이므로 커밋 후에도 만료되지 않음
+    return User(id=result.inserted_primary_key[0], **values)
 
 # 사용자 업데이트
 def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
-    """사용자 정보를 업데이트합니다."""
-    db_user = get_user(db, user_id)
-    if not db_user:
-        return None
-    
+    """
+    사용자 정보를 업데이트합니다.
+    행을 먼저 읽지 않고 UPDATE ... WHERE id 한 문장으로 처리하며,
+    RETURNING을 지원하면 갱신된 행을 함께 받고 아니면 한 번 더 조회합니다. (커밋 후 refresh SELECT 없음)
+    """
     update_data = user_update.model_dump(exclude_unset=True)
     
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+    update_data["updated_at"] = utcnow()
     
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
-    
-    db_user.updated_at = datetime.utcnow()
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(**update_data)
+        .execution_options(synchronize_session=False)
+    )
+    use_returning = db.get_bind().dialect.update_returning
+    if use_returning:
+        stmt = stmt.returning(*User.__table__.columns)
+    result = db.execute(stmt)
+    row = result.mappings().one_or_none() if use_returning else None
+    found = row is not None if use_returning else result.rowcount > 0
     db.commit()
-    db.refresh(db_user)
-    return db_user
+    if not found:
+        return None
+    
+    auth_principal_cache.invalidate(user_id)
+    if row is None:
+        # RETURNING 미지원 (MySQL): 갱신된 행 조회
+        row = db.execute(select(*User.__table__.columns).where(User.id == user_id)).mappings().one_or_none()
+    # 세션에 올리지 않은 객체이므로 커밋 후에도 만료되지 않음
+    return User(**row) if row is not None else None
 
 # 사용자 삭제
 def delete_user(db: Session, user_id: int) -> bool:
@@ -86,6 +110,7 @@ def delete_user(db: Session, user_id: int) -> bool:
     
     db.delete(db_user)
     db.commit()
+    auth_principal_cache.invalidate(user_id)
     return True
 
 # 사용자 인증
@@ -94,8 +119,18 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash is not None:
+        # 해시 방식/비용 마이그레이션 (updated_at은 유지)
+        db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(hashed_password=new_hash, updated_at=User.updated_at)
+        )
+        db.commit()
+        user.hashed_password = new_hash
     return user
 
 # 사용자 수 조회
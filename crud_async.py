@@ -0,0 +1,546 @@
+"""
+비동기 CRUD - crud.py의 AsyncSession 버전
+
+API 엔드포인트는 이 모듈을 사용합니다. (crud.py는 동기 경로/스크립트용으로 유지)
+bcrypt 해싱은 CPU 작업이므로 전용 프로세스 풀(password_hasher)에서 실행합니다.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, insert, update, delete, union, and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.mysql import match
+from typing import Callable, Optional, List, Sequence, Tuple, Dict, Any
+from models import User, utcnow
+from schemas import UserCreate, UserUpdate
+from password_hasher import hash_password_async, hash_passwords_async, verify_and_update_password_async
+from auth_cache import auth_principal_cache
+from stats import user_stats
+from user_cache import CachedUser, user_cache
+import re
+from settings import settings
+
+BULK_CREATE_CHUNK_SIZE = settings.bulk_create_chunk_size  # 대량 생성 시 한 트랜잭션에 넣을 행 수
+
+# 중복 필드별 오류 메시지
+CONFLICT_MESSAGES = {
+    "email": "이미 등록된 이메일입니다.",
+    "username": "이미 사용 중인 사용자명입니다.",
+}
+
+
+class UserConflictError(Exception):
+    """이메일/사용자명이 이미 사용 중인 경우"""
+    def __init__(self, field: str):
+        self.field = field
+        self.message = CONFLICT_MESSAGES.get(field, "이미 사용 중인 값입니다.")
+        super().__init__(self.message)
+
+
+class UnsupportedDialectError(Exception):
+    """현재 데이터베이스에서 지원하지 않는 기능인 경우 (예: MySQL 전용 전문 검색)"""
+    def __init__(self, feature: str, dialect: str):
+        self.feature = feature
+        self.dialect = dialect
+        self.message = f"{feature}: 이 데이터베이스({dialect})에서는 지원하지 않습니다."
+        super().__init__(self.message)
+
+# 사용자 조회 (ID)
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """ID로 사용자를 조회합니다."""
+    stmt = select(User).where(User.id == user_id)
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+# 사용자 조회 (Email)
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """이메일로 사용자를 조회합니다."""
+    stmt = select(User).where(User.email == email)
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+# 사용자 조회 (Username)
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    """사용자명으로 사용자를 조회합니다."""
+    stmt = select(User).where(User.username == username)
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+# 캐시를 거치는 사용자 조회 (조회 API용)
+async def get_user_cached(db: AsyncSession, user_id: int) -> Optional[CachedUser]:
+    """ID로 사용자를 조회합니다. (캐시 우선)"""
+    cached = await user_cache.get_by_id(user_id)
+    if cached is not None:
+        return cached
+    generation = user_cache.begin_load()
+    db_user = await get_user(db, user_id)
+    return await user_cache.set(db_user, generation) if db_user else None
+
+async def get_user_by_email_cached(db: AsyncSession, email: str) -> Optional[CachedUser]:
+    """이메일로 사용자를 조회합니다. (캐시 우선)"""
+    cached = await user_cache.get_by_email(email)
+    if cached is not None:
+        return cached
+    generation = user_cache.begin_load()
+    db_user = await get_user_by_email(db, email)
+    return await user_cache.set(db_user, generation) if db_user else None
+
+async def get_user_by_username_cached(db: AsyncSession, username: str) -> Optional[CachedUser]:
+    """사용자명으로 사용자를 조회합니다. (캐시 우선)"""
+    cached = await user_cache.get_by_username(username)
+    if cached is not None:
+        return cached
+    generation = user_cache.begin_load()
+    db_user = await get_user_by_username(db, username)
+    return await user_cache.set(db_user, generation) if db_user else None
+
+# 이메일/사용자명 중복 조회
+async def find_conflicting_user(
+    db: AsyncSession,
+    email: Optional[str] = None,
+    username: Optional[str] = None,
+    exclude_id: Optional[int] = None
+) -> Optional[str]:
+    """
+    이메일 또는 사용자명을 이미 쓰는 사용자가 있으면 충돌한 필드명("email"/"username")을 반환합니다.
+    두 필드를 OR 조건 한 번의 조회로 확인합니다.
+    """
+    conditions = []
+    if email:
+        conditions.append(User.email == email)
+    if username:
+        conditions.append(User.username == username)
+    if not conditions:
+        return None
+    stmt = select(User.email, User.username).where(or_(*conditions))
+    if exclude_id is not None:
+        stmt = stmt.where(User.id != exclude_id)
+    rows = (await db.execute(stmt.limit(2))).all()
+    # 대소문자를 구분하지 않는 collation(MySQL)에서도 같은 값으로 판단
+    if email and any(row.email.lower() == email.lower() for row in rows):
+        return "email"
+    if username and any(row.username.lower() == username.lower() for row in rows):
+        return "username"
+    return ("email" if email else "username") if rows else None
+
+async def _raise_conflict(db: AsyncSession, error: IntegrityError, email: Optional[str], username: Optional[str], exclude_id: Optional[int] = None):
+    """유니크 인덱스 위반을 필드별 UserConflictError로 변환"""
+    await db.rollback()
+    message = str(error.orig).lower()
+    # MySQL: "Duplicate entry '<값>' for key 'users.ix_users_email'" - 값이 아닌 키 이름만 확인
+    if "for key" in message:
+        message = message.rsplit("for key", 1)[1]
+    if "email" in message:
+        field = "email"
+    elif "username" in message:
+        field = "username"
+    else:
+        field = await find_conflicting_user(db, email, username, exclude_id) or "email"
+    raise UserConflictError(field) from error
+
+# 모든 사용자 조회
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+    """모든 사용자 목록을 조회합니다."""
+    stmt = select(User).offset(skip).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+# 활성 사용자만 조회
+async def get_active_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+    """활성 사용자 목록을 조회합니다."""
+    stmt = select(User).where(User.is_active == True).offset(skip).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+# 키셋(커서) 방식 사용자 조회
+async def get_users_after(
+    db: AsyncSession,
+    after: Optional[Tuple[Any, ...]] = None,
+    limit: int = 100,
+    order_by: str = "id",
+    active_only: bool = False
+) -> List[User]:
+    """
+    커서 다음의 사용자 목록을 조회합니다.
+    OFFSET과 달리 건너뛴 행을 읽지 않으므로 깊은 페이지도 일정한 속도로 조회됩니다.
+    after: order_by="id"이면 (id,), order_by="created_at"이면 (created_at, id)
+    """
+    stmt = select(User)
+    if active_only:
+        stmt = stmt.where(User.is_active == True)
+    if order_by == "created_at":
+        if after is not None:
+            last_created_at, last_id = after
+            # (created_at, id) > (:c, :i) 를 인덱스를 탈 수 있는 형태로 풀어서 작성
+            stmt = stmt.where(or_(
+                User.created_at > last_created_at,
+                and_(User.created_at == last_created_at, User.id > last_id)
+            ))
+        stmt = stmt.order_by(User.created_at, User.id)
+    else:
+        if after is not None:
+            stmt = stmt.where(User.id > after[0])
+        stmt = stmt.order_by(User.id)
+    stmt = stmt.limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+# 검색 대상 컬럼
+SEARCH_COLUMNS = {
+    "username": User.username,
+    "email": User.email,
+    "full_name": User.full_name,
+}
+
+def _prefix_condition(column, q: str, dialect: str):
+    """
+    컬럼 값이 q로 시작하는 조건 (대소문자 구분 없음, 인덱스 범위 검색)
+    MySQL은 기본 collation이 대소문자를 구분하지 않으므로 LIKE 'q%'가 컬럼 인덱스를 그대로 탑니다.
+    SQLite의 LIKE는 대소문자를 구분하지 않을 때 인덱스를 쓰지 못하므로
+    lower(컬럼) 식 인덱스(models.py의 ix_users_*_lower)에 대한 범위 조건으로 바꿉니다.
+    """
+    if dialect == "sqlite":
+        lowered = q.lower()
+        upper_bound = lowered[:-1] + chr(ord(lowered[-1]) + 1)
+        return and_(func.lower(column) >= lowered, func.lower(column) < upper_bound)
+    # 패턴을 바인드 파라미터 하나로 넘겨야 인덱스 범위 검색이 됨 (startswith는 "? || '%'" 식을 만듦)
+    pattern = q.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+    return column.like(pattern, escape="/")
+
+# 사용자 접두어 검색
+async def search_users(
+    db: AsyncSession,
+    q: str,
+    fields: Sequence[str] = tuple(SEARCH_COLUMNS),
+    limit: int = 20,
+    after_id: Optional[int] = None,
+    active_only: bool = False
+) -> List[User]:
+    """
+    사용자명/이메일/이름이 q로 시작하는 사용자를 id 순으로 조회합니다. (대소문자 구분 없음)
+    각 컬럼 인덱스의 범위 검색으로 처리되며, 커서(after_id)로 다음 페이지를 이어 읽습니다.
+    """
+    dialect = db.get_bind().dialect.name
+    # 컬럼마다 자기 인덱스로 id를 찾고 UNION으로 합친 뒤 조인 (OR 하나로 묶으면 옵티마이저가 전체 스캔을 고르기도 함)
+    # 각 갈래에서 먼저 ORDER BY id LIMIT을 걸어야 흔한 접두어도 갈래당 limit건만 합치고 중복 제거함
+    branches = []
+    for name in fields:
+        branch = select(User.id).where(_prefix_condition(SEARCH_COLUMNS[name], q, dialect))
+        if after_id is not None:
+            branch = branch.where(User.id > after_id)
+        if active_only:
+            branch = branch.where(User.is_active == True)
+        # SQLite는 UNION 갈래에 직접 ORDER BY/LIMIT을 쓸 수 없으므로 서브쿼리로 감쌈
+        limited = branch.order_by(User.id).limit(limit).subquery()
+        branches.append(select(limited.c.id))
+    matches = (union(*branches) if len(branches) > 1 else branches[0]).subquery("matches")
+    stmt = select(User).join(matches, User.id == matches.c.id)
+    stmt = stmt.order_by(User.id).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+# 사용자 전문 검색 (MySQL FULLTEXT)
+async def search_users_fulltext(
+    db: AsyncSession,
+    q: str,
+    limit: int = 20,
+    active_only: bool = False
+) -> List[User]:
+    """
+    ix_users_fulltext(MySQL FULLTEXT) 인덱스로 단어 접두어를 찾고 관련도 순으로 조회합니다.
+    MySQL 외의 데이터베이스에서는 UnsupportedDialectError를 발생시킵니다.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect != "mysql":
+        raise UnsupportedDialectError("전문 검색", dialect)
+    # 불리언 모드 연산자를 제거하고 각 단어를 접두어로 검색 (kim -> kim*)
+    against = " ".join(f"{word}*" for word in re.findall(r"\w+", q))
+    if not against:
+        return []
+    score = match(User.username, User.email, User.full_name, against=against).in_boolean_mode()
+    stmt = select(User).where(score)
+    if active_only:
+        stmt = stmt.where(User.is_active == True)
+    stmt = stmt.order_by(score.desc(), User.id).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+# 사용자 생성
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    """
+    새로운 사용자를 생성합니다.
+    id는 INSERT 결과로, 나머지 기본값(created_at/updated_at 등)은 클라이언트에서 채우므로
+    커밋 후 refresh SELECT 없이 INSERT 한 번으로 끝납니다. (expire_on_commit=False)
+    """
+    hashed_password = await hash_password_async(user.password)
+    now = utcnow()
+    db_user = User(
+        email=user.email,
+        username=user.username,
+        full_name=user.full_name,
+        hashed_password=hashed_password,
+        is_active=True,
+        is_admin=False,
+        created_at=now,
+        updated_at=now
+    )
+    db.add(db_user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        # 중복 조회 이후 다른 요청이 같은 값을 등록한 경우
+        await _raise_conflict(db, e, user.email, user.username)
+    user_stats.on_users_created(1, now)
+    return db_user
+
+# 사용자 대량 생성
+async def bulk_create_users(
+    db: AsyncSession,
+    users: List[UserCreate],
+    chunk_size: int = BULK_CREATE_CHUNK_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    여러 사용자를 청크 단위로 생성하고 입력 순서대로 행별 결과를 반환합니다.
+    청크마다 중복 검사는 IN 조회 2번, 해싱은 프로세스 풀 병렬 처리,
+    INSERT는 다중 행 한 번으로 처리하고 청크 단위로 커밋합니다.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(users)
+    seen_emails: set = set()
+    seen_usernames: set = set()
+    unique_key = _unique_key_normalizer(db.get_bind().dialect.name)
+
+    for start in range(0, len(users), chunk_size):
+        chunk = list(enumerate(users[start:start + chunk_size], start))
+
+        # 이미 등록된 이메일/사용자명을 한 번에 조회 (IN 비교는 유니크 인덱스와 같은 콜레이션을 따름)
+        emails = [user.email for _, user in chunk]
+        usernames = [user.username for _, user in chunk]
+        existing_emails = {unique_key(email) for email in (await db.execute(select(User.email).where(User.email.in_(emails)))).scalars()}
+        existing_usernames = {unique_key(name) for name in (await db.execute(select(User.username).where(User.username.in_(usernames)))).scalars()}
+
+        pending: List[Tuple[int, UserCreate]] = []
+        for index, user in chunk:
+            email_key, username_key = unique_key(user.email), unique_key(user.username)
+            if email_key in existing_emails or email_key in seen_emails:
+                results[index] = _bulk_error(index, user, "이미 등록된 이메일입니다.")
+            elif username_key in existing_usernames or username_key in seen_usernames:
+                results[index] = _bulk_error(index, user, "이미 사용 중인 사용자명입니다.")
+            else:
+                seen_emails.add(email_key)
+                seen_usernames.add(username_key)
+                pending.append((index, user))
+        if not pending:
+            continue
+
+        hashed_passwords = await hash_passwords_async([user.password for _, user in pending])
+        now = utcnow()
+        rows = [
+            {
+                "email": user.email,
+                "username": user.username,
+                "full_name": user.full_name,
+                "hashed_password": hashed_password,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for (_, user), hashed_password in zip(pending, hashed_passwords)
+        ]
+
+        # RETURNING을 지원하면 INSERT 결과로 id를 받고, 아니면 커밋 후 이메일로 한 번 조회
+        use_returning = db.get_bind().dialect.insert_returning
+        stmt = insert(User)
+        if use_returning:
+            stmt = stmt.returning(User.email, User.id, sort_by_parameter_order=True)
+        ids: Dict[str, int] = {}
+        try:
+            result = await db.execute(stmt, rows)
+            if use_returning:
+                ids.update(result.tuples().all())
+            await db.commit()
+        except IntegrityError:
+            # 조회 이후 다른 요청이 같은 값을 등록한 경우: 이 청크만 행 단위로 다시 시도
+            await db.rollback()
+            ids.clear()
+            for (index, user), row in zip(pending, rows):
+                try:
+                    result = await db.execute(stmt, [row])
+                    if use_returning:
+                        ids.update(result.tuples().all())
+                    await db.commit()
+                except IntegrityError:
+                    await db.rollback()
+                    results[index] = _bulk_error(index, user, "이메일 또는 사용자명이 이미 사용 중입니다.")
+
+        created = [(index, user) for index, user in pending if results[index] is None]
+        if created and not use_returning:
+            id_stmt = select(User.email, User.id).where(User.email.in_([user.email for _, user in created]))
+            ids.update((await db.execute(id_stmt)).tuples().all())
+        for index, user in created:
+            results[index] = {"index": index, "status": "created", "id": ids.get(user.email), "email": user.email}
+        user_stats.on_users_created(len(created), now)
+
+    return results
+
+def _unique_key_normalizer(dialect: str) -> Callable[[str], str]:
+    """
+    유니크 인덱스가 같은 값으로 보는 형태로 바꾸는 함수
+    MySQL 기본 콜레이션(utf8mb4_0900_ai_ci)은 대소문자를 구분하지 않으므로 A@x.com과 a@x.com은 중복
+    """
+    if dialect == "mysql":
+        return str.lower
+    return str
+
+def _bulk_error(index: int, user: UserCreate, error: str) -> Dict[str, Any]:
+    return {"index": index, "status": "error", "email": user.email, "error": error}
+
+# 사용자 업데이트
+async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate) -> Optional[User]:
+    """
+    사용자 정보를 업데이트합니다.
+    행을 먼저 읽지 않고 UPDATE ... WHERE id 한 문장으로 처리하며,
+    RETURNING을 지원하면 갱신된 행을 함께 받고 아니면 한 번 더 조회합니다.
+    """
+    update_data = user_update.model_dump(exclude_unset=True)
+
+    if "password" in update_data:
+        update_data["hashed_password"] = await hash_password_async(update_data.pop("password"))
+    update_data["updated_at"] = utcnow()
+
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(**update_data)
+        .execution_options(synchronize_session=False)
+    )
+    use_returning = db.get_bind().dialect.update_returning
+    if use_returning:
+        stmt = stmt.returning(User).execution_options(populate_existing=True)
+
+    try:
+        result = await db.execute(stmt)
+        db_user = result.scalar_one_or_none() if use_returning else None
+        found = db_user is not None if use_returning else result.rowcount > 0
+        await db.commit()
+    except IntegrityError as e:
+        await _raise_conflict(db, e, update_data.get("email"), update_data.get("username"), user_id)
+    if not found:
+        return None
+    if "is_active" in update_data:
+        user_stats.mark_dirty()
+
+    auth_principal_cache.invalidate(user_id)
+    await user_cache.invalidate(user_id)
+    if db_user is None:
+        # RETURNING 미지원 (MySQL): 갱신된 행 조회
+        stmt = select(User).where(User.id == user_id).execution_options(populate_existing=True)
+        db_user = (await db.execute(stmt)).scalar_one_or_none()
+    return db_user
+
+# 사용자 업서트 (이메일 기준)
+async def upsert_user(db: AsyncSession, user: UserCreate) -> User:
+    """
+    이메일로 사용자를 생성하거나, 이미 있으면 사용자명/이름/비밀번호를 갱신합니다.
+    MySQL은 INSERT ... ON DUPLICATE KEY UPDATE, SQLite는 INSERT ... ON CONFLICT DO UPDATE 한 문장으로 처리합니다.
+    """
+    # ON DUPLICATE KEY UPDATE는 어느 유니크 키가 겹쳐도 실행되므로
+    # 다른 사용자의 사용자명과 겹치면 그 사용자를 덮어쓰지 않도록 먼저 거절
+    stmt = select(User.id).where(User.username == user.username, User.email != user.email).limit(1)
+    if (await db.execute(stmt)).first() is not None:
+        raise UserConflictError("username")
+
+    hashed_password = await hash_password_async(user.password)
+    now = utcnow()
+    values = {
+        "email": user.email,
+        "username": user.username,
+        "full_name": user.full_name,
+        "hashed_password": hashed_password,
+        "is_active": True,
+        "is_admin": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+    changes = {
+        "username": user.username,
+        "full_name": user.full_name,
+        "hashed_password": hashed_password,
+        "updated_at": now,
+    }
+
+    dialect = db.get_bind().dialect
+    if dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(User).values(**values).on_duplicate_key_update(**changes)
+    elif dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(User).values(**values).on_conflict_do_update(index_elements=[User.email], set_=changes)
+    else:
+        raise UnsupportedDialectError("업서트", dialect.name)
+    # 세션에 이미 올라온 객체가 있어도 방금 쓴 값으로 채움
+    if dialect.insert_returning:
+        stmt = stmt.returning(User).execution_options(populate_existing=True)
+
+    db_user = None
+    try:
+        result = await db.execute(stmt)
+        if dialect.insert_returning:
+            db_user = result.scalar_one()
+        await db.commit()
+    except IntegrityError as e:
+        await _raise_conflict(db, e, None, user.username)
+
+    if db_user is None:
+        # RETURNING 미지원 (MySQL): 쓴 행 조회
+        stmt = select(User).where(User.email == user.email).execution_options(populate_existing=True)
+        db_user = (await db.execute(stmt)).scalar_one()
+    auth_principal_cache.invalidate(db_user.id)
+    await user_cache.invalidate(db_user.id)
+    # 생성인지 갱신인지 알 수 없으므로 재집계
+    user_stats.mark_dirty()
+    return db_user
+
+# 사용자 삭제
+async def delete_user(db: AsyncSession, user_id: int) -> bool:
+    """
+    사용자를 삭제합니다. (DELETE ... WHERE id 한 문장, 지운 행이 없으면 False)
+    RETURNING을 지원하면 지운 행의 is_active/is_admin/created_at을 함께 받아 통계 카운터를 바로 맞추고,
+    아니면(MySQL) rowcount로 삭제 여부만 확인하고 나머지 카운터는 재집계에 맡깁니다.
+    """
+    stmt = delete(User).where(User.id == user_id)
+    if db.get_bind().dialect.delete_returning:
+        deleted = (await db.execute(stmt.returning(User.is_active, User.is_admin, User.created_at))).first()
+        found = deleted is not None
+    else:
+        deleted = None
+        found = (await db.execute(stmt)).rowcount > 0
+    await db.commit()
+    if not found:
+        return False
+    auth_principal_cache.invalidate(user_id)
+    await user_cache.invalidate(user_id)
+    if deleted is not None:
+        user_stats.on_user_deleted(deleted.is_active, deleted.is_admin, deleted.created_at)
+    else:
+        user_stats.on_user_deleted()
+    return True
+
+# 사용자 인증
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """사용자 인증을 수행합니다."""
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    verified, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not verified:
+        return None
+    if new_hash is not None:
+        await _upgrade_password_hash(db, user, new_hash)
+    return user
+
+async def _upgrade_password_hash(db: AsyncSession, user: User, new_hash: str):
+    """해시 방식/비용 마이그레이션 (updated_at은 사용자 정보 변경이 아니므로 유지)"""
+    stmt = (
+        update(User)
+        .where(User.id == user.id)
+        .values(hashed_password=new_hash, updated_at=User.updated_at)
+    )
+    await db.execute(stmt)
+    await db.commit()
+    user.hashed_password = new_hash
+
+# 사용자 수 조회
+async def get_users_count(db: AsyncSession) -> int:
+    """전체 사용자 수를 조회합니다."""
+    stmt = select(func.count(User.id))
+    return (await db.execute(stmt)).scalar()
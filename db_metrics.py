@@ -0,0 +1,138 @@
+"""
+DB 커넥션 풀 계측
+
+- 체크아웃 지연 시간 (풀에서 연결을 얻기까지 걸린 시간, pre-ping/새 연결 포함)
+- 사용 중 / 오버플로 연결 수
+- 연결 생성/종료/무효화 횟수 (churn)
+- 실행한 SQL 문장 수 (쓰기 작업당 왕복 횟수 측정용 count_queries 포함)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Type
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """엔진 하나의 풀 지표 (여러 스레드에서 갱신되므로 락으로 보호)"""
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Any = None
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {
+            "checkouts": 0,
+            "checkout_timeouts": 0,
+            "checkout_wait_total_ms": 0.0,
+            "checkout_wait_max_ms": 0.0,
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "connections_invalidated": 0,
+            "queries": 0,
+        }
+
+    def incr(self, key: str, amount: float = 1):
+        with self._lock:
+            self._counters[key] += amount
+
+    def record_checkout(self, waited_ms: float):
+        with self._lock:
+            self._counters["checkouts"] += 1
+            self._counters["checkout_wait_total_ms"] += waited_ms
+            self._counters["checkout_wait_max_ms"] = max(self._counters["checkout_wait_max_ms"], waited_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 상태와 누적 지표 조회"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        stats["checkout_wait_avg_ms"] = (
+            stats["checkout_wait_total_ms"] / stats["checkouts"] if stats["checkouts"] else 0.0
+        )
+        pool = self.pool
+        if pool is not None:
+            stats["pool_class"] = type(pool).__name__
+            for key, method in (
+                ("pool_size", "size"),
+                ("checked_in", "checkedin"),
+                ("in_use", "checkedout"),
+                ("overflow", "overflow"),
+            ):
+                if hasattr(pool, method):
+                    stats[key] = getattr(pool, method)()
+        return stats
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    connect()에 걸린 시간을 기록하는 풀 클래스 생성
+    (dispose 후 recreate()도 같은 클래스를 사용하므로 지표가 유지됩니다.)
+    """
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except PoolTimeoutError:
+            metrics.incr("checkout_timeouts")
+            raise
+        metrics.record_checkout((time.perf_counter() - started) * 1000)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
+
+
+# count_queries() 범위 안에서 실행된 SQL 문장 (비동기 세션의 greenlet도 같은 컨텍스트를 공유)
+_query_scope: ContextVar[Optional[List[str]]] = ContextVar("query_scope", default=None)
+
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """
+    범위 안에서 실행된 SQL 문장의 종류(SELECT/INSERT/UPDATE/DELETE ...) 목록을 수집
+    
+        with count_queries() as queries:
+            await crud_async.update_user(db, 1, user_update)
+        print(len(queries), queries)
+    """
+    queries: List[str] = []
+    token = _query_scope.set(queries)
+    try:
+        yield queries
+    finally:
+        _query_scope.reset(token)
+
+
+def attach_query_counter(engine, metrics: PoolMetrics):
+    """커서 실행마다 SQL 문장 수 집계 (executemany는 한 번으로 집계)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        metrics.incr("queries")
+        queries = _query_scope.get()
+        if queries is not None:
+            queries.append(statement.split(None, 1)[0].upper() if statement else "")
+
+
+def attach_pool_events(engine, metrics: PoolMetrics):
+    """풀 이벤트로 연결 생성/종료/무효화 횟수 집계"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics.pool = sync_engine.pool
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connections_opened")
+
+    @event.listens_for(sync_engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        metrics.incr("connections_closed")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("connections_invalidated")
+
+    @event.listens_for(sync_engine, "engine_disposed")
+    def _on_disposed(engine):
+        metrics.pool = sync_engine.pool
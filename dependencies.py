@@ -1,33 +1,81 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from security import verify_token
-from crud import get_user
+from crud_async import get_user
 from models import User
 from schemas import TokenData
+from auth_cache import AuthPrincipal, auth_principal_cache, AUTH_TRUST_TOKEN_CLAIMS
 
 # OAuth2 Bearer 토큰 스키마
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """토큰을 검증하고 현재 사용자를 반환합니다."""
-    token = credentials.credentials
-    
-    # 토큰 검증
-    token_data = verify_token(token)
+def _verify_credentials(credentials: HTTPAuthorizationCredentials) -> TokenData:
+    """Bearer 토큰을 검증하고 토큰 데이터를 반환합니다."""
+    token_data = verify_token(credentials.credentials)
     if token_data is None or token_data.user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="유효하지 않은 토큰입니다.",
             headers={"WWW-Authenticate": "Bearer"}
         )
+    return token_data
+
+def _ensure_active(is_active: bool):
+    if not is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="비활성화된 계정입니다."
+        )
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthPrincipal:
+    """
+    토큰을 검증하고 인증 정보(id, is_active, is_admin)만 반환합니다.
+    캐시에 있으면 DB를 조회하지 않습니다.
+    """
+    token_data = _verify_credentials(credentials)
+    
+    # 서명된 토큰 클레임 신뢰 모드 (토큰 만료 시까지 유효)
+    if AUTH_TRUST_TOKEN_CLAIMS and token_data.is_active is not None and token_data.is_admin is not None:
+        auth_principal_cache.record_claims_trusted()
+        principal = AuthPrincipal(
+            id=token_data.user_id,
+            is_active=token_data.is_active,
+            is_admin=token_data.is_admin
+        )
+        _ensure_active(principal.is_active)
+        return principal
+    
+    principal = auth_principal_cache.get(token_data.user_id)
+    if principal is None:
+        generation = auth_principal_cache.begin_load()
+        user = await get_user(db, user_id=token_data.user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="사용자를 찾을 수 없습니다.",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        principal = AuthPrincipal.from_user(user)
+        auth_principal_cache.set(principal, generation)
+    
+    _ensure_active(principal.is_active)
+    return principal
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """토큰을 검증하고 현재 사용자를 반환합니다."""
+    token_data = _verify_credentials(credentials)
     
     # 사용자 조회
-    user = get_user(db, user_id=token_data.user_id)
+    generation = auth_principal_cache.begin_load()
+    user = await get_user(db, user_id=token_data.user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,10 +83,18 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    if not user.is_active:
+    auth_principal_cache.set(AuthPrincipal.from_user(user), generation)
+    _ensure_active(user.is_active)
+    
+    return user
+
+async def get_current_admin_user(
+    principal: AuthPrincipal = Depends(get_current_principal)
+) -> AuthPrincipal:
+    """현재 사용자가 관리자인지 확인합니다."""
+    if not principal.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="비활성화된 계정입니다."
+            detail="관리자 권한이 필요합니다."
         )
-    
-    return user
\ No newline at end of file
+    return principal
@@ -4,12 +4,17 @@ Math Operations MCP Server using Claude Agent SDK
 """
 
 import anyio
-import json
 from claude_agent_sdk import tool, create_sdk_mcp_server, ClaudeAgentOptions
 from typing import Optional
 from session_manager import MultiSessionController
+from agent_limiter import AgentAdmission, AgentQueueFullError
+from agent_profiles import AgentProfile, get_profile_registry
+from sse import SSEEvent
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 # Add 도구 정의
 @tool(
@@ -32,7 +37,7 @@ import os
 )
 async def add(args):
     """두 숫자를 더하는 함수"""
-    print(f"🔧 add called with args: {args}")
+    logger.debug("🔧 add called with args: %s", args)
     a = args.get("a")
     b = args.get("b")
     
@@ -72,7 +77,7 @@ async def add(args):
 )
 async def subtract(args):
     """두 숫자를 빼는 함수"""
-    print(f"🔧 subtract called with args: {args}")
+    logger.debug("🔧 subtract called with args: %s", args)
     a = args.get("a")
     b = args.get("b")
     
@@ -112,7 +117,7 @@ async def subtract(args):
 )
 async def multiply(args):
     """두 숫자를 곱하는 함수"""
-    print(f"🔧 multiply called with args: {args}")
+    logger.debug("🔧 multiply called with args: %s", args)
     a = args.get("a")
     b = args.get("b")
     
@@ -152,7 +157,7 @@ async def multiply(args):
 )
 async def divide(args):
     """두 숫자를 나누는 함수"""
-    print(f"🔧 divide called with args: {args}")
+    logger.debug("🔧 divide called with args: %s", args)
     a = args.get("a")
     b = args.get("b")
     
@@ -179,7 +184,7 @@ calc_server = create_sdk_mcp_server(
 )
 
 # 환경 변수 로드
-print("BRAVE_API_KEY:", os.getenv("BRAVE_API_KEY") is not None)
+logger.info("BRAVE_API_KEY: %s", os.getenv("BRAVE_API_KEY") is not None)
 
 
 # 전역 세션 매니저
@@ -192,36 +197,68 @@ def get_session_controller() -> MultiSessionController:
     return _global_session_controller
 
 
-async def ai_stream_generator(prompt: str, user_id: str):
+def load_agent_profiles():
     """
-    Server-Sent Events (SSE) 방식으로 AI 쿼리를 처리하고 결과를 스트리밍
+    에이전트 옵션 프로필을 등록 (시작 시 lifespan에서 한 번 호출)
+    요청마다 ClaudeAgentOptions를 새로 만들지 않고 이 템플릿을 복사해 사용합니다.
     """
-    options = ClaudeAgentOptions(
-        model="claude-sonnet-4-5-20250929",
-        mcp_servers={
-            "calc": calc_server,
-            # "brave-search": {
-            #     "command": "npx",
-            #     "args": ["-y", "@brave/brave-search-mcp-server"],
-            #     "env": {
-            #         "BRAVE_API_KEY": os.getenv("BRAVE_API_KEY")
-            #     }
-            # },
-        },
-        allowed_tools=[
-            "mcp__calc__add", 
-            "mcp__calc__subtract",
-            "mcp__calc__multiply", 
-            "mcp__calc__divide",
-            #"mcp__brave-search__brave_web_search",
-            ],
-        permission_mode="acceptEdits",
-        system_prompt="당신의 수학 연산을 도와주는 AI 어시스턴트입니다.",
-        resume=None,
+    registry = get_profile_registry()
+    registry.register(
+        "calc",
+        ClaudeAgentOptions(
+            model="claude-sonnet-4-5-20250929",
+            mcp_servers={
+                "calc": calc_server,
+                # "brave-search": {
+                #     "command": "npx",
+                #     "args": ["-y", "@brave/brave-search-mcp-server"],
+                #     "env": {
+                #         "BRAVE_API_KEY": os.getenv("BRAVE_API_KEY")
+                #     }
+                # },
+            },
+            allowed_tools=[
+                "mcp__calc__add", 
+                "mcp__calc__subtract",
+                "mcp__calc__multiply", 
+                "mcp__calc__divide",
+                #"mcp__brave-search__brave_web_search",
+                ],
+            permission_mode="acceptEdits",
+            system_prompt="당신의 수학 연산을 도와주는 AI 어시스턴트입니다.",
+            resume=None,
+        ),
     )
+    return registry
+
+
+def get_agent_profile(name: Optional[str] = None) -> AgentProfile:
+    """프로필 조회 (등록 전이면 먼저 등록)"""
+    registry = get_profile_registry()
+    if not registry.is_loaded():
+        load_agent_profiles()
+    return registry.get(name)
+
+
+async def ai_stream_generator(
+    prompt: str,
+    user_id: str,
+    profile: Optional[str] = None,
+    incremental: bool = False,
+    admission: Optional[AgentAdmission] = None,
+):
+    """
+    Server-Sent Events (SSE) 방식으로 AI 쿼리를 처리하고 결과를 SSEEvent로 스트리밍
+    incremental=True이면 완성된 블록 대신 텍스트 delta를 모아서 바로 보냄 ('delta' 이벤트)
+    admission: 엔드포인트에서 check_admission으로 미리 예약한 대기열 자리
+    """
+    agent_profile = get_agent_profile(profile)
     _session_controller = get_session_controller()
     
 
-    async for message in _session_controller.query(prompt,user_id,options):
-        yield message
-
+    try:
+        async for message in _session_controller.query(prompt, user_id, agent_profile, incremental, admission):
+            yield message
+    except AgentQueueFullError as e:
+        # 응답 시작 후 대기열에서 밀려난 경우 에러 이벤트로 알림
+        yield SSEEvent.error(e.message, code="queue_full")
@@ -0,0 +1,109 @@
+"""
+로깅 설정 (시작 시 setup_logging 한 번 호출)
+
+- 모든 로그는 QueueHandler로 큐에 넣고, 별도 스레드의 QueueListener가 stdout에 씁니다.
+  (이벤트 루프가 출력 I/O를 기다리지 않음)
+- 메시지 포맷팅은 기록한 스레드에서 바로 합니다. (나중에 바뀔 수 있는 인자 값을 기록 시점 그대로 남김)
+  비활성 레벨의 logger.debug(...)는 레코드를 만들지 않으므로 비용이 거의 없습니다.
+- 모듈별 레벨: LOG_LEVELS="session_manager=DEBUG,generator=WARNING,uvicorn.access=WARNING"
+- LOG_FORMAT=json이면 한 줄에 JSON 객체 하나 (extra={...}로 넘긴 필드 포함)
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from settings import settings
+
+# ==================== 로깅 설정 ====================
+LOG_LEVEL = settings.log_level  # 기본 로그 레벨
+LOG_LEVELS = settings.log_levels  # 모듈별 레벨 (이름=레벨, 쉼표 구분)
+LOG_FORMAT = settings.log_format  # text | json
+LOG_QUEUE_SIZE = settings.log_queue_size  # 출력 대기 중인 최대 로그 수 (넘치면 버림)
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 포맷"""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    기록 시점에 포맷팅한 레코드를 큐에 넣고 출력(I/O)만 리스너 스레드로 미루는 핸들러
+    (포맷팅은 기본 QueueHandler.prepare가 이 핸들러의 formatter로 처리)
+    큐가 가득 차면 이벤트 루프를 막지 않도록 버립니다.
+    """
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DeferredQueueHandler.dropped += 1
+
+
+def parse_log_levels(spec: str) -> Dict[str, str]:
+    """"a=DEBUG,b.c=WARNING" -> {"a": "DEBUG", "b.c": "WARNING"}"""
+    levels: Dict[str, str] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(level: str = LOG_LEVEL, levels: str = LOG_LEVELS, log_format: str = LOG_FORMAT):
+    """루트 로거를 큐 핸들러로 설정하고 출력 스레드 시작 (여러 번 호출해도 한 번만 설정)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    # 큐 핸들러가 최종 문자열을 만들고, 출력 핸들러는 그대로 씀
+    queue_handler = _DeferredQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    queue_handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter("%(message)s"))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    for name, module_level in parse_log_levels(levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 출력 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,39 +1,76 @@
 from dotenv import load_dotenv
+import logging
 import os
+import time
 # 환경 변수 로드
 load_dotenv()
-print("ANTHROPIC_API_KEY:", os.getenv("ANTHROPIC_API_KEY") is not None)
 
-from fastapi import FastAPI, Depends, HTTPException, status, Query, WebSocket, BackgroundTasks, Request
-from fastapi.responses import StreamingResponse, HTMLResponse
+# 로깅 설정 (다른 모듈을 불러오기 전에 한 번, 레벨/형식은 settings에서)
+from settings import settings, log_settings_summary
+from logging_config import setup_logging
+setup_logging()
+logger = logging.getLogger(__name__)
+logger.info("ANTHROPIC_API_KEY: %s", os.getenv("ANTHROPIC_API_KEY") is not None)
+
+from fastapi import FastAPI, Depends, HTTPException, status, Query, WebSocket, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse, HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
-from typing import List, Annotated, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Annotated, Dict, Any, Optional, Literal, Tuple
 from contextlib import asynccontextmanager
 from pydantic import EmailStr, BaseModel, Field
 from datetime import timedelta
 from security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
-from database import Base, engine, get_db
+from database import Base, async_engine, get_async_db, get_pool_stats
 from models import User
-from generator import ai_stream_generator
+from generator import get_session_controller, load_agent_profiles
+from agent_limiter import AgentAdmission, AgentQueueFullError
+from agent_profiles import get_profile_registry
+from sse import parse_event_id, SSE_HEADERS
+from agent_runs import agent_runs
 import uvicorn
 
 
-from schemas import UserCreate, UserUpdate, UserResponse, UserLogin, LoginResponse, MessageResponse
-from crud import (
-    get_user, get_user_by_email, get_user_by_username,
-    get_users, get_active_users, create_user, update_user,
-    delete_user, authenticate_user, get_users_count
+from schemas import UserCreate, UserUpdate, UserResponse, UserLogin, LoginResponse, MessageResponse, BulkUserCreateResponse, AgentRunCreate, AgentRunResponse
+from crud_async import (
+    get_user_cached, get_user_by_email_cached, get_user_by_username_cached,
+    get_users, get_active_users, get_users_after, search_users, search_users_fulltext, SEARCH_COLUMNS, create_user, bulk_create_users, update_user,
+    upsert_user, delete_user, authenticate_user, find_conflicting_user, UserConflictError,
+    UnsupportedDialectError
 )
-from dependencies import get_current_user
+from pagination import encode_cursor, decode_cursor, InvalidCursorError
+from user_export import iter_users_export, parse_export_fields
+from user_import import parse_bulk_users, BulkPayloadError
+from dependencies import get_current_user, get_current_principal, get_current_admin_user
+from auth_cache import AuthPrincipal, auth_principal_cache
+from password_hasher import password_hasher, PasswordHasherBusyError
+from stats import user_stats
+from user_cache import CachedUser, user_cache
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # 적용된 설정 요약 (APP_ENV 프로필, debug, DB 풀 등)
+    log_settings_summary()
     # 시작 시 데이터베이스 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # AI 에이전트 옵션 프로필 (요청마다 만들지 않도록 시작 시 한 번 생성)
+    load_agent_profiles()
+    # 비밀번호 해싱 프로세스 풀 시작
+    password_hasher.start()
+    # 사용자 통계 백그라운드 집계 시작
+    user_stats.start()
+    # AI 세션 컨트롤러 (클라이언트 풀 정리 작업) 시작
+    session_controller = get_session_controller()
+    session_controller.start()
     yield
-    # 종료 시 정리 작업 (필요한 경우)
+    # 종료 시 정리 작업: 진행 중인 에이전트 실행 취소, 풀에 남은 Claude 클라이언트 종료
+    await agent_runs.shutdown()
+    await session_controller.shutdown()
+    await user_stats.shutdown()
+    await async_engine.dispose()
+    password_hasher.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -41,7 +78,11 @@ app = FastAPI(
     description="FastAPI + MySQL + JWT OAuth Token + Claude Agent SDK을 사용한 사용자 관리 API",
     version="1.0.0",
     lifespan=lifespan,
-    debug=True
+    debug=settings.debug,
+    # prod 프로필에서는 API 문서 비공개
+    docs_url="/docs" if settings.docs_enabled else None,
+    redoc_url="/redoc" if settings.docs_enabled else None,
+    openapi_url="/openapi.json" if settings.docs_enabled else None,
 )
 # static 파일 서빙 설정
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -50,12 +91,61 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 #mcp = FastApiMCP(app, name="fastmcp-http")
 #mcp.mount(mount_path="/mcp")
 
+# 비밀번호 해싱 대기열이 가득 찬 경우 503으로 응답
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
+# 이메일/사용자명 중복은 필드별 메시지와 함께 400으로 응답
+@app.exception_handler(UserConflictError)
+async def user_conflict_handler(request: Request, exc: UserConflictError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": exc.message, "field": exc.field}
+    )
+
+# 현재 데이터베이스에서 지원하지 않는 기능(MySQL 전용 전문 검색/업서트)은 501로 응답
+@app.exception_handler(UnsupportedDialectError)
+async def unsupported_dialect_handler(request: Request, exc: UnsupportedDialectError):
+    return JSONResponse(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        content={"detail": exc.message}
+    )
+
 # templates 폴더 설정
 templates = Jinja2Templates(directory="templates")
 
 # 의존성 주입 타입
-DbDependency = Annotated[Session, Depends(get_db)]
+DbDependency = Annotated[AsyncSession, Depends(get_async_db)]
 CurrentUserDependency = Annotated[User, Depends(get_current_user)]
+CurrentPrincipalDependency = Annotated[AuthPrincipal, Depends(get_current_principal)]
+AdminUserDependency = Annotated[AuthPrincipal, Depends(get_current_admin_user)]
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def _conditional_user_response(request: Request, response: Response, db_user: Optional[CachedUser]):
+    """조회한 사용자에 ETag를 붙이고, 클라이언트 ETag와 같으면 304로 응답"""
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="사용자를 찾을 수 없습니다."
+        )
+    headers = {"ETag": db_user.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), db_user.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return db_user
 
 # ==================== REGULAR FASTAPI ENDPOINTS ====================
 # These are standard REST API endpoints
@@ -68,46 +158,191 @@ def root():
 
 # 통계 정보
 @app.get("/api/stats", tags=["Stats"])
-def get_stats(db: DbDependency):
-    """사용자 통계를 조회합니다."""
-    total_users = get_users_count(db)
+async def get_stats(
+    fresh: bool = Query(False, description="캐시된 통계 대신 DB에서 다시 집계")
+):
+    """
+    사용자 통계를 조회합니다.
+    
+    기본적으로 메모리에 유지되는 통계 스냅샷을 돌려주므로 테이블 크기와 관계없이 빠르게 응답합니다.
+    스냅샷은 쓰기 시 갱신되고 주기적으로 다시 집계되며, 경과 시간은 `stats_age_seconds`로 확인할 수 있습니다.
+    """
+    snapshot = await user_stats.get(fresh=fresh)
     return {
-        "total_users": total_users,
+        "total_users": snapshot.total_users,
+        "active_users": snapshot.active_users,
+        "admin_users": snapshot.admin_users,
+        "signups_per_day": snapshot.signups_per_day,
+        "stats_age_seconds": round(max(time.time() - snapshot.refreshed_at, 0.0), 3),
         "api_version": "2.0.0",
         "token_expire_minutes": ACCESS_TOKEN_EXPIRE_MINUTES
     }
 
+# 사용자 통계 캐시 상태
+@app.get("/api/stats/cache", tags=["Stats"])
+async def get_stats_cache_stats():
+    """사용자 통계 스냅샷의 재집계 횟수와 경과 시간을 조회합니다."""
+    return user_stats.get_stats()
+
+# DB 커넥션 풀 통계
+@app.get("/api/stats/db-pool", tags=["Stats"])
+async def get_db_pool_stats():
+    """DB 커넥션 풀 상태(사용 중/오버플로 연결 수, 체크아웃 지연, 연결 생성/종료 횟수)를 조회합니다."""
+    return get_pool_stats()
+
+# 인증 캐시 통계
+@app.get("/api/stats/auth-cache", tags=["Stats"])
+async def get_auth_cache_stats():
+    """인증 사용자 캐시의 적중률과 무효화 횟수를 조회합니다."""
+    return auth_principal_cache.get_stats()
+
+# 사용자 조회 캐시 통계
+@app.get("/api/stats/user-cache", tags=["Stats"])
+async def get_user_cache_stats():
+    """사용자 조회 캐시의 적중률과 무효화 횟수를 조회합니다."""
+    return user_cache.get_stats()
+
+# 비밀번호 해싱 풀 통계
+@app.get("/api/stats/password-hasher", tags=["Stats"])
+async def get_password_hasher_stats():
+    """비밀번호 해싱 프로세스 풀의 대기열 깊이와 지연 시간을 조회합니다."""
+    return password_hasher.get_stats()
+
 # 모든 사용자 조회
 @app.get("/api/users", response_model=List[UserResponse], tags=["Users"])
-def get_all_users(
+async def get_all_users(
+    request: Request,
+    response: Response,
     db: DbDependency,
-    skip: int = Query(0, ge=0, description="건너뛸 레코드 수"),
+    skip: int = Query(0, ge=0, description="건너뛸 레코드 수 (offset 방식)"),
     limit: int = Query(100, ge=1, le=1000, description="조회할 최대 레코드 수"),
-    active_only: bool = Query(False, description="활성 사용자만 조회")
+    active_only: bool = Query(False, description="활성 사용자만 조회"),
+    pagination: Literal["offset", "cursor"] = Query("offset", description="페이지 방식 (after를 주면 cursor)"),
+    after: Optional[str] = Query(None, description="이전 응답의 next_cursor (cursor 방식)"),
+    order_by: Literal["id", "created_at"] = Query("id", description="정렬 기준 (cursor 방식)")
 ):
     """
     모든 사용자 목록을 조회합니다.
+    
+    cursor 방식은 다음 페이지 커서를 `Link: <...>; rel="next"` 와 `X-Next-Cursor` 헤더로 돌려줍니다.
+    깊은 페이지도 일정한 속도로 조회되므로 대량 조회에는 cursor 방식을 사용하세요.
     """
-    if active_only:
-        users = get_active_users(db, skip=skip, limit=limit)
-    else:
-        users = get_users(db, skip=skip, limit=limit)
+    if pagination == "offset" and after is None:
+        if active_only:
+            users = await get_active_users(db, skip=skip, limit=limit)
+        else:
+            users = await get_users(db, skip=skip, limit=limit)
+        return users
+    
+    try:
+        after_key = decode_cursor(after, order_by) if after else None
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # 다음 페이지 존재 여부를 알기 위해 한 건 더 조회
+    users = await get_users_after(db, after=after_key, limit=limit + 1, order_by=order_by, active_only=active_only)
+    if len(users) > limit:
+        users = users[:limit]
+        last = users[-1]
+        next_cursor = encode_cursor(order_by, last.id, last.created_at)
+        next_url = request.url.include_query_params(pagination="cursor", after=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
+
+# 사용자 대량 내보내기 (/api/users/{user_id}보다 먼저 등록해야 함)
+@app.get("/api/users/export", tags=["Users"])
+async def export_users(
+    admin_user: AdminUserDependency,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="내보내기 형식"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분된 필드 목록 (기본: 전체, hashed_password 제외)"),
+    active_only: bool = Query(False, description="활성 사용자만 내보내기")
+):
+    """
+    전체 사용자를 NDJSON 또는 CSV로 스트리밍합니다.
+    
+    **관리자 권한 필요**: 서버 측 커서로 읽으므로 테이블 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    try:
+        export_fields = parse_export_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        iter_users_export(format, export_fields, active_only),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+    )
+
+# 사용자 검색 (/api/users/{user_id}보다 먼저 등록해야 함)
+@app.get("/api/users/search", response_model=List[UserResponse], tags=["Search"])
+async def search_users_by_prefix(
+    request: Request,
+    response: Response,
+    db: DbDependency,
+    q: str = Query(..., min_length=1, max_length=100, description="검색어 (사용자명/이메일/이름 접두어)"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분된 검색 필드 (username,email,full_name, 기본: 전체)"),
+    mode: Literal["prefix", "fulltext"] = Query("prefix", description="prefix: 접두어 일치(id 순), fulltext: 관련도 순 (MySQL)"),
+    limit: int = Query(20, ge=1, le=100, description="조회할 최대 레코드 수"),
+    after: Optional[str] = Query(None, description="이전 응답의 next_cursor (prefix 방식)"),
+    active_only: bool = Query(False, description="활성 사용자만 검색")
+):
+    """
+    사용자명, 이메일, 이름이 검색어로 시작하는 사용자를 찾습니다.
+    
+    prefix 방식은 컬럼 인덱스로 범위 검색하며 다음 페이지 커서를 `Link` / `X-Next-Cursor` 헤더로 돌려줍니다.
+    fulltext 방식은 MySQL FULLTEXT 인덱스로 단어 접두어를 찾아 관련도 순으로 한 페이지만 돌려줍니다. (그 외 데이터베이스에서는 501)
+    """
+    if mode == "fulltext":
+        if after:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="fulltext 방식은 커서를 지원하지 않습니다."
+            )
+        return await search_users_fulltext(db, q, limit=limit, active_only=active_only)
+    
+    search_fields = [name.strip() for name in fields.split(",") if name.strip()] if fields else list(SEARCH_COLUMNS)
+    unknown = [name for name in search_fields if name not in SEARCH_COLUMNS]
+    if unknown or not search_fields:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"검색할 수 없는 필드입니다: {', '.join(unknown)}"
+        )
+    try:
+        after_id = decode_cursor(after, "id")[0] if after else None
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # 다음 페이지 존재 여부를 알기 위해 한 건 더 조회
+    users = await search_users(db, q, search_fields, limit=limit + 1, after_id=after_id, active_only=active_only)
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor("id", users[-1].id)
+        next_url = request.url.include_query_params(after=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = next_cursor
     return users
 
 # 특정 사용자 조회
 @app.get("/api/users/{user_id}", response_model=UserResponse, tags=["Users"])
-def get_user_by(user_id: int, db: DbDependency):
+async def get_user_by(user_id: int, request: Request, response: Response, db: DbDependency):
     """
     ID로 특정 사용자를 조회합니다.
     사용자 ID는 경로 매개변수로 전달됩니다.
+    
+    응답의 `ETag`를 `If-None-Match`로 보내면 변경이 없을 때 304를 돌려줍니다.
     """
-    db_user = get_user(db, user_id=user_id)
-    if db_user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="사용자를 찾을 수 없습니다."
-        )
-    return db_user
+    db_user = await get_user_cached(db, user_id=user_id)
+    return _conditional_user_response(request, response, db_user)
 
 # 사용자 생성
 @app.post(
@@ -116,33 +351,60 @@ def get_user_by(user_id: int, db: DbDependency):
     status_code=status.HTTP_201_CREATED,
     tags=["Users"]
 )
-def create_new_user(user: UserCreate, db: DbDependency):
+async def create_new_user(user: UserCreate, db: DbDependency):
     """새로운 사용자를 생성합니다."""
-    # 이메일 중복 체크
-    db_user = get_user_by_email(db, email=user.email)
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 등록된 이메일입니다."
-        )
+    # 이메일/사용자명 중복 체크 (한 번의 조회, 해싱 전에 빠르게 거절)
+    conflict = await find_conflicting_user(db, email=user.email, username=user.username)
+    if conflict:
+        raise UserConflictError(conflict)
     
-    # 사용자명 중복 체크
-    db_user = get_user_by_username(db, username=user.username)
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 사용 중인 사용자명입니다."
-        )
+    # 조회 이후 경합으로 생긴 중복은 create_user가 유니크 인덱스 위반을 UserConflictError로 변환
+    return await create_user(db=db, user=user)
+
+# 사용자 업서트 (이메일 기준)
+@app.post("/api/users/upsert", response_model=UserResponse, tags=["Users"])
+async def upsert_existing_user(user: UserCreate, db: DbDependency, admin_user: AdminUserDependency):
+    """
+    이메일 기준으로 사용자를 생성하거나 사용자명/이름/비밀번호를 갱신합니다.
     
-    return create_user(db=db, user=user)
+    **관리자 권한 필요**: 존재 여부 확인 없이 INSERT 한 문장으로 처리합니다. (MySQL, SQLite 지원, 그 외에는 501)
+    """
+    return await upsert_user(db, user)
+
+# 사용자 대량 생성
+@app.post("/api/users/bulk", response_model=BulkUserCreateResponse, tags=["Users"])
+async def create_users_bulk(request: Request, db: DbDependency, admin_user: AdminUserDependency):
+    """
+    여러 사용자를 한 번에 생성합니다.
+    
+    **관리자 권한 필요**: 본문은 사용자 객체의 JSON 배열 또는 NDJSON(`Content-Type: application/x-ndjson`)입니다.
+    일부 행이 실패해도 나머지는 생성되며, 결과는 입력 순서(index)대로 행별로 돌려줍니다.
+    """
+    try:
+        rows, results = await parse_bulk_users(request)
+    except BulkPayloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    created = await bulk_create_users(db, [user for _, user in rows])
+    for (index, _), result in zip(rows, created):
+        results.append({**result, "index": index})
+    results.sort(key=lambda result: result["index"])
+    
+    created_count = sum(1 for result in results if result["status"] == "created")
+    return {
+        "total": len(results),
+        "created": created_count,
+        "failed": len(results) - created_count,
+        "results": results
+    }
 
 # 사용자 업데이트 (인증 필요)
 @app.put("/api/users/{user_id}", response_model=UserResponse, tags=["Users"])
-def update_existing_user(
+async def update_existing_user(
     user_id: int,
     user_update: UserUpdate,
     db: DbDependency,
-    current_user: CurrentUserDependency  # 토큰 인증 필요
+    current_user: CurrentPrincipalDependency  # 토큰 인증 필요
 ):
     """
     기존 사용자 정보를 업데이트합니다.
@@ -158,25 +420,14 @@ def update_existing_user(
             detail="자신의 정보만 수정할 수 있습니다."
         )
     
-    # 이메일 중복 체크 (자신 제외)
-    if user_update.email:
-        existing_user = get_user_by_email(db, email=user_update.email)
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="이미 사용 중인 이메일입니다."
-            )
-    
-    # 사용자명 중복 체크 (자신 제외)
-    if user_update.username:
-        existing_user = get_user_by_username(db, username=user_update.username)
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="이미 사용 중인 사용자명입니다."
-            )
+    # 이메일/사용자명 중복 체크 (자신 제외, 한 번의 조회)
+    conflict = await find_conflicting_user(
+        db, email=user_update.email, username=user_update.username, exclude_id=user_id
+    )
+    if conflict:
+        raise UserConflictError(conflict)
     
-    db_user = update_user(db, user_id=user_id, user_update=user_update)
+    db_user = await update_user(db, user_id=user_id, user_update=user_update)
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -186,9 +437,9 @@ def update_existing_user(
 
 # 사용자 삭제
 @app.delete("/api/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Users"])
-def delete_existing_user(user_id: int, db: DbDependency):
+async def delete_existing_user(user_id: int, db: DbDependency):
     """사용자를 삭제합니다."""
-    success = delete_user(db, user_id=user_id)
+    success = await delete_user(db, user_id=user_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -198,13 +449,13 @@ def delete_existing_user(user_id: int, db: DbDependency):
 
 # 사용자 로그인 (OAuth 토큰 발급)
 @app.post("/api/login", response_model=LoginResponse, tags=["Authentication"])
-def login(user_login: UserLogin, db: DbDependency):
+async def login(user_login: UserLogin, db: DbDependency):
     """
     사용자 로그인을 처리하고 JWT 액세스 토큰을 발급합니다.
     
     토큰 유효기간: 5분
     """
-    user = authenticate_user(db, user_login.email, user_login.password)
+    user = await authenticate_user(db, user_login.email, user_login.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -221,7 +472,12 @@ def login(user_login: UserLogin, db: DbDependency):
     # JWT 토큰 생성
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
+        data={
+            "sub": str(user.id),
+            "email": user.email,
+            "is_active": user.is_active,
+            "is_admin": user.is_admin
+        },
         expires_delta=access_token_expires
     )
     
@@ -242,7 +498,7 @@ def login(user_login: UserLogin, db: DbDependency):
 
 # 현재 로그인한 사용자 정보 조회
 @app.get("/api/me", response_model=UserResponse, tags=["Authentication"])
-def read_current_user(current_user: CurrentUserDependency):
+async def read_current_user(current_user: CurrentUserDependency):
     """
     현재 로그인한 사용자의 정보를 조회합니다.
     
@@ -252,36 +508,153 @@ def read_current_user(current_user: CurrentUserDependency):
 
 # 이메일로 사용자 검색
 @app.get("/api/users/search/by-email", response_model=UserResponse, tags=["Search"])
-def search_user_by_email(email: EmailStr, db: DbDependency):
-    """이메일로 사용자를 검색합니다."""
-    db_user = get_user_by_email(db, email=email)
-    if db_user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="사용자를 찾을 수 없습니다."
-        )
-    return db_user
+async def search_user_by_email(email: EmailStr, request: Request, response: Response, db: DbDependency):
+    """이메일로 사용자를 검색합니다. (ETag / If-None-Match 지원)"""
+    db_user = await get_user_by_email_cached(db, email=email)
+    return _conditional_user_response(request, response, db_user)
 
 # 사용자명으로 사용자 검색
 @app.get("/api/users/search/by-username", response_model=UserResponse, tags=["Search"])
-def search_user_by_username(username: str, db: DbDependency):
-    """사용자명으로 사용자를 검색합니다."""
-    db_user = get_user_by_username(db, username=username)
-    if db_user is None:
+async def search_user_by_username(username: str, request: Request, response: Response, db: DbDependency):
+    """사용자명으로 사용자를 검색합니다. (ETag / If-None-Match 지원)"""
+    db_user = await get_user_by_username_cached(db, username=username)
+    return _conditional_user_response(request, response, db_user)
+
+def _check_agent_request(user_id: str, profile: Optional[str]) -> AgentAdmission:
+    """
+    프로필 확인 + 대기열 자리 예약 (가득 찼으면 실행을 시작하기 전에 429/503으로 거절)
+    돌려받은 예약은 start_run에 넘김
+    """
+    if profile is not None and profile not in get_profile_registry():
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="사용자를 찾을 수 없습니다."
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"알 수 없는 프로필입니다: {profile}"
         )
-    return db_user
+    try:
+        return get_session_controller().check_admission(user_id)
+    except AgentQueueFullError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+def _sse_response(body) -> StreamingResponse:
+    """SSE 응답 (프록시 버퍼링/캐시 끔)"""
+    return StreamingResponse(body, media_type="text/event-stream", headers=SSE_HEADERS)
+
+def _resume_position(request: Request, run_id: Optional[str] = None) -> Optional[Tuple[str, int]]:
+    """Last-Event-ID 헤더 -> (run_id, seq), 헤더가 없으면 None"""
+    last_event_id = request.headers.get("last-event-id")
+    if not last_event_id:
+        return None
+    try:
+        stream_id, after = parse_event_id(last_event_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 Last-Event-ID입니다.")
+    if run_id is not None and stream_id != run_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Last-Event-ID가 이 실행의 이벤트가 아닙니다.")
+    return stream_id, after
 
 # AI Query - Server-Sent Events (SSE)
 @app.get("/api/mcp/query-sse", response_model=List[str], tags=["AI"])
-async def query_stream(query:str, user_id: str):
-    """AI 로부터 Server-Sent Events (SSE) 방식으로 query를 수행한다."""
-    return StreamingResponse(
-        ai_stream_generator(query, user_id),
-        media_type="text/event-stream"
-    ) 
+async def query_stream(
+    request: Request,
+    query:str,
+    user_id: str,
+    profile: Optional[str] = Query(None, description="에이전트 프로필 (기본: calc)"),
+    incremental: bool = Query(False, description="토큰 단위 증분 스트리밍 (delta 이벤트)"),
+    protocol: int = Query(2, ge=1, le=2, description="SSE 형식 (2: event/id 포함, 1: 기존 data 전용)")
+):
+    """
+    AI 로부터 Server-Sent Events (SSE) 방식으로 query를 수행한다.
+
+    v2 형식에서는 각 이벤트에 `id: <run_id>:<seq>`가 붙고,
+    연결이 끊긴 뒤 같은 URL로 `Last-Event-ID` 헤더와 함께 다시 연결하면
+    에이전트를 다시 실행하지 않고 끊긴 지점 이후의 이벤트부터 이어서 받는다.
+    """
+    position = _resume_position(request) if protocol == 2 else None
+    if position is not None:
+        run = agent_runs.get_run(position[0], user_id)
+        if run is None:
+            return _sse_response(iter([agent_runs.resume_miss(protocol)]))
+        return _sse_response(agent_runs.iter_frames(run, position[1], protocol, request.is_disconnected))
+
+    admission = _check_agent_request(user_id, profile)
+    # 에이전트는 백그라운드에서 실행되고 응답은 run 버퍼를 구독
+    # 연결이 모두 끊기고 유예 시간 안에 재연결하지 않으면 실행 취소 (슬롯 반환, 클라이언트 interrupt)
+    run = agent_runs.start_run(query, user_id, profile, incremental, cancel_on_disconnect=True, admission=admission)
+    return _sse_response(agent_runs.iter_frames(run, 0, protocol, request.is_disconnected))
+
+# AI 에이전트 실행 시작 (연결과 분리된 백그라운드 실행)
+@app.post("/api/mcp/runs", response_model=AgentRunResponse, status_code=status.HTTP_202_ACCEPTED, tags=["AI"])
+async def create_agent_run(run_request: AgentRunCreate):
+    """
+    에이전트 실행을 백그라운드에서 시작하고 run_id를 돌려준다.
+
+    결과는 `GET /api/mcp/runs/{run_id}/events`(SSE)로 받으며, 여러 연결이 같은 실행을 동시에 구독할 수 있다.
+    연결이 없어도 실행은 끝까지 진행되고 결과는 일정 시간 보관된다.
+    """
+    admission = _check_agent_request(run_request.user_id, run_request.profile)
+    run = agent_runs.start_run(
+        run_request.query, run_request.user_id, run_request.profile, run_request.incremental, admission=admission
+    )
+    return run.to_dict()
+
+# AI 에이전트 실행 상태 조회
+@app.get("/api/mcp/runs/{run_id}", response_model=AgentRunResponse, tags=["AI"])
+async def get_agent_run(run_id: str, user_id: str):
+    """에이전트 실행 상태를 조회합니다."""
+    run = agent_runs.get_run(run_id, user_id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="실행을 찾을 수 없습니다.")
+    return run.to_dict()
+
+# AI 에이전트 실행 이벤트 구독 (SSE)
+@app.get("/api/mcp/runs/{run_id}/events", response_model=List[str], tags=["AI"])
+async def stream_agent_run_events(
+    run_id: str,
+    user_id: str,
+    request: Request,
+    after: int = Query(0, ge=0, description="이 순서 번호 이후의 이벤트부터 (Last-Event-ID 헤더가 우선)"),
+    protocol: int = Query(2, ge=1, le=2, description="SSE 형식 (2: event/id 포함, 1: 기존 data 전용)")
+):
+    """
+    에이전트 실행의 이벤트를 SSE로 받는다. (처음부터 재생한 뒤 실행이 끝날 때까지 이어서 전송)
+    """
+    run = agent_runs.get_run(run_id, user_id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="실행을 찾을 수 없습니다.")
+    position = _resume_position(request, run_id)
+    if position is not None:
+        after = position[1]
+    return _sse_response(agent_runs.iter_frames(run, after, protocol, request.is_disconnected))
+
+# AI 에이전트 실행 취소
+@app.delete("/api/mcp/runs/{run_id}", response_model=AgentRunResponse, tags=["AI"])
+async def cancel_agent_run(run_id: str, user_id: str):
+    """
+    진행 중인 에이전트 실행을 즉시 취소합니다. (이미 끝난 실행은 상태만 돌려줌)
+
+    Claude 클라이언트에 interrupt를 보내고 폐기하며, 구독 중인 연결에는 `error`(code=cancelled) 이벤트가 전달됩니다.
+    """
+    run = agent_runs.get_run(run_id, user_id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="실행을 찾을 수 없습니다.")
+    agent_runs.cancel_run(run)
+    return run.to_dict()
+
+# AI 세션 저장소/클라이언트 풀 통계 (관리자 전용)
+@app.get("/api/admin/sessions", tags=["Admin"])
+async def get_session_stats(admin_user: AdminUserDependency):
+    """
+    AI 세션 저장소와 Claude 클라이언트 풀의 통계를 조회합니다.
+    
+    **관리자 권한 필요**: Authorization 헤더에 관리자 Bearer 토큰이 필요합니다.
+    """
+    stats = get_session_controller().get_stats()
+    stats["agent_runs"] = agent_runs.get_stats()
+    return stats
 
 # ==================== REGULAR FASTAPI ENDPOINTS ====================
 # Web 페이지 라우트 (테스트용)
@@ -295,13 +668,15 @@ async def home(request: Request):
     })
 # ==================== MAIN ====================
 if __name__ == "__main__":
-    print("Starting FastAPI Server...")
-    print("API docs: http://localhost:8000/docs")
+    print(f"Starting FastAPI Server... (APP_ENV={settings.app_env})")
+    if settings.docs_enabled:
+        print("API docs: http://localhost:8000/docs")
     
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=8000,
         root_path="/ai",
-        log_level="debug"
+        log_level="debug" if settings.debug else "info",
+        access_log=settings.app_env != "prod"
     )
\ No newline at end of file
@@ -1,21 +1,50 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String
+from sqlalchemy import String, Index, func
 from datetime import datetime
 from typing import Optional
 from database import Base
 
+def utcnow() -> datetime:
+    """
+    DATETIME 컬럼 정밀도(초)에 맞춘 현재 UTC 시각
+    MySQL DATETIME은 소수 초를 반올림해서 저장하므로, 미리 잘라 두어야 응답/캐시에 쓰는 값과 저장된 값이 같음
+    """
+    return datetime.utcnow().replace(microsecond=0)
+
 class User(Base):
     __tablename__ = "users"
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     username: Mapped[str] = mapped_column(String(255),unique=True, index=True)
-    full_name: Mapped[Optional[str]] = mapped_column(String(255),default=None)
+    full_name: Mapped[Optional[str]] = mapped_column(String(255),default=None, index=True)
     hashed_password: Mapped[str] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(default=True)
     is_admin: Mapped[bool] = mapped_column(default=False)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow
-    )
\ No newline at end of file
+        default=utcnow,
+        onupdate=utcnow
+    )
+
+    __table_args__ = (
+        # created_at 기준 키셋 페이지네이션용 (ORDER BY created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # /api/users/search?mode=fulltext 랭킹 검색용 (MySQL 전용)
+        Index("ix_users_fulltext", "username", "email", "full_name", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+# /api/users/search 접두어 검색용 (SQLite 전용, lower(컬럼) 범위 검색 - crud_async._prefix_condition)
+# MySQL은 대소문자를 구분하지 않는 collation이라 컬럼 인덱스로 충분
+Index("ix_users_username_lower", func.lower(User.username)).ddl_if(dialect="sqlite")
+Index("ix_users_email_lower", func.lower(User.email)).ddl_if(dialect="sqlite")
+Index("ix_users_full_name_lower", func.lower(User.full_name)).ddl_if(dialect="sqlite")
+
+class AgentSession(Base):
+    """AI 대화 세션 상태 (워커 간 공유)"""
+    __tablename__ = "agent_sessions"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    session_id: Mapped[Optional[str]] = mapped_column(String(255), default=None)
+    turn_count: Mapped[int] = mapped_column(default=0)
+    last_used_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, index=True)
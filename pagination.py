@@ -0,0 +1,42 @@
+"""
+키셋(커서) 페이지네이션 커서 인코딩
+
+커서는 정렬 키와 마지막 행의 키 값을 담은 JSON을 base64url로 인코딩한 불투명 문자열입니다.
+클라이언트는 내용을 해석하지 않고 next_cursor를 그대로 after로 돌려보내면 됩니다.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+class InvalidCursorError(ValueError):
+    """커서를 해석할 수 없는 경우"""
+
+
+def encode_cursor(order_by: str, last_id: int, last_created_at: Optional[datetime] = None) -> str:
+    """마지막 행의 키 값으로 다음 페이지 커서 생성"""
+    payload: dict = {"o": order_by, "id": last_id}
+    if order_by == "created_at":
+        payload["c"] = last_created_at.isoformat()
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, order_by: str) -> Tuple[Any, ...]:
+    """
+    커서를 키 값 튜플로 변환
+    order_by="id" -> (id,), order_by="created_at" -> (created_at, id)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["o"] != order_by:
+            raise InvalidCursorError("커서의 정렬 기준이 요청과 다릅니다.")
+        if order_by == "created_at":
+            return (datetime.fromisoformat(payload["c"]), int(payload["id"]))
+        return (int(payload["id"]),)
+    except InvalidCursorError:
+        raise
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("유효하지 않은 커서입니다.") from e
@@ -0,0 +1,126 @@
+"""
+비밀번호 해싱 프로세스 풀
+
+bcrypt 해싱/검증은 호출마다 수백 ms의 CPU를 쓰고 GIL을 잡기 때문에
+전용 프로세스 풀에서 실행하고 async 래퍼로 기다립니다.
+대기 중인 작업 수가 한도를 넘으면 PasswordHasherBusyError로 바로 거절합니다.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from security import get_password_hash, hash_passwords, verify_and_update_password
+from settings import settings
+
+# ==================== 해싱 풀 설정 ====================
+PASSWORD_POOL_WORKERS = settings.password_pool_workers  # 해싱 프로세스 수
+PASSWORD_POOL_MAX_PENDING = settings.password_pool_max_pending  # 실행 중 + 대기 중 작업 최대 수
+
+
+class PasswordHasherBusyError(Exception):
+    """해싱 대기열이 가득 찬 경우"""
+
+
+class PasswordHasherPool:
+    """
+    크기가 제한된 비밀번호 해싱 프로세스 풀
+    """
+    def __init__(self, workers: int = PASSWORD_POOL_WORKERS, max_pending: int = PASSWORD_POOL_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._metrics: Dict[str, float] = {
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_pending_seen": 0,
+            "latency_total_ms": 0.0,
+            "latency_max_ms": 0.0,
+        }
+
+    def start(self):
+        """프로세스 풀 생성 (spawn: 이벤트 루프/스레드가 있는 프로세스를 fork하지 않도록)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self):
+        """프로세스 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def hash(self, password: str) -> str:
+        """비밀번호를 해시화합니다."""
+        return await self._submit(get_password_hash, password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        여러 비밀번호를 워커 수만큼 나눠 병렬로 해시화합니다.
+        (조각 하나가 대기열 작업 하나이므로 대량 요청도 대기열 한도를 넘기지 않습니다.)
+        """
+        if not passwords:
+            return []
+        size = -(-len(passwords) // self.workers)  # 올림 나눗셈
+        chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+        results = await asyncio.gather(*(self._submit(hash_passwords, chunk) for chunk in chunks))
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """비밀번호를 검증하고 필요하면 새 해시를 함께 반환합니다."""
+        return await self._submit(verify_and_update_password, plain_password, hashed_password)
+
+    async def _submit(self, fn: Callable[..., Any], *args) -> Any:
+        if self._pending >= self.max_pending:
+            self._metrics["rejected"] += 1
+            raise PasswordHasherBusyError("비밀번호 처리 요청이 많습니다. 잠시 후 다시 시도하세요.")
+        self.start()
+        self._pending += 1
+        self._metrics["max_pending_seen"] = max(self._metrics["max_pending_seen"], self._pending)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, fn, *args)
+        except BaseException:
+            # 실패/취소된 작업은 완료 지표와 지연 시간에 섞지 않음
+            self._metrics["failed"] += 1
+            raise
+        finally:
+            self._pending -= 1
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._metrics["completed"] += 1
+        self._metrics["latency_total_ms"] += elapsed_ms
+        self._metrics["latency_max_ms"] = max(self._metrics["latency_max_ms"], elapsed_ms)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """대기열 깊이/지연 시간 지표 조회"""
+        stats: Dict[str, Any] = dict(self._metrics)
+        stats["workers"] = self.workers
+        stats["pending"] = self._pending
+        stats["max_pending"] = self.max_pending
+        stats["latency_avg_ms"] = (
+            stats["latency_total_ms"] / stats["completed"] if stats["completed"] else 0.0
+        )
+        return stats
+
+
+# 전역 해싱 풀
+password_hasher = PasswordHasherPool()
+
+async def hash_password_async(password: str) -> str:
+    """프로세스 풀에서 비밀번호를 해시화합니다."""
+    return await password_hasher.hash(password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """프로세스 풀에서 비밀번호를 검증하고 필요하면 새 해시를 반환합니다."""
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    """프로세스 풀에서 여러 비밀번호를 병렬로 해시화합니다."""
+    return await password_hasher.hash_many(passwords)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # 기본 사용자 스키마
@@ -45,6 +45,8 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     user_id: Optional[int] = None
     email: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
 
 # 로그인 응답 스키마
 class LoginResponse(BaseModel):
@@ -54,4 +56,39 @@ class LoginResponse(BaseModel):
 
 # 메시지 응답 스키마
 class MessageResponse(BaseModel):
-    message: str
\ No newline at end of file
+    message: str
+
+# 대량 생성 행별 결과 스키마
+class BulkUserResult(BaseModel):
+    index: int
+    status: str  # "created" | "error"
+    id: Optional[int] = None
+    email: Optional[str] = None
+    error: Optional[str] = None
+
+# 대량 생성 응답 스키마
+class BulkUserCreateResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[BulkUserResult]
+
+# AI 에이전트 실행 (run) 스키마
+class AgentRunCreate(BaseModel):
+    query: str = Field(..., min_length=1)
+    user_id: str
+    profile: Optional[str] = None
+    incremental: bool = False
+
+class AgentRunResponse(BaseModel):
+    run_id: str
+    user_id: str
+    profile: Optional[str] = None
+    incremental: bool
+    status: str  # "running" | "completed" | "failed" | "cancelled"
+    cancel_reason: Optional[str] = None  # "user" | "disconnected" | "shutdown"
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    last_event_id: Optional[str] = None
+    events: int
+    viewers: int
@@ -1,28 +1,62 @@
 from passlib.context import CryptContext
 import jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List, Tuple
 from schemas import TokenData
+from settings import settings
 
 # JWT 설정
-SECRET_KEY = "your-secret-key-here-change-this-in-production"  # 실제 환경에서는 환경변수로 관리
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 5  # 토큰 유효기간 5분
+SECRET_KEY = settings.secret_key  # 운영(prod)에서는 SECRET_KEY 환경 변수 필수
+ALGORITHM = settings.jwt_algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes  # 토큰 유효기간 (분)
 
-# 최신 방식의 비밀번호 해싱 설정
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    bcrypt__rounds=12  # 보안 강도 설정
-)
+# 비밀번호 해싱 설정
+# PASSWORD_SCHEMES의 첫 번째 방식이 새 해시의 목표 방식이고, 나머지는 검증만 하는 이전 방식입니다.
+# 로그인할 때 목표 방식/비용과 다른 해시는 자동으로 다시 해시됩니다 (verify_and_update).
+PASSWORD_SCHEMES = [s.strip() for s in settings.password_schemes.split(",") if s.strip()]
+PASSWORD_BCRYPT_ROUNDS = settings.password_bcrypt_rounds  # bcrypt 비용 (보안 강도)
+PASSWORD_ARGON2_MEMORY_COST = settings.password_argon2_memory_cost  # argon2 메모리 (KiB)
+PASSWORD_ARGON2_TIME_COST = settings.password_argon2_time_cost  # argon2 반복 횟수
+PASSWORD_ARGON2_PARALLELISM = settings.password_argon2_parallelism  # argon2 병렬도
+
+def build_crypt_context(
+    schemes: List[str] = PASSWORD_SCHEMES,
+    bcrypt_rounds: int = PASSWORD_BCRYPT_ROUNDS,
+    argon2_memory_cost: int = PASSWORD_ARGON2_MEMORY_COST,
+    argon2_time_cost: int = PASSWORD_ARGON2_TIME_COST,
+    argon2_parallelism: int = PASSWORD_ARGON2_PARALLELISM,
+) -> CryptContext:
+    """해싱 방식/비용 설정으로 CryptContext를 생성합니다."""
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",  # 첫 번째 방식이 아닌 해시는 업데이트 대상
+        # 목표 비용과 다른 bcrypt 해시도 업데이트 대상이 되도록 최소/최대를 같게 설정
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__time_cost=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+pwd_context = build_crypt_context()
 
 def get_password_hash(password: str) -> str:
     """비밀번호를 해시화합니다."""
     return pwd_context.hash(password)
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """여러 비밀번호를 한 번에 해시화합니다. (프로세스 풀 작업 단위)"""
+    return [pwd_context.hash(password) for password in passwords]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호를 검증합니다."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """비밀번호를 검증하고, 해시가 목표 방식/비용과 다르면 새 해시를 함께 반환합니다."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """JWT 액세스 토큰을 생성합니다."""
     to_encode = data.copy()
@@ -46,7 +80,12 @@ def verify_token(token: str) -> Optional[TokenData]:
         if user_id is None:
             return None
         
-        return TokenData(user_id=int(user_id), email=email)
+        return TokenData(
+            user_id=int(user_id),
+            email=email,
+            is_active=payload.get("is_active"),
+            is_admin=payload.get("is_admin")
+        )
     except jwt.ExpiredSignatureError:
         # 토큰 만료
         return None
@@ -5,11 +5,65 @@ Claude Agent SDK - 세션 ID 기반 컨텍스트 유지
 """
 
 import asyncio
-from typing import override, List, Dict, Any, Optional
-import json
+import logging
+import time
+from typing import override, List, Dict, Any, Optional, Set
 from claude_agent_sdk import ClaudeSDKClient, query
-from claude_agent_sdk.types import SystemMessage, AssistantMessage, UserMessage, ResultMessage, TextBlock
+from claude_agent_sdk.types import SystemMessage, AssistantMessage, UserMessage, ResultMessage, TextBlock, StreamEvent
 from message_to_json import user_message_to_text
+from client_pool import ClientPool
+from ttl_store import LRUTTLStore
+from agent_limiter import AgentAdmission, AgentRunLimiter
+from session_state import SessionStateBackend, create_session_state_backend
+from agent_profiles import AgentProfile
+from sse import SSEEvent
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 세션 저장소 설정
+SESSION_STORE_MAX_ENTRIES = settings.session_store_max_entries  # 보관할 최대 사용자 세션 수
+SESSION_STORE_TTL = settings.session_store_ttl  # 마지막 사용 후 세션 만료 시간 (초)
+
+CLIENT_INTERRUPT_TIMEOUT = 5.0  # 취소 시 interrupt 응답을 기다리는 최대 시간 (초)
+
+# 증분(incremental) 스트리밍 설정
+SSE_DELTA_FLUSH_INTERVAL = settings.sse_delta_flush_interval  # 모은 delta를 내보내는 최대 간격 (초)
+SSE_DELTA_FLUSH_BYTES = settings.sse_delta_flush_bytes  # 이 크기 이상 모이면 바로 내보냄 (바이트)
+
+
+class TextDeltaCoalescer:
+    """
+    StreamEvent의 text_delta를 모아서 한 번에 내보내는 버퍼
+    토큰마다 SSE 이벤트(= 쓰기 한 번)를 만들지 않도록 flush 간격 또는 크기 기준으로 합칩니다.
+    첫 delta는 바로 내보내므로 첫 토큰까지의 시간(TTFT)은 늘어나지 않습니다.
+    """
+    def __init__(self, flush_interval: float = SSE_DELTA_FLUSH_INTERVAL, flush_bytes: int = SSE_DELTA_FLUSH_BYTES):
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self._parts: List[str] = []
+        self._size = 0
+        self._last_flush = 0.0
+        self.streamed = False  # 현재 메시지의 텍스트를 delta로 이미 내보냈는지
+
+    def add(self, text: str) -> Optional[str]:
+        """delta 추가, 내보낼 때가 되면 모인 텍스트 반환"""
+        self._parts.append(text)
+        self._size += len(text.encode("utf-8"))
+        self.streamed = True
+        if self._size >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_interval:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """모인 텍스트를 모두 반환 (없으면 None)"""
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        self._last_flush = time.monotonic()
+        return text
 
 # ==================== Claude는 세션에서 이전 메시지를 기억합니다. ====================
 # ClaudeAgentOptions.resume을 사용해야 한다.
@@ -21,30 +75,58 @@ class SessionManager:
     """
     def __init__(self):
         self.session_id: Optional[str] = None
+        self.turn_count: int = 0  # 세션 상태 저장소와 동기화된 완료 턴 수
 
-    async def query(self, prompt: str, options):
+    async def query(self, prompt: str, profile: AgentProfile, incremental: bool = False):
         pass
                     
 
-    async def process_message(self, message: str):
-        print(f"응답: {str(message)}\n")
+    async def process_message(self, message: str, coalescer: Optional[TextDeltaCoalescer] = None):
+        """
+        SDK 메시지를 SSEEvent로 변환 (전송 형식은 sse.format_event에서 결정)
+        coalescer가 주어지면(증분 모드) StreamEvent의 text_delta를 모아 'delta' 이벤트로 내보내고,
+        이미 delta로 보낸 완성 TextBlock은 다시 보내지 않습니다.
+        """
+        if isinstance(message, StreamEvent):
+            if coalescer is None:
+                return
+            event = message.event
+            event_type = event.get("type")
+            text = None
+            if event_type == "content_block_delta" and event.get("delta", {}).get("type") == "text_delta":
+                text = coalescer.add(event["delta"].get("text", ""))
+            elif event_type in ("content_block_stop", "message_stop"):
+                text = coalescer.flush()
+            if text:
+                yield SSEEvent.delta(text)
+            return
+        # 메시지 전체 덤프는 DEBUG에서만 (비활성이면 문자열 변환도 하지 않음)
+        logger.debug("응답: %s", message)
+        if coalescer is not None:
+            # 다른 메시지 전에 남은 delta를 먼저 내보냄
+            text = coalescer.flush()
+            if text:
+                yield SSEEvent.delta(text)
         if isinstance(message, SystemMessage):
             if message.data['subtype'] == 'init': # and options.resume != message.data['session_id']:
                 if self.session_id is None:
                     self.session_id = message.data['session_id']
-                    print(f"📌 Session ID: {message.data['session_id']}")
+                    logger.info("📌 Session ID: %s", self.session_id)
         elif isinstance(message, AssistantMessage):
+            streamed = coalescer is not None and coalescer.streamed
+            if coalescer is not None:
+                coalescer.streamed = False
             for block in message.content:
-                if isinstance(block, TextBlock) and block.text.strip() != "":
-                    yield f"data: {json.dumps({'status': 'processing', 'result': block.text})}\n\n"
+                if isinstance(block, TextBlock) and block.text.strip() != "" and not streamed:
+                    yield SSEEvent.text(block.text)
         elif isinstance(message, UserMessage):
             user_message = user_message_to_text(message)
             if user_message != "":
-                yield f"data: {json.dumps({'status': 'processing', 'result': user_message})}\n\n"
+                yield SSEEvent.tool_result(user_message)
         elif isinstance(message, ResultMessage):
-            yield f"data: {json.dumps({'status': 'completed', 'result': message.result})}\n\n"
+            yield SSEEvent.done(message.result)
         else:
-            yield f"data: {json.dumps({'status': 'processing', 'result': str(message)})}\n\n"
+            yield SSEEvent.text(str(message))
 
     def get_session_id(self) -> Optional[str]:
         """현재 세션 ID 반환"""
@@ -53,7 +135,8 @@ class SessionManager:
     def reset_session(self):
         """새 세션 시작 (컨텍스트 초기화)"""
         self.session_id = None
-        print("✅ 세션이 초기화되었습니다.")
+        self.turn_count = 0
+        logger.info("✅ 세션이 초기화되었습니다.")
         
 # ==================== ClaudeSDKClient 방식 ====================
 class SessionManagerWithClient(SessionManager):
@@ -65,25 +148,57 @@ class SessionManagerWithClient(SessionManager):
         대화형 애플리케이션 - 채팅 인터페이스, REPL(Interactive applications - Chat interfaces, REPLs)
         응답 기반 로직 - 다음 작업이 Claude의 응답에 따라 달라질 때(Response-driven logic - When next action depends on Claude’s response)
         세션 제어 - 대화 수명 주기를 명시적으로 관리(Session control - Managing conversation lifecycle explicitly)
+
+    client_pool이 주어지면 사용자별로 연결된 클라이언트를 풀에서 빌려 재사용합니다.
+    (연결된 클라이언트는 대화 컨텍스트를 유지하므로 resume은 새로 연결할 때만 사용됩니다.)
     """
-    def __init__(self):
+    def __init__(self, user_id: Optional[str] = None, client_pool: Optional[ClientPool] = None):
         super().__init__()
+        self.user_id = user_id
+        self.client_pool = client_pool
     
     @override
-    async def query(self, prompt: str, options):
+    async def query(self, prompt: str, profile: AgentProfile, incremental: bool = False):
         """
         세션 ID를 사용하여 쿼리 실행
+        incremental=True이면 부분 메시지(text delta)를 받아 토큰 단위로 스트리밍
         """
         
-        options.resume = self.session_id  # 👈 이전 세션 ID 전달!
+        # 👈 이전 세션 ID 전달! (템플릿은 수정하지 않음)
+        options = profile.build_options(resume=self.session_id, include_partial_messages=incremental)
         
-        # ClaudeSDKClient 사용
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt)
-            
+        if self.client_pool is None:
+            # ClaudeSDKClient 사용 (요청마다 새 연결)
+            async with ClaudeSDKClient(options=options) as client:
+                async for msg in self._run(client, prompt, incremental):
+                    yield msg
+            return
+
+        # 풀에서 연결된 클라이언트 재사용 (증분 여부가 다르면 다른 연결 옵션이므로 키에 포함)
+        options_key = (profile.name, incremental)
+        async with self.client_pool.acquire(self.user_id, options, options_key=options_key) as client:
+            async for msg in self._run(client, prompt, incremental):
+                yield msg
+
+    async def _run(self, client, prompt: str, incremental: bool = False):
+        """연결된 클라이언트로 한 턴 실행"""
+        await client.query(prompt)
+        
+        coalescer = TextDeltaCoalescer() if incremental else None
+        try:
             async for message in client.receive_response():
-                async for msg in self.process_message(message):
+                async for msg in self.process_message(message, coalescer):
                     yield msg
+        except asyncio.CancelledError:
+            # 실행이 취소됨(연결 끊김/DELETE): 모델 생성을 바로 멈춤 (클라이언트는 풀에서 폐기됨)
+            await self._interrupt(client)
+            raise
+
+    async def _interrupt(self, client):
+        try:
+            await asyncio.wait_for(client.interrupt(), timeout=CLIENT_INTERRUPT_TIMEOUT)
+        except Exception as e:
+            logger.warning("⚠️ 클라이언트 interrupt 실패 (user_id=%s): %s", self.user_id, e)
 
 # ==================== Query 방식 ====================
 class SessionManagerWithQuery(SessionManager):
@@ -99,16 +214,18 @@ class SessionManagerWithQuery(SessionManager):
         super().__init__()
     
     @override
-    async def query(self, prompt: str, options):
+    async def query(self, prompt: str, profile: AgentProfile, incremental: bool = False):
         """
         세션 ID를 사용하여 컨텍스트 유지하며 쿼리 실행
         """
         
-        options.resume = self.session_id  # 👈 이전 세션 ID 전달!
+        # 👈 이전 세션 ID 전달!
+        options = profile.build_options(resume=self.session_id, include_partial_messages=incremental)
         
         # query() 함수 사용
+        coalescer = TextDeltaCoalescer() if incremental else None
         async for message in query(prompt=prompt, options=options):
-            async for msg in self.process_message(message):
+            async for msg in self.process_message(message, coalescer):
                 yield msg
     
 # ==================== 사용자별 세션 관리 ====================
@@ -116,32 +233,133 @@ class SessionManagerWithQuery(SessionManager):
 class MultiSessionController:
     """
     여러 사용자의 독립적인 세션 관리
+
+    세션은 LRU + TTL 저장소에 보관되며, 오래 쓰이지 않거나 최대 개수를 넘은 세션은
+    제거되면서 풀에 있는 해당 사용자의 클라이언트도 함께 종료됩니다.
+    같은 사용자의 쿼리는 run_limiter로 직렬화되어 session_id/resume 경쟁이 생기지 않습니다.
+    user_id -> session_id 매핑은 state_backend에 기록되므로 다른 워커에서도 대화를 이어갈 수 있습니다.
     """
-    def __init__(self):
-        self.sessions: Dict[str, SessionManager] = {}
+    def __init__(
+        self,
+        client_pool: Optional[ClientPool] = None,
+        max_sessions: int = SESSION_STORE_MAX_ENTRIES,
+        session_ttl: float = SESSION_STORE_TTL,
+        run_limiter: Optional[AgentRunLimiter] = None,
+        state_backend: Optional[SessionStateBackend] = None,
+    ):
+        self.client_pool = client_pool if client_pool is not None else ClientPool()
+        self.run_limiter = run_limiter if run_limiter is not None else AgentRunLimiter()
+        self.state_backend = state_backend if state_backend is not None else create_session_state_backend()
+        self.sessions: LRUTTLStore[str, SessionManager] = LRUTTLStore(
+            max_entries=max_sessions,
+            ttl=session_ttl,
+            on_evict=self._on_session_evicted,
+        )
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._background_tasks: Set[asyncio.Task] = set()
     
+    def start(self):
+        """백그라운드 정리 작업 시작 (lifespan에서 호출)"""
+        self.client_pool.start()
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def shutdown(self):
+        """세션 정리 작업을 멈추고 풀에 남아 있는 클라이언트 종료 (lifespan에서 호출)"""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        await self.client_pool.shutdown()
+
+    async def _sweep_loop(self):
+        """만료된 세션 주기적 정리"""
+        interval = max(self.sessions.ttl / 2, 1.0) if self.sessions.ttl else 60.0
+        while True:
+            await asyncio.sleep(interval)
+            self.sessions.purge_expired()
+            try:
+                await self.state_backend.purge_expired()
+            except Exception as e:
+                logger.warning("⚠️ 세션 상태 정리 실패: %s", e)
+
+    def _on_session_evicted(self, user_id: str, session: SessionManager):
+        """세션이 제거되면 해당 사용자의 클라이언트도 종료"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.client_pool.discard(user_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     def get_or_create_session(self, user_id: str) -> SessionManager:
         """사용자 세션 가져오기 또는 생성"""
-        print(f"🔑 user_id={user_id}")
-        if user_id not in self.sessions:
-            self.sessions[user_id] = SessionManagerWithClient()
-            #self.sessions[user_id] = SessionManagerWithQuery()
-        return self.sessions[user_id]
+        logger.debug("🔑 user_id=%s", user_id)
+        session = self.sessions.get(user_id)
+        if session is None:
+            session = SessionManagerWithClient(user_id, self.client_pool)
+            #session = SessionManagerWithQuery()
+            self.sessions.set(user_id, session)
+        return session
     
-    async def query(self, prompt: str, user_id: str, options):
-        """특정 사용자 세션에서 쿼리 실행"""
-        session = self.get_or_create_session(user_id)
-        async for message in session.query(prompt, options):
-            yield message
+    def check_admission(self, user_id: str) -> AgentAdmission:
+        """쿼리 대기열 자리 예약 (대기열이 가득 차면 AgentQueueFullError)"""
+        return self.run_limiter.check_admission(user_id)
+
+    async def query(
+        self,
+        prompt: str,
+        user_id: str,
+        profile: AgentProfile,
+        incremental: bool = False,
+        admission: Optional[AgentAdmission] = None,
+    ):
+        """
+        특정 사용자 세션에서 쿼리 실행 (사용자별로 한 턴씩 순서대로)
+        admission: check_admission으로 미리 예약한 대기열 자리 (없으면 여기서 예약)
+        """
+        async with self.run_limiter.slot(user_id, admission):
+            session = self.get_or_create_session(user_id)
+            await self._sync_session_state(user_id, session)
+
+            async for message in session.query(prompt, profile, incremental):
+                yield message
+
+            # 턴이 끝까지 완료된 경우에만 공유 상태에 기록
+            if session.session_id is not None:
+                state = await self.state_backend.record_turn(user_id, session.session_id)
+                session.turn_count = state.turn_count
+
+    async def _sync_session_state(self, user_id: str, session: SessionManager):
+        """공유 상태가 로컬 세션보다 앞서 있으면(다른 워커에서 대화 진행) 로컬 세션을 맞춤"""
+        state = await self.state_backend.load(user_id)
+        if state is None or state.turn_count == session.turn_count:
+            return
+        session.session_id = state.session_id
+        session.turn_count = state.turn_count
+        # 연결된 클라이언트는 이후 턴을 모르므로 폐기하고 resume으로 다시 연결
+        await self.client_pool.discard(user_id)
     
-    def reset_session(self, user_id: str):
+    async def reset_session(self, user_id: str):
         """특정 사용자 세션 초기화"""
-        if user_id in self.sessions:
-            self.sessions[user_id].reset_session()
+        session = self.sessions.get(user_id)
+        if session is not None:
+            session.reset_session()
+        # 연결된 클라이언트가 이전 컨텍스트를 들고 있으므로 함께 폐기
+        await self.client_pool.discard(user_id)
+        await self.state_backend.delete(user_id)
     
     def get_session_info(self, user_id: str) -> Optional[str]:
         """세션 정보 조회"""
-        if user_id in self.sessions:
-            return self.sessions[user_id].get_session_id()
+        session = self.sessions.get(user_id)
+        if session is not None:
+            return session.get_session_id()
         return None
 
+    def get_stats(self) -> Dict[str, Any]:
+        """세션 저장소/클라이언트 풀/동시성 지표 조회"""
+        return {
+            "session_store": self.sessions.get_stats(),
+            "client_pool": self.client_pool.get_stats(),
+            "run_limiter": self.run_limiter.get_stats(),
+        }
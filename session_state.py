@@ -0,0 +1,161 @@
+"""
+AI 대화 세션 상태 저장소 (user_id -> session_id)
+
+uvicorn 워커나 파드가 여러 개일 때 다음 쿼리가 다른 워커로 가도
+같은 session_id로 resume할 수 있도록 세션 상태를 공유합니다.
+
+- InMemorySessionStateBackend: 단일 워커용 (기본값)
+- SQLSessionStateBackend: database.py 엔진을 사용하는 워커 간 공유용
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+from database import SessionLocal
+from models import AgentSession
+from ttl_store import LRUTTLStore
+from settings import settings
+
+# ==================== 세션 상태 설정 ====================
+SESSION_STATE_BACKEND = settings.session_state_backend  # memory | sql
+SESSION_STATE_MAX_ENTRIES = settings.session_state_max_entries  # memory 백엔드 최대 항목 수
+SESSION_STATE_TTL = settings.session_state_ttl  # 마지막 사용 후 상태 보관 시간 (초)
+
+
+@dataclass(frozen=True)
+class SessionState:
+    """사용자의 대화 세션 상태"""
+    user_id: str
+    session_id: Optional[str]
+    last_used_at: datetime
+    turn_count: int
+
+
+class SessionStateBackend(ABC):
+    """세션 상태 저장소 인터페이스"""
+
+    @abstractmethod
+    async def load(self, user_id: str) -> Optional[SessionState]:
+        """사용자 세션 상태 조회"""
+
+    @abstractmethod
+    async def record_turn(self, user_id: str, session_id: str) -> SessionState:
+        """완료된 턴을 기록 (session_id 저장, 턴 수 증가, 마지막 사용 시각 갱신)"""
+
+    @abstractmethod
+    async def delete(self, user_id: str):
+        """사용자 세션 상태 삭제"""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """ttl이 지난 상태를 삭제하고 삭제한 개수를 반환"""
+
+
+class InMemorySessionStateBackend(SessionStateBackend):
+    """프로세스 메모리에 보관하는 세션 상태 (워커 간 공유되지 않음)"""
+    def __init__(self, max_entries: int = SESSION_STATE_MAX_ENTRIES, ttl: float = SESSION_STATE_TTL):
+        self._states: LRUTTLStore[str, SessionState] = LRUTTLStore(max_entries=max_entries, ttl=ttl)
+
+    async def load(self, user_id: str) -> Optional[SessionState]:
+        return self._states.get(user_id)
+
+    async def record_turn(self, user_id: str, session_id: str) -> SessionState:
+        current = self._states.get(user_id)
+        now = datetime.utcnow()
+        if current is None:
+            state = SessionState(user_id=user_id, session_id=session_id, last_used_at=now, turn_count=1)
+        else:
+            state = replace(current, session_id=session_id, last_used_at=now, turn_count=current.turn_count + 1)
+        self._states.set(user_id, state)
+        return state
+
+    async def delete(self, user_id: str):
+        self._states.pop(user_id)
+
+    async def purge_expired(self) -> int:
+        return self._states.purge_expired()
+
+
+class SQLSessionStateBackend(SessionStateBackend):
+    """
+    agent_sessions 테이블에 보관하는 세션 상태
+
+    동기 엔진을 사용하므로 DB 호출은 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+    턴 수는 UPDATE ... SET turn_count = turn_count + 1 로 원자적으로 증가시킵니다.
+    """
+    def __init__(self, ttl: float = SESSION_STATE_TTL):
+        self.ttl = ttl
+
+    async def load(self, user_id: str) -> Optional[SessionState]:
+        return await asyncio.to_thread(self._load, user_id)
+
+    async def record_turn(self, user_id: str, session_id: str) -> SessionState:
+        return await asyncio.to_thread(self._record_turn, user_id, session_id)
+
+    async def delete(self, user_id: str):
+        await asyncio.to_thread(self._delete, user_id)
+
+    async def purge_expired(self) -> int:
+        return await asyncio.to_thread(self._purge_expired)
+
+    # ---------- 동기 구현 (스레드에서 실행) ----------
+    def _load(self, user_id: str) -> Optional[SessionState]:
+        with SessionLocal() as db:
+            row = db.execute(select(AgentSession).where(AgentSession.user_id == user_id)).scalar_one_or_none()
+            return self._to_state(row) if row is not None else None
+
+    def _record_turn(self, user_id: str, session_id: str) -> SessionState:
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            stmt = (
+                update(AgentSession)
+                .where(AgentSession.user_id == user_id)
+                .values(session_id=session_id, last_used_at=now, turn_count=AgentSession.turn_count + 1)
+            )
+            if db.execute(stmt).rowcount == 0:
+                db.add(AgentSession(user_id=user_id, session_id=session_id, last_used_at=now, turn_count=1))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # 다른 워커가 먼저 행을 만든 경우 증가로 재시도
+                    db.rollback()
+                    db.execute(stmt)
+                    db.commit()
+            else:
+                db.commit()
+            row = db.execute(select(AgentSession).where(AgentSession.user_id == user_id)).scalar_one()
+            return self._to_state(row)
+
+    def _delete(self, user_id: str):
+        with SessionLocal() as db:
+            db.execute(delete(AgentSession).where(AgentSession.user_id == user_id))
+            db.commit()
+
+    def _purge_expired(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        with SessionLocal() as db:
+            result = db.execute(delete(AgentSession).where(AgentSession.last_used_at < cutoff))
+            db.commit()
+            return result.rowcount
+
+    @staticmethod
+    def _to_state(row) -> SessionState:
+        return SessionState(
+            user_id=row.user_id,
+            session_id=row.session_id,
+            last_used_at=row.last_used_at,
+            turn_count=row.turn_count,
+        )
+
+
+def create_session_state_backend(kind: str = SESSION_STATE_BACKEND) -> SessionStateBackend:
+    """설정값(memory | sql)에 맞는 세션 상태 저장소 생성"""
+    if kind == "memory":
+        return InMemorySessionStateBackend()
+    if kind == "sql":
+        return SQLSessionStateBackend()
+    raise ValueError(f"지원하지 않는 세션 상태 저장소입니다: {kind}")
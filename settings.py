@@ -0,0 +1,143 @@
+"""
+애플리케이션 설정 (pydantic-settings)
+
+환경 변수와 .env 파일에서 읽습니다. (환경 변수가 .env보다 우선, 이름은 대소문자 구분 없음)
+APP_ENV 프로필에 따라 일부 기본값이 달라집니다.
+
+- dev  (기본): debug 응답, /docs 공개
+- prod       : debug 끔, /docs·/redoc·/openapi.json 비공개, 접근 로그 WARNING, SECRET_KEY 필수
+
+각 모듈은 기존 이름의 상수(예: database.DB_POOL_SIZE)를 이 설정에서 가져와 사용합니다.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Literal, Optional
+from pydantic import Field, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+DEV_SECRET_KEY = "your-secret-key-here-change-this-in-production"  # 개발용 기본값 (prod에서는 사용 불가)
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
+    # ==================== 앱 ====================
+    app_env: Literal["dev", "prod"] = "dev"     # 실행 프로필
+    debug: Optional[bool] = None                # FastAPI debug (기본: dev=True, prod=False)
+    docs_enabled: Optional[bool] = None         # /docs, /redoc, /openapi.json 공개 (기본: dev=True, prod=False)
+
+    # ==================== 로깅 ====================
+    log_level: str = "INFO"                     # 기본 로그 레벨
+    log_levels: Optional[str] = None            # 모듈별 레벨 "이름=레벨,..." (기본: prod는 uvicorn.access=WARNING)
+    log_format: Literal["text", "json"] = "text"
+    log_queue_size: int = 10000                 # 출력 대기 중인 최대 로그 수 (넘치면 버림)
+
+    # ==================== 데이터베이스 ====================
+    # 필수 (기본값 없음), 형식: mysql+pymysql://사용자명:비밀번호@호스트:포트/데이터베이스명
+    database_url: str
+    async_database_url: Optional[str] = None    # 기본: database_url의 비동기 드라이버 버전
+    db_pool_size: int = 10                      # 유지할 연결 수
+    db_max_overflow: int = 20                   # pool_size를 넘어 추가로 열 수 있는 연결 수
+    db_pool_timeout: float = 30                 # 연결을 얻기 위한 최대 대기 시간 (초)
+    db_pool_recycle: int = 3600                 # 연결 재활용 주기 (초)
+    db_pool_pre_ping: bool = True               # 체크아웃 시 연결 상태 확인
+    db_echo: bool = False                       # SQL 쿼리 로깅 (개발 시에만)
+    db_statement_timeout_ms: int = 0            # SELECT 최대 실행 시간 (MySQL, 0=제한 없음)
+
+    # ==================== JWT ====================
+    secret_key: str = DEV_SECRET_KEY
+    jwt_algorithm: str = "HS256"
+    access_token_expire_minutes: int = 5        # 토큰 유효기간 (분)
+
+    # ==================== 비밀번호 해싱 ====================
+    # 첫 번째 방식이 새 해시의 목표 방식이고, 나머지는 검증만 하는 이전 방식 (쉼표 구분)
+    password_schemes: str = "bcrypt"
+    password_bcrypt_rounds: int = 12            # bcrypt 비용 (보안 강도)
+    password_argon2_memory_cost: int = 19456    # argon2 메모리 (KiB)
+    password_argon2_time_cost: int = 2          # argon2 반복 횟수
+    password_argon2_parallelism: int = 1        # argon2 병렬도
+    password_pool_workers: int = Field(default_factory=lambda: min(4, os.cpu_count() or 1))  # 해싱 프로세스 수
+    password_pool_max_pending: int = 64         # 실행 중 + 대기 중 해싱 작업 최대 수
+
+    # ==================== 캐시 / 통계 ====================
+    auth_cache_ttl: float = 30                  # 인증 캐시 유효 시간 (초)
+    auth_cache_max_entries: int = 10000         # 인증 캐시 최대 사용자 수
+    auth_trust_token_claims: bool = False       # 토큰의 is_active/is_admin 클레임을 만료 시까지 신뢰
+    user_cache_backend: str = "memory"          # 사용자 조회 캐시 저장소 (memory)
+    user_cache_ttl: float = 60                  # 사용자 조회 캐시 유효 시간 (초)
+    user_cache_max_entries: int = 30000         # 사용자 조회 캐시 최대 항목 수
+    stats_refresh_interval: float = 60          # 통계 주기적 재집계 간격 (초)
+    stats_min_refresh_interval: float = 5       # dirty 재집계 최소 간격 (초)
+    stats_max_staleness: float = 300            # 이보다 오래된 통계는 요청 시 재집계 (초)
+    stats_signup_days: int = 30                 # 일별 가입자 수 집계 기간 (일)
+
+    # ==================== 사용자 대량 생성 ====================
+    bulk_create_chunk_size: int = 500           # 한 트랜잭션에 넣을 행 수
+    bulk_create_max_rows: int = 10000           # 요청 한 번에 받을 최대 행 수
+
+    # ==================== AI 스트리밍 (SSE) ====================
+    default_agent_profile: str = "calc"         # 프로필을 지정하지 않은 요청의 에이전트 프로필
+    agent_max_concurrent_runs: int = 8          # 워커당 동시 실행 에이전트 수
+    agent_max_queue_depth: int = 32             # 전역 대기열 최대 길이
+    agent_max_queued_turns_per_user: int = 1    # 사용자별 대기 가능한 턴 수
+    agent_queue_timeout: float = 60             # 대기열 최대 대기 시간 (초)
+    client_pool_max_clients: int = 20           # 동시에 살아있는 Claude 서브프로세스 최대 수
+    client_pool_idle_timeout: float = 300       # 유휴 클라이언트 종료 시간 (초)
+    client_pool_acquire_timeout: float = 30     # 클라이언트 대기 최대 시간 (초)
+    session_store_max_entries: int = 1000       # 보관할 최대 사용자 세션 수
+    session_store_ttl: float = 3600             # 마지막 사용 후 세션 만료 시간 (초)
+    session_state_backend: Literal["memory", "sql"] = "memory"  # 세션 상태 저장소
+    session_state_max_entries: int = 10000      # memory 저장소 최대 항목 수
+    session_state_ttl: float = 86400            # 마지막 사용 후 상태 보관 시간 (초)
+    sse_delta_flush_interval: float = 0.05      # 증분 모드에서 모은 delta를 내보내는 최대 간격 (초)
+    sse_delta_flush_bytes: int = 256            # 증분 모드에서 이 크기 이상 모이면 바로 내보냄 (바이트)
+    sse_replay_max_events: int = 2000           # 스트림별 재연결용 이벤트 버퍼 크기
+    sse_replay_ttl: float = 300                 # 스트림이 끝난 뒤 재연결을 받을 수 있는 시간 (초)
+    sse_max_streams: int = 1000                 # 보관할 최대 스트림 수
+    sse_disconnect_poll_interval: float = 1.0   # 이벤트를 기다리는 동안 연결 끊김 확인 주기 (초)
+    sse_disconnect_grace: float = 10            # query-sse 연결이 모두 끊긴 뒤 실행 취소까지 재연결 대기 시간 (초)
+    sse_heartbeat_interval: float = 15          # 보낼 이벤트가 없을 때 heartbeat 주석 간격 (초, 0=끔, 프록시 유휴 타임아웃보다 짧게)
+    sse_upstream_idle_timeout: float = 120      # 에이전트 응답이 이 시간 동안 없으면 중단 (초, 0=제한 없음)
+    sse_max_stream_duration: float = 600        # 한 실행의 최대 시간 (초, 0=제한 없음)
+
+    @model_validator(mode="after")
+    def _apply_profile(self) -> "Settings":
+        """프로필별 기본값 적용 (명시적으로 설정한 값은 유지)"""
+        is_prod = self.app_env == "prod"
+        if self.debug is None:
+            self.debug = not is_prod
+        if self.docs_enabled is None:
+            self.docs_enabled = not is_prod
+        if self.log_levels is None:
+            self.log_levels = "uvicorn.access=WARNING" if is_prod else ""
+        if is_prod and self.secret_key == DEV_SECRET_KEY:
+            raise ValueError("운영(prod) 프로필에서는 SECRET_KEY를 설정해야 합니다.")
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """적용된 설정 요약 (비밀 값은 가림)"""
+        values = self.model_dump()
+        values["secret_key"] = "***"
+        for key in ("database_url", "async_database_url"):
+            if values[key]:
+                values[key] = make_url(values[key]).render_as_string(hide_password=True)
+        return values
+
+
+def log_settings_summary():
+    """시작 시 적용된 설정을 로그로 남김"""
+    summary = settings.summary()
+    logger.info(
+        "⚙️ 설정 (APP_ENV=%s): debug=%s docs=%s db_echo=%s db_pool=%s+%s log_level=%s",
+        summary["app_env"], summary["debug"], summary["docs_enabled"], summary["db_echo"],
+        summary["db_pool_size"], summary["db_max_overflow"], summary["log_level"],
+    )
+    logger.debug("⚙️ 전체 설정: %s", summary)
+
+
+# 전역 설정
+settings = Settings()
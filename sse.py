@@ -0,0 +1,397 @@
+"""
+SSE(Server-Sent Events) 프레이밍 + 재연결 재생 버퍼
+
+v2 (기본):
+    event: run                      (처음 구독할 때 한 번, id 없음)
+    data: {"run_id":"<stream_id>"}  (첫 응답 이벤트 전에도 취소할 수 있도록)
+
+    event: text | delta | tool_result | done | error
+    id: <stream_id>:<seq>
+    data: {"text":"..."}            (UTF-8 그대로, 공백 없는 JSON)
+v1 (기존 클라이언트용):
+    data: {"status": "processing", "result": "..."}
+
+에이전트 응답은 ReplayStream의 생산 작업(백그라운드 태스크)이 버퍼에 쌓고,
+HTTP 응답은 버퍼를 구독해서 내보냅니다. 연결이 끊겨도 작업은 계속되며,
+브라우저가 Last-Event-ID로 다시 연결하면 끊긴 지점 이후부터 이어서 받습니다.
+(에이전트 실행 단위의 레지스트리는 agent_runs.AgentRunManager)
+
+프록시(nginx/ELB) 뒤에서 긴 도구 호출 중에도 연결이 끊기지 않도록
+보낼 이벤트가 없으면 SSE 주석(": heartbeat")을 주기적으로 보냅니다.
+상위(에이전트) 응답이 너무 오래 없거나 전체 시간이 최대치를 넘으면 error 이벤트로 끝냅니다.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# ==================== SSE 설정 ====================
+SSE_REPLAY_MAX_EVENTS = settings.sse_replay_max_events  # 스트림별로 보관할 최대 이벤트 수
+SSE_REPLAY_TTL = settings.sse_replay_ttl  # 스트림이 끝난 뒤 재연결을 받을 수 있는 시간 (초)
+SSE_MAX_STREAMS = settings.sse_max_streams  # 보관할 최대 스트림 수 (끝난 스트림부터 제거)
+SSE_DISCONNECT_POLL_INTERVAL = settings.sse_disconnect_poll_interval  # 이벤트를 기다리는 동안 연결 끊김 확인 주기 (초)
+SSE_HEARTBEAT_INTERVAL = settings.sse_heartbeat_interval  # 보낼 것이 없을 때 heartbeat 주석 간격 (초, 0=끔)
+SSE_UPSTREAM_IDLE_TIMEOUT = settings.sse_upstream_idle_timeout  # 에이전트 응답이 이 시간 동안 없으면 중단 (초, 0=제한 없음)
+SSE_MAX_STREAM_DURATION = settings.sse_max_stream_duration  # 한 스트림의 최대 실행 시간 (초, 0=제한 없음)
+
+# 프록시 버퍼링/캐시를 끄는 SSE 응답 헤더
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-transform",
+    "X-Accel-Buffering": "no",  # nginx가 응답을 모았다가 보내지 않도록
+}
+HEARTBEAT_FRAME = ": heartbeat\n\n"
+
+EVENT_TYPES = ("run", "text", "delta", "tool_result", "done", "error")
+
+# v1 형식의 status 값
+_V1_STATUS = {
+    "text": "processing",
+    "tool_result": "processing",
+    "delta": "delta",
+    "done": "completed",
+    "error": "error",
+}
+
+
+@dataclass(frozen=True)
+class SSEEvent:
+    """전송 형식과 무관한 스트림 이벤트"""
+    type: str
+    data: Dict[str, Any]
+
+    @classmethod
+    def run(cls, run_id: str) -> "SSEEvent":
+        return cls("run", {"run_id": run_id})
+
+    @classmethod
+    def text(cls, text: str) -> "SSEEvent":
+        return cls("text", {"text": text})
+
+    @classmethod
+    def delta(cls, text: str) -> "SSEEvent":
+        return cls("delta", {"text": text})
+
+    @classmethod
+    def tool_result(cls, text: str) -> "SSEEvent":
+        return cls("tool_result", {"text": text})
+
+    @classmethod
+    def done(cls, result: Optional[str]) -> "SSEEvent":
+        return cls("done", {"result": result})
+
+    @classmethod
+    def error(cls, message: str, code: str = "error") -> "SSEEvent":
+        return cls("error", {"message": message, "code": code})
+
+    @property
+    def is_final(self) -> bool:
+        return self.type in ("done", "error")
+
+
+def format_event(event: SSEEvent, protocol: int = 2, event_id: Optional[str] = None) -> str:
+    """이벤트를 SSE 프레임 문자열로 변환"""
+    if protocol == 1:
+        result = event.data.get("text", event.data.get("result", event.data.get("message")))
+        return f"data: {json.dumps({'status': _V1_STATUS[event.type], 'result': result})}\n\n"
+    data = json.dumps(event.data, ensure_ascii=False, separators=(",", ":"))
+    if event_id is None:
+        return f"event: {event.type}\ndata: {data}\n\n"
+    return f"event: {event.type}\nid: {event_id}\ndata: {data}\n\n"
+
+
+def parse_event_id(value: str) -> Tuple[str, int]:
+    """Last-Event-ID "stream_id:seq" 파싱 (형식이 틀리면 ValueError)"""
+    stream_id, _, seq = value.strip().rpartition(":")
+    if not stream_id:
+        raise ValueError(value)
+    return stream_id, int(seq)
+
+
+async def keep_alive(
+    frames: AsyncIterator[str],
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    heartbeat_interval: float = SSE_HEARTBEAT_INTERVAL,
+    poll_interval: float = SSE_DISCONNECT_POLL_INTERVAL,
+) -> AsyncIterator[str]:
+    """
+    frames를 그대로 전달하면서
+    - 마지막 전송 후 heartbeat_interval초 동안 보낼 것이 없으면 heartbeat 주석을 보내고
+    - 다음 프레임을 기다리는 동안 poll_interval마다 is_disconnected()로 연결 끊김을 확인해 끊기면 중단
+    """
+    loop = asyncio.get_running_loop()
+    iterator = frames.__aiter__()
+    pending: Optional[asyncio.Future] = None
+    last_sent = loop.time()
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = poll_interval if is_disconnected is not None else None
+            if heartbeat_interval:
+                until_heartbeat = max(0.0, last_sent + heartbeat_interval - loop.time())
+                timeout = until_heartbeat if timeout is None else min(timeout, until_heartbeat)
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                if is_disconnected is not None and await is_disconnected():
+                    return
+                if heartbeat_interval and loop.time() - last_sent >= heartbeat_interval:
+                    yield HEARTBEAT_FRAME
+                    last_sent = loop.time()
+                continue
+            finished, pending = pending, None
+            try:
+                frame = finished.result()
+            except StopAsyncIteration:
+                return
+            yield frame
+            last_sent = loop.time()
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await iterator.aclose()
+
+
+class ReplayGapError(Exception):
+    """요청한 위치의 이벤트가 이미 버퍼에서 밀려난 경우"""
+
+
+class ReplayStream:
+    """
+    한 번의 에이전트 응답을 담는 이벤트 버퍼
+
+    생산 작업이 publish한 이벤트에 1부터 순서 번호를 붙여 보관하고,
+    subscribe(after)는 after 이후 이벤트를 재생한 뒤 새 이벤트를 기다립니다.
+    """
+    def __init__(
+        self,
+        owner: str,
+        max_events: int = SSE_REPLAY_MAX_EVENTS,
+        stream_id: Optional[str] = None,
+        idle_timeout: float = SSE_UPSTREAM_IDLE_TIMEOUT,
+        max_duration: float = SSE_MAX_STREAM_DURATION,
+    ):
+        self.id = stream_id or uuid.uuid4().hex
+        self.owner = owner
+        self.idle_timeout = idle_timeout
+        self.max_duration = max_duration
+        self._events: Deque[Tuple[int, SSEEvent]] = deque(maxlen=max_events)
+        self._seq = 0
+        self._changed = asyncio.Condition()
+        self.finished = False
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.viewers = 0  # 현재 구독 중인 HTTP 연결 수
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def start(self, source: AsyncIterator[SSEEvent]) -> "ReplayStream":
+        """source를 끝까지 읽어 버퍼에 쌓는 백그라운드 작업 시작"""
+        self.task = asyncio.create_task(self._produce(source))
+        self.task.add_done_callback(self._on_task_done)
+        return self
+
+    def _on_task_done(self, task: asyncio.Task):
+        # 시작하기 전에 취소되면 _produce의 finally가 실행되지 않으므로 여기서 종료 처리
+        if not self.finished:
+            asyncio.ensure_future(self.finish())
+
+    async def _produce(self, source: AsyncIterator[SSEEvent]):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_duration if self.max_duration else None
+        iterator = source.__aiter__()
+        try:
+            while True:
+                timeout = self.idle_timeout or None
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                try:
+                    # 시간 초과 시 source가 취소되어 SDK 클라이언트 interrupt/폐기, 슬롯 반환까지 진행됨
+                    async with asyncio.timeout(timeout):
+                        event = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                except TimeoutError:
+                    await iterator.aclose()
+                    await self.publish(self._timeout_event(deadline is not None and loop.time() >= deadline))
+                    break
+                await self.publish(event)
+        except Exception as e:
+            logger.warning("⚠️ 스트림 %s 생산 중 오류: %s", self.id, e, exc_info=True)
+            await self.publish(SSEEvent.error("AI 응답 중 오류가 발생했습니다.", code="internal"))
+        finally:
+            await self.finish()
+
+    def _timeout_event(self, max_duration_exceeded: bool) -> SSEEvent:
+        if max_duration_exceeded:
+            logger.warning("⏱️ 스트림 %s 최대 실행 시간 초과 (%s초)", self.id, self.max_duration)
+            return SSEEvent.error(f"최대 응답 시간({self.max_duration:g}초)을 넘어 중단했습니다.", code="max_duration")
+        logger.warning("⏱️ 스트림 %s 상위 응답 없음 (%s초)", self.id, self.idle_timeout)
+        return SSEEvent.error(f"AI 응답이 {self.idle_timeout:g}초 동안 없어 중단했습니다.", code="upstream_timeout")
+
+    async def publish(self, event: SSEEvent):
+        async with self._changed:
+            self._seq += 1
+            self._events.append((self._seq, event))
+            self._changed.notify_all()
+
+    async def finish(self):
+        async with self._changed:
+            if not self.finished:
+                self.finished = True
+                self.finished_at = time.monotonic()
+            self._changed.notify_all()
+
+    async def subscribe(self, after: int = 0) -> AsyncIterator[Tuple[int, SSEEvent]]:
+        """after 이후의 (seq, 이벤트)를 순서대로 반환 (스트림이 끝나면 종료)"""
+        seq = after
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self._seq > seq or self.finished)
+                first = self._events[0][0] if self._events else self._seq + 1
+                if seq + 1 < first:
+                    raise ReplayGapError(self.id)
+                pending = list(itertools.islice(self._events, seq + 1 - first, None))
+                done = self.finished
+            for seq, event in pending:
+                yield seq, event
+            if done:
+                return
+
+
+class ReplayStreamRegistry:
+    """
+    stream_id -> ReplayStream
+
+    진행 중인 스트림은 유지하고, 끝난 스트림은 ttl초 동안만 재연결용으로 보관합니다.
+    """
+    def __init__(self, max_streams: int = SSE_MAX_STREAMS, ttl: float = SSE_REPLAY_TTL):
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self._streams: Dict[str, ReplayStream] = {}
+        self._metrics = {
+            "created": 0,
+            "resumed": 0,
+            "resume_misses": 0,
+            "replay_gaps": 0,
+            "expired": 0,
+            "disconnects": 0,
+        }
+
+    def add(self, stream: ReplayStream) -> ReplayStream:
+        """만들어 둔 스트림 등록 (가득 찼으면 끝난 스트림부터 제거)"""
+        self.purge_expired()
+        if len(self._streams) >= self.max_streams:
+            self._evict_finished()
+        self._streams[stream.id] = stream
+        self._metrics["created"] += 1
+        return stream
+
+    def get(self, stream_id: str) -> Optional[ReplayStream]:
+        stream = self._streams.get(stream_id)
+        if stream is not None and self._is_expired(stream, time.monotonic()):
+            self._streams.pop(stream_id, None)
+            self._metrics["expired"] += 1
+            return None
+        return stream
+
+    def _is_expired(self, stream: ReplayStream, now: float) -> bool:
+        return stream.finished_at is not None and now - stream.finished_at >= self.ttl
+
+    def purge_expired(self) -> int:
+        """재연결 보관 시간이 지난 스트림 제거"""
+        now = time.monotonic()
+        expired = [sid for sid, stream in self._streams.items() if self._is_expired(stream, now)]
+        for sid in expired:
+            del self._streams[sid]
+        self._metrics["expired"] += len(expired)
+        return len(expired)
+
+    def _evict_finished(self):
+        """가득 찼으면 가장 먼저 끝난 스트림부터 제거 (진행 중인 스트림은 유지)"""
+        finished = sorted(
+            (s for s in self._streams.values() if s.finished_at is not None),
+            key=lambda s: s.finished_at,
+        )
+        for stream in finished[:len(self._streams) - self.max_streams + 1]:
+            del self._streams[stream.id]
+
+    async def iter_frames(
+        self,
+        stream: ReplayStream,
+        after: int = 0,
+        protocol: int = 2,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        heartbeat_interval: float = SSE_HEARTBEAT_INTERVAL,
+    ) -> AsyncIterator[str]:
+        """
+        스트림을 구독해 SSE 프레임으로 내보냄 (HTTP 응답 본문)
+        is_disconnected(예: request.is_disconnected)가 주어지면 연결이 끊기는 즉시 구독을 끝냄
+        """
+        if after:
+            self._metrics["resumed"] += 1
+        stream.viewers += 1
+        frames = keep_alive(self._format_events(stream, after, protocol), is_disconnected, heartbeat_interval)
+        try:
+            async for frame in frames:
+                yield frame
+        finally:
+            await frames.aclose()
+            stream.viewers -= 1
+            if not stream.finished:
+                self._metrics["disconnects"] += 1
+            self.on_viewer_left(stream)
+
+    async def _format_events(self, stream: ReplayStream, after: int, protocol: int) -> AsyncIterator[str]:
+        if after == 0 and protocol == 2:
+            # 첫 응답 이벤트가 늦어도(긴 도구 호출 등) 클라이언트가 바로 취소할 수 있도록 실행 id를 먼저 알림
+            # id를 붙이지 않으므로 브라우저의 Last-Event-ID는 바뀌지 않음
+            yield format_event(SSEEvent.run(stream.id), protocol)
+        try:
+            async for seq, event in stream.subscribe(after):
+                yield format_event(event, protocol, f"{stream.id}:{seq}")
+        except ReplayGapError:
+            self._metrics["replay_gaps"] += 1
+            yield format_event(
+                SSEEvent.error("재연결 위치의 응답이 버퍼에서 만료되었습니다.", code="replay_gap"), protocol
+            )
+
+    def on_viewer_left(self, stream: ReplayStream):
+        """구독 연결이 끝났을 때 호출 (하위 클래스에서 취소 정책 구현)"""
+
+    def resume_miss(self, protocol: int = 2) -> str:
+        """재연결할 스트림이 없을 때 보내는 에러 이벤트 (에이전트를 다시 실행하지 않음)"""
+        self._metrics["resume_misses"] += 1
+        return format_event(SSEEvent.error("재연결할 스트림이 없거나 만료되었습니다.", code="stream_not_found"), protocol)
+
+    async def shutdown(self):
+        """진행 중인 생산 작업 취소 (lifespan 종료 시 호출)"""
+        tasks = [s.task for s in self._streams.values() if s.task is not None and not s.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스트림 수/재연결 지표 조회"""
+        active = sum(1 for s in self._streams.values() if not s.finished)
+        return {
+            "streams": len(self._streams),
+            "active_streams": active,
+            "viewers": sum(s.viewers for s in self._streams.values()),
+            "max_streams": self.max_streams,
+            "ttl_seconds": self.ttl,
+            **self._metrics,
+        }
+
@@ -7,7 +7,7 @@ user_id = "lucas-123"
 def query_with_sse(query: str):
     """SSE 방식으로 쿼리 전송 및 결과 수신"""
     url = f"http://localhost:8000/api/mcp/query-sse"
-    params = {'query': query, 'user_id': user_id}
+    params = {'query': query, 'user_id': user_id, 'protocol': 1}  # data 전용 기존 형식 (status/result)
     # stream=True로 SSE 수신
     with requests.get(url, params=params, stream=True) as response:
         print(f"연결됨 (상태 코드: {response.status_code})")
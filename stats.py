@@ -0,0 +1,206 @@
+"""
+사용자 통계 캐시 (/api/stats)
+
+COUNT(*)를 대시보드 요청마다 실행하지 않도록 통계 스냅샷을 메모리에 유지합니다.
+- crud_async의 쓰기 함수가 알 수 있는 변화(생성/삭제)는 바로 반영 (삭제는 지운 행의 플래그/가입일 기준)
+- 정확히 알 수 없는 변화(활성/관리자 플래그 변경, 업서트)는 dirty로 표시해 백그라운드 새로고침을 앞당김
+- 백그라운드 작업이 주기적으로 DB에서 다시 집계 (다른 워커의 쓰기도 이 주기 안에 반영)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import select, func, case
+from database import AsyncSessionLocal
+from models import User
+from settings import settings
+
+# ==================== 통계 캐시 설정 ====================
+STATS_REFRESH_INTERVAL = settings.stats_refresh_interval  # 주기적 재집계 간격 (초)
+STATS_MIN_REFRESH_INTERVAL = settings.stats_min_refresh_interval  # dirty 재집계 최소 간격 (초)
+STATS_MAX_STALENESS = settings.stats_max_staleness  # 이보다 오래된 스냅샷은 요청 시 재집계 (초)
+STATS_SIGNUP_DAYS = settings.stats_signup_days  # 일별 가입자 수 집계 기간 (일)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserStatsSnapshot:
+    """집계 시점의 사용자 통계"""
+    total_users: int
+    active_users: int
+    admin_users: int
+    signups_per_day: Dict[str, int] = field(default_factory=dict)
+    refreshed_at: float = field(default_factory=time.time)
+
+
+class UserStatsCache:
+    """
+    사용자 통계 스냅샷 + 쓰기 훅 + 백그라운드 재집계
+    """
+    def __init__(
+        self,
+        refresh_interval: float = STATS_REFRESH_INTERVAL,
+        min_refresh_interval: float = STATS_MIN_REFRESH_INTERVAL,
+        max_staleness: float = STATS_MAX_STALENESS,
+        signup_days: int = STATS_SIGNUP_DAYS,
+    ):
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.max_staleness = max_staleness
+        self.signup_days = signup_days
+        self._snapshot: Optional[UserStatsSnapshot] = None
+        self._dirty = asyncio.Event()
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    # ==================== 조회 ====================
+    async def get(self, fresh: bool = False) -> UserStatsSnapshot:
+        """
+        통계 스냅샷 조회
+        fresh=True이거나 스냅샷이 없거나 max_staleness보다 오래됐으면 DB에서 다시 집계
+        """
+        snapshot = self._snapshot
+        if fresh or snapshot is None or time.time() - snapshot.refreshed_at > self.max_staleness:
+            snapshot = await self.refresh()
+        return snapshot
+
+    async def refresh(self) -> UserStatsSnapshot:
+        """DB에서 통계를 다시 집계 (동시에 여러 요청이 와도 한 번만 실행)"""
+        started = time.time()
+        async with self._refresh_lock:
+            # 락을 기다리는 동안 다른 요청이 이미 새로 집계했으면 그 결과 사용
+            if self._snapshot is not None and self._snapshot.refreshed_at >= started:
+                return self._snapshot
+            self._dirty.clear()
+            snapshot = await self._load()
+            self._snapshot = snapshot
+            self._refreshes += 1
+            return snapshot
+
+    async def _load(self) -> UserStatsSnapshot:
+        since = datetime.utcnow().date() - timedelta(days=self.signup_days - 1)
+        async with AsyncSessionLocal() as db:
+            totals = (await db.execute(select(
+                func.count(User.id),
+                func.coalesce(func.sum(case((User.is_active == True, 1), else_=0)), 0),
+                func.coalesce(func.sum(case((User.is_admin == True, 1), else_=0)), 0),
+            ))).one()
+            signup_day = func.date(User.created_at)
+            rows = (await db.execute(
+                select(signup_day, func.count(User.id))
+                .where(User.created_at >= datetime.combine(since, datetime.min.time()))
+                .group_by(signup_day)
+                .order_by(signup_day)
+            )).all()
+        return UserStatsSnapshot(
+            total_users=int(totals[0]),
+            active_users=int(totals[1]),
+            admin_users=int(totals[2]),
+            signups_per_day={str(day): int(count) for day, count in rows},
+        )
+
+    # ==================== 쓰기 훅 (crud_async에서 호출) ====================
+    def on_users_created(self, count: int = 1, created_at: Optional[datetime] = None):
+        """새 사용자 생성 (기본값: 활성, 관리자 아님)"""
+        snapshot = self._snapshot
+        if snapshot is None or count <= 0:
+            return
+        if self._refresh_lock.locked():
+            # 진행 중인 집계 결과가 이 변경을 포함하는지 알 수 없으므로 한 번 더 집계
+            self.mark_dirty()
+        day = (created_at or datetime.utcnow()).date().isoformat()
+        signups = dict(snapshot.signups_per_day)
+        signups[day] = signups.get(day, 0) + count
+        self._snapshot = replace(
+            snapshot,
+            total_users=snapshot.total_users + count,
+            active_users=snapshot.active_users + count,
+            signups_per_day=signups,
+        )
+
+    def on_user_deleted(
+        self,
+        is_active: Optional[bool] = None,
+        is_admin: Optional[bool] = None,
+        created_at: Optional[datetime] = None,
+    ):
+        """
+        사용자 삭제 (삭제된 행의 플래그/가입일로 각 카운터를 바로 갱신)
+        플래그를 모르면(RETURNING 미지원) 총 사용자 수만 줄이고 나머지는 재집계로 맞춤
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        if self._refresh_lock.locked() or is_active is None or is_admin is None:
+            # 진행 중인 집계 결과가 이 변경을 포함하는지 알 수 없거나, 바로 반영할 수 없는 카운터가 있으므로 한 번 더 집계
+            self.mark_dirty()
+        signups = dict(snapshot.signups_per_day)
+        day = created_at.date().isoformat() if created_at is not None else None
+        if day in signups:
+            signups[day] = max(signups[day] - 1, 0)
+        self._snapshot = replace(
+            snapshot,
+            total_users=max(snapshot.total_users - 1, 0),
+            active_users=max(snapshot.active_users - (1 if is_active else 0), 0),
+            admin_users=max(snapshot.admin_users - (1 if is_admin else 0), 0),
+            signups_per_day=signups,
+        )
+
+    def mark_dirty(self):
+        """정확히 반영할 수 없는 변경이 있었음을 표시 (백그라운드 재집계를 앞당김)"""
+        self._dirty.set()
+
+    # ==================== 백그라운드 재집계 ====================
+    def start(self):
+        """백그라운드 재집계 작업 시작 (lifespan에서 호출)"""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def shutdown(self):
+        """백그라운드 재집계 작업 중지 (lifespan에서 호출)"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        """주기적으로, 또는 dirty 표시가 있으면 min_refresh_interval 간격으로 재집계"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self._refresh_errors += 1
+                logger.warning("⚠️ 사용자 통계 집계 실패: %s", e)
+            await asyncio.sleep(self.min_refresh_interval)
+            try:
+                await asyncio.wait_for(
+                    self._dirty.wait(),
+                    timeout=max(self.refresh_interval - self.min_refresh_interval, 0)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 상태 지표 조회"""
+        snapshot = self._snapshot
+        return {
+            "refreshes": self._refreshes,
+            "refresh_errors": self._refresh_errors,
+            "dirty": self._dirty.is_set(),
+            "age_seconds": time.time() - snapshot.refreshed_at if snapshot else None,
+            "refresh_interval": self.refresh_interval,
+            "max_staleness": self.max_staleness,
+        }
+
+
+# 전역 사용자 통계 캐시
+user_stats = UserStatsCache()
@@ -0,0 +1,79 @@
+"""
+테스트 공통 설정
+
+앱 모듈은 import 시점에 settings를 읽으므로, 그 전에 임시 SQLite 데이터베이스를 가리키도록 환경 변수를 설정합니다.
+비동기 테스트는 anyio pytest 플러그인(@pytest.mark.anyio)으로 asyncio에서 실행합니다.
+"""
+
+import os
+import tempfile
+
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="fastapi-first-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DB_DIR, 'test.db')}"
+os.environ.setdefault("APP_ENV", "dev")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+import pytest
+
+from fakes import FakeClientFactory
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """테이블을 새로 만들고 사용자 캐시/통계 상태를 비운 비동기 세션"""
+    from database import engine, async_engine, AsyncSessionLocal
+    from auth_cache import auth_principal_cache
+    from stats import user_stats
+    from user_cache import user_cache, InMemoryUserCacheBackend
+    from models import Base  # models를 import해야 users 테이블이 메타데이터에 등록됨
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    user_cache.backend = InMemoryUserCacheBackend()
+    auth_principal_cache._store.clear()
+    user_stats._snapshot = None
+    async with AsyncSessionLocal() as session:
+        yield session
+    # 테스트마다 이벤트 루프가 바뀌므로 이전 루프에 묶인 연결을 남기지 않음
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def agent_controller(monkeypatch):
+    """
+    가짜 클라이언트를 쓰는 세션 컨트롤러를 전역 컨트롤러로 교체
+    반환값: (controller, factory)
+    """
+    import generator
+    from agent_limiter import AgentRunLimiter
+    from client_pool import ClientPool
+    from session_manager import MultiSessionController
+    from session_state import InMemorySessionStateBackend
+
+    generator.load_agent_profiles()
+    factory = FakeClientFactory()
+    controller = MultiSessionController(
+        client_pool=ClientPool(client_factory=factory, max_clients=4, acquire_timeout=1),
+        run_limiter=AgentRunLimiter(max_concurrent=2, max_queue_depth=2, max_queued_per_user=0, queue_timeout=1),
+        state_backend=InMemorySessionStateBackend(),
+    )
+    monkeypatch.setattr(generator, "_global_session_controller", controller)
+    yield controller, factory
+    factory.release()
+    await controller.shutdown()
+
+
+@pytest.fixture
+async def client():
+    """앱에 직접 연결한 HTTP 클라이언트 (lifespan 없이)"""
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+        yield http_client
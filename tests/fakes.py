@@ -0,0 +1,80 @@
+"""
+ClaudeSDKClient 대역 (서브프로세스/API 호출 없이 정해진 메시지를 돌려줌)
+
+ClientPool(client_factory=FakeClientFactory())처럼 넣어 사용합니다.
+factory.hold()를 호출하면 다음 응답들은 첫 텍스트를 보낸 뒤 release()까지 멈춰 있으므로
+실행 중 취소/끊김 상황을 만들 수 있습니다.
+"""
+
+import asyncio
+from typing import Any, List, Optional
+from claude_agent_sdk.types import AssistantMessage, ResultMessage, SystemMessage, TextBlock
+
+
+class FakeClaudeClient:
+    """ClaudeSDKClient와 같은 인터페이스 (비동기 컨텍스트 매니저, query, receive_response, interrupt)"""
+    def __init__(self, factory: "FakeClientFactory", options: Any = None):
+        self.factory = factory
+        self.options = options
+        self.connected = False
+        self.prompts: List[str] = []
+        self.interrupted = False
+
+    async def __aenter__(self) -> "FakeClaudeClient":
+        if self.factory.fail_connect:
+            raise ConnectionError("fake connect failure")
+        self.connected = True
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.connected = False
+        self.factory.disconnects += 1
+
+    async def query(self, prompt: str):
+        self.prompts.append(prompt)
+
+    async def receive_response(self):
+        prompt = self.prompts[-1]
+        yield SystemMessage(subtype="init", data={"subtype": "init", "session_id": self.factory.session_id})
+        yield AssistantMessage(content=[TextBlock(text=f"answer: {prompt}")], model="fake")
+        self.factory.started.set()
+        if self.factory.gate is not None:
+            await self.factory.gate.wait()
+        yield ResultMessage(
+            subtype="success",
+            duration_ms=1,
+            duration_api_ms=1,
+            is_error=False,
+            num_turns=1,
+            session_id=self.factory.session_id,
+            result=f"done: {prompt}",
+        )
+
+    async def interrupt(self):
+        self.interrupted = True
+
+
+class FakeClientFactory:
+    """만든 가짜 클라이언트를 기록하는 client_factory"""
+    def __init__(self, session_id: str = "fake-session", fail_connect: bool = False):
+        self.session_id = session_id
+        self.fail_connect = fail_connect
+        self.clients: List[FakeClaudeClient] = []
+        self.disconnects = 0
+        self.started = asyncio.Event()  # 응답이 첫 텍스트까지 진행되면 set
+        self.gate: Optional[asyncio.Event] = None
+
+    def __call__(self, options: Any = None) -> FakeClaudeClient:
+        client = FakeClaudeClient(self, options)
+        self.clients.append(client)
+        return client
+
+    def hold(self):
+        """이후 응답을 ResultMessage 직전에서 멈춤"""
+        self.started = asyncio.Event()
+        self.gate = asyncio.Event()
+
+    def release(self):
+        """멈춘 응답을 계속 진행"""
+        if self.gate is not None:
+            self.gate.set()
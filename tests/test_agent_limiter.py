@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+
+from agent_limiter import AgentQueueFullError, AgentRunLimiter
+from agent_runs import AgentRunManager
+
+pytestmark = pytest.mark.anyio
+
+
+async def _hold_slot(limiter: AgentRunLimiter, user_id: str, entered: asyncio.Event, release: asyncio.Event):
+    async with limiter.slot(user_id):
+        entered.set()
+        await release.wait()
+
+
+async def test_second_turn_of_busy_user_is_rejected_with_429():
+    limiter = AgentRunLimiter(max_concurrent=2, max_queue_depth=4, max_queued_per_user=0)
+    entered, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(limiter, "alice", entered, release))
+    await entered.wait()
+
+    with pytest.raises(AgentQueueFullError) as exc_info:
+        limiter.check_admission("alice")
+    assert exc_info.value.status_code == 429
+    # 다른 사용자는 받음
+    limiter.check_admission("bob").release()
+
+    release.set()
+    await holder
+    limiter.check_admission("alice").release()
+
+
+async def test_full_global_queue_is_rejected_with_503():
+    limiter = AgentRunLimiter(max_concurrent=1, max_queue_depth=1, max_queued_per_user=1)
+    entered, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(limiter, "alice", entered, release))
+    await entered.wait()
+    # bob은 전역 슬롯을 기다리며 대기열을 채움
+    waiter = asyncio.create_task(_hold_slot(limiter, "bob", asyncio.Event(), release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AgentQueueFullError) as exc_info:
+        limiter.check_admission("carol")
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.retry_after == 5
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert limiter.get_stats()["running"] == 0
+
+
+async def test_admitted_slot_does_not_count_rejection_twice():
+    limiter = AgentRunLimiter(max_concurrent=1, max_queue_depth=4, max_queued_per_user=0)
+    entered, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(limiter, "alice", entered, release))
+    await entered.wait()
+
+    with pytest.raises(AgentQueueFullError):
+        limiter.check_admission("alice")
+    release.set()
+    await holder
+    async with limiter.slot("alice", limiter.check_admission("alice")):
+        pass
+
+    stats = limiter.get_stats()
+    assert stats["rejected_user_busy"] == 1
+    assert stats["admitted"] == 2
+
+
+async def test_same_user_turns_run_in_order():
+    limiter = AgentRunLimiter(max_concurrent=4, max_queue_depth=4, max_queued_per_user=2)
+    order = []
+
+    async def turn(name: str):
+        async with limiter.slot("alice"):
+            order.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}-end")
+
+    await asyncio.gather(turn("first"), turn("second"))
+
+    assert order == ["first-start", "first-end", "second-start", "second-end"]
+
+
+async def test_queue_timeout_is_rejected_with_503():
+    limiter = AgentRunLimiter(max_concurrent=1, max_queue_depth=4, max_queued_per_user=1, queue_timeout=0.05)
+    entered, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(limiter, "alice", entered, release))
+    await entered.wait()
+
+    with pytest.raises(AgentQueueFullError) as exc_info:
+        async with limiter.slot("bob"):
+            pass
+    assert exc_info.value.status_code == 503
+
+    release.set()
+    await holder
+    stats = limiter.get_stats()
+    assert stats["queue_timeouts"] == 1
+    assert (stats["running"], stats["waiting"], stats["active_users"]) == (0, 0, 0)
+
+
+def test_admission_reserves_capacity_for_back_to_back_requests():
+    limiter = AgentRunLimiter(max_concurrent=1, max_queue_depth=2, max_queued_per_user=0)
+
+    alice = limiter.check_admission("alice")
+    busy = []
+    for _ in range(20):
+        with pytest.raises(AgentQueueFullError) as exc_info:
+            limiter.check_admission("alice")
+        busy.append(exc_info.value.status_code)
+    bob = limiter.check_admission("bob")
+    with pytest.raises(AgentQueueFullError) as exc_info:
+        limiter.check_admission("carol")
+
+    assert busy == [429] * 20
+    assert exc_info.value.status_code == 503
+    assert (limiter.get_stats()["waiting"], limiter.get_stats()["active_users"]) == (2, 2)
+
+    alice.release()
+    alice.release()  # 두 번 반환해도 한 번만 반영
+    bob.release()
+    assert (limiter.get_stats()["waiting"], limiter.get_stats()["active_users"]) == (0, 0)
+
+
+async def test_slot_takes_over_admission_once():
+    limiter = AgentRunLimiter(max_concurrent=1, max_queue_depth=1, max_queued_per_user=0)
+    admission = limiter.check_admission("alice")
+
+    async with limiter.slot("alice", admission):
+        assert (limiter.get_stats()["running"], limiter.get_stats()["waiting"]) == (1, 0)
+        admission.release()  # 이미 넘겨받은 예약은 반환되지 않음
+        assert limiter.get_stats()["active_users"] == 1
+    with pytest.raises(RuntimeError):
+        async with limiter.slot("alice", admission):
+            pass
+
+    assert limiter.get_stats()["active_users"] == 0
+
+
+async def test_concurrent_requests_cannot_bypass_limits(agent_controller, client):
+    controller, factory = agent_controller
+    factory.hold()
+
+    same_user = await asyncio.gather(*(
+        client.post("/api/mcp/runs", json={"query": "long task", "user_id": "alice"}) for _ in range(10)
+    ))
+    other_users = await asyncio.gather(*(
+        client.post("/api/mcp/runs", json={"query": "long task", "user_id": f"user{i}"}) for i in range(10)
+    ))
+
+    assert sorted(r.status_code for r in same_user) == [202] + [429] * 9
+    accepted = [r for r in other_users if r.status_code == 202]
+    assert {r.status_code for r in other_users} == {202, 503}
+    # 실행 중(max_concurrent=2) + 대기(max_queue_depth=2)를 넘지 않음 (alice 1건 포함)
+    assert len(accepted) + 1 <= 4
+    stats = controller.run_limiter.get_stats()
+    assert stats["running"] + stats["waiting"] == len(accepted) + 1
+
+
+async def test_admission_is_returned_when_run_is_cancelled_before_it_starts(agent_controller):
+    controller, factory = agent_controller
+    manager = AgentRunManager()
+
+    run = manager.start_run("1+1", "alice", admission=controller.check_admission("alice"))
+    assert manager.cancel_run(run)
+    await asyncio.wait([run.task], timeout=1)
+    await asyncio.sleep(0)
+
+    assert factory.clients == []
+    stats = controller.run_limiter.get_stats()
+    assert (stats["waiting"], stats["active_users"]) == (0, 0)
@@ -0,0 +1,40 @@
+from claude_agent_sdk import ClaudeAgentOptions
+
+from agent_profiles import AgentProfileRegistry
+
+
+def _profile():
+    server = object()  # MCP 서버 인스턴스 대역
+    options = ClaudeAgentOptions(
+        mcp_servers={"calc": {"type": "sdk", "name": "calc", "instance": server}},
+        allowed_tools=["mcp__calc__add"],
+        env={"MODE": "test"},
+    )
+    return AgentProfileRegistry().register("calc", options), server
+
+
+def test_build_options_sets_resume_without_touching_template():
+    profile, _ = _profile()
+
+    options = profile.build_options(resume="session-1", include_partial_messages=True)
+
+    assert (options.resume, options.include_partial_messages) == ("session-1", True)
+    assert (profile.options.resume, profile.options.include_partial_messages) == (None, False)
+
+
+def test_request_changes_do_not_leak_into_template():
+    profile, server = _profile()
+
+    options = profile.build_options()
+    options.allowed_tools.append("Bash")
+    options.env["MODE"] = "changed"
+    options.mcp_servers["calc"]["name"] = "changed"
+    options.mcp_servers["other"] = {"type": "sdk", "name": "other", "instance": object()}
+
+    template = profile.options
+    assert template.allowed_tools == ["mcp__calc__add"]
+    assert template.env == {"MODE": "test"}
+    assert list(template.mcp_servers) == ["calc"]
+    assert template.mcp_servers["calc"]["name"] == "calc"
+    # 서버 인스턴스는 요청마다 다시 만들지 않고 공유
+    assert profile.build_options().mcp_servers["calc"]["instance"] is server
@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import pytest
+
+from agent_runs import AgentRunManager, agent_runs
+
+pytestmark = pytest.mark.anyio
+
+
+async def _wait_done(run, timeout: float = 2):
+    await asyncio.wait([run.task], timeout=timeout)
+    assert run.task.done()
+    # finish는 완료 콜백에서 한 번 더 예약될 수 있으므로 한 턴 양보
+    await asyncio.sleep(0)
+
+
+def _sse_events(body: str):
+    """응답 본문 -> [(event, id, data)]"""
+    events = []
+    for frame in body.split("\n\n"):
+        fields = {}
+        for line in frame.splitlines():
+            name, _, value = line.partition(": ")
+            fields[name] = value
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+async def test_run_completes_and_records_events(agent_controller):
+    controller, factory = agent_controller
+    manager = AgentRunManager()
+
+    run = manager.start_run("1+1", "alice")
+    await _wait_done(run)
+
+    events = [event async for _, event in run.subscribe()]
+    assert [event.type for event in events] == ["text", "done"]
+    assert events[-1].data == {"result": "done: 1+1"}
+    assert run.status == "completed"
+    # 턴이 끝난 클라이언트는 풀에 남아 다음 턴에서 재사용
+    assert controller.client_pool.get_stats()["live_clients"] == 1
+    assert controller.run_limiter.get_stats()["admitted"] == 1
+
+
+async def test_cancel_run_interrupts_client(agent_controller):
+    controller, factory = agent_controller
+    factory.hold()
+    manager = AgentRunManager()
+
+    run = manager.start_run("long task", "alice")
+    await factory.started.wait()
+    assert manager.cancel_run(run)
+    await _wait_done(run)
+
+    assert run.status == "cancelled"
+    assert factory.clients[0].interrupted
+    assert not manager.cancel_run(run)
+    events = [event async for _, event in run.subscribe()]
+    assert events[-1].data["code"] == "cancelled"
+
+
+async def test_http_run_resume_by_last_event_id(agent_controller, client):
+    response = await client.post("/api/mcp/runs", json={"query": "2+2", "user_id": "alice"})
+    assert response.status_code == 202
+    run_id = response.json()["run_id"]
+    await _wait_done(agent_runs.get(run_id))
+
+    full = await client.get(f"/api/mcp/runs/{run_id}/events", params={"user_id": "alice"})
+    events = _sse_events(full.text)
+    assert [event for event, _, _ in events] == ["run", "text", "done"]
+    assert events[0][2] == {"run_id": run_id}
+
+    resumed = await client.get(
+        f"/api/mcp/runs/{run_id}/events",
+        params={"user_id": "alice"},
+        headers={"Last-Event-ID": f"{run_id}:1"},
+    )
+    assert [(event, event_id) for event, event_id, _ in _sse_events(resumed.text)] == [("done", f"{run_id}:2")]
+
+    other_user = await client.get(f"/api/mcp/runs/{run_id}", params={"user_id": "bob"})
+    assert other_user.status_code == 404
+
+
+async def test_http_busy_user_gets_429_and_delete_cancels(agent_controller, client):
+    controller, factory = agent_controller
+    factory.hold()
+    response = await client.post("/api/mcp/runs", json={"query": "long task", "user_id": "alice"})
+    run_id = response.json()["run_id"]
+    await factory.started.wait()
+
+    busy = await client.post("/api/mcp/runs", json={"query": "again", "user_id": "alice"})
+    assert busy.status_code == 429
+    assert "Retry-After" in busy.headers
+
+    deleted = await client.delete(f"/api/mcp/runs/{run_id}", params={"user_id": "alice"})
+    assert deleted.status_code == 200
+    await _wait_done(agent_runs.get(run_id))
+    assert agent_runs.get(run_id).status == "cancelled"
+    assert factory.clients[0].interrupted
+
+
+async def test_abandoned_run_is_cancelled_after_grace_and_client_interrupted(agent_controller):
+    controller, factory = agent_controller
+    factory.hold()
+    manager = AgentRunManager(disconnect_grace=0.05)
+
+    run = manager.start_run("long task", "alice", cancel_on_disconnect=True)
+    frames = manager.iter_frames(run, 0, heartbeat_interval=0)
+    assert (await frames.__anext__()).startswith("event: run")
+    await factory.started.wait()
+    await frames.aclose()  # 브라우저 연결 끊김
+    await _wait_done(run)
+
+    client = factory.clients[0]
+    assert run.status == "cancelled"
+    assert run.cancel_reason == "disconnected"
+    assert client.interrupted
+    # 취소된 클라이언트는 풀에서 폐기되고 사용자 슬롯도 반환됨
+    await asyncio.gather(*controller.client_pool._closing_tasks)
+    assert not client.connected
+    assert controller.run_limiter.get_stats()["running"] == 0
+    assert manager.get_stats()["cancelled_disconnect"] == 1
+
+
+async def test_reconnect_within_grace_keeps_run_alive(agent_controller):
+    controller, factory = agent_controller
+    factory.hold()
+    manager = AgentRunManager(disconnect_grace=0.05)
+
+    run = manager.start_run("long task", "alice", cancel_on_disconnect=True)
+    frames = manager.iter_frames(run, 0, heartbeat_interval=0)
+    await frames.__anext__()
+    await factory.started.wait()
+    await frames.aclose()
+    # Last-Event-ID로 다시 연결
+    resumed = manager.iter_frames(run, run.last_seq, heartbeat_interval=0)
+    reader = asyncio.create_task(_read_all(resumed))
+    await asyncio.sleep(0.1)
+    factory.release()
+    await _wait_done(run)
+    await reader
+
+    assert run.status == "completed"
+    assert not factory.clients[0].interrupted
+
+
+async def _read_all(frames):
+    return [frame async for frame in frames]
+
+
+async def test_runs_started_without_disconnect_cancel_keep_running(agent_controller):
+    controller, factory = agent_controller
+    factory.hold()
+    manager = AgentRunManager(disconnect_grace=0)
+
+    run = manager.start_run("long task", "alice")
+    frames = manager.iter_frames(run, 0, heartbeat_interval=0)
+    await frames.__anext__()
+    await factory.started.wait()
+    await frames.aclose()
+    await asyncio.sleep(0.05)
+
+    assert run.status == "running"
+    factory.release()
+    await _wait_done(run)
+    assert run.status == "completed"
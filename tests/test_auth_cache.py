@@ -0,0 +1,62 @@
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import insert
+
+import crud_async
+import dependencies
+from auth_cache import AuthPrincipal, auth_principal_cache
+from models import User
+from schemas import UserUpdate
+from security import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+async def _add_user(db, **values) -> int:
+    row = {"email": "kim@example.com", "username": "kim", "hashed_password": "x", "is_admin": True}
+    row.update(values)
+    result = await db.execute(insert(User).values(**row))
+    await db.commit()
+    return result.inserted_primary_key[0]
+
+
+def _credentials(user_id: int) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": str(user_id)}))
+
+
+async def test_principal_is_cached_after_first_lookup(db):
+    user_id = await _add_user(db)
+
+    principal = await dependencies.get_current_principal(_credentials(user_id), db)
+
+    assert principal == AuthPrincipal(id=user_id, is_active=True, is_admin=True)
+    assert auth_principal_cache.get(user_id) == principal
+
+
+async def test_update_and_delete_invalidate_auth_principal(db):
+    user_id = await _add_user(db)
+    auth_principal_cache.set(AuthPrincipal(id=user_id, is_active=True, is_admin=False))
+
+    await crud_async.update_user(db, user_id, UserUpdate(is_active=False))
+    assert auth_principal_cache.get(user_id) is None
+
+    auth_principal_cache.set(AuthPrincipal(id=user_id, is_active=False, is_admin=False))
+    assert await crud_async.delete_user(db, user_id)
+    assert auth_principal_cache.get(user_id) is None
+
+
+async def test_principal_read_before_invalidation_is_not_cached(db, monkeypatch):
+    user_id = await _add_user(db)
+    real_get_user = dependencies.get_user
+
+    async def get_user_then_revoke(session, user_id):
+        user = await real_get_user(session, user_id=user_id)
+        # DB를 읽은 직후 다른 요청에서 관리자 권한을 회수하고 커밋
+        auth_principal_cache.invalidate(user_id)
+        return user
+
+    monkeypatch.setattr(dependencies, "get_user", get_user_then_revoke)
+    principal = await dependencies.get_current_principal(_credentials(user_id), db)
+
+    assert principal.is_admin
+    assert auth_principal_cache.get(user_id) is None
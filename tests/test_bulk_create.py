@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import select
+
+import crud_async
+from models import User
+from schemas import UserCreate
+from stats import user_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def _fake_hash_many(passwords):
+    return [f"hashed:{password}" for password in passwords]
+
+
+@pytest.fixture(autouse=True)
+def fake_hashing(monkeypatch):
+    monkeypatch.setattr(crud_async, "hash_passwords_async", _fake_hash_many)
+
+
+def _user(email: str, username: str) -> UserCreate:
+    return UserCreate(email=email, username=username, password="password123")
+
+
+async def test_created_rows_and_stats_use_the_same_timestamp(db):
+    await user_stats.get(fresh=True)
+
+    results = await crud_async.bulk_create_users(db, [_user("alice@example.com", "alice"), _user("bob@example.com", "bob")])
+
+    assert [r["status"] for r in results] == ["created", "created"]
+    created_days = {created_at.date().isoformat() for created_at in (await db.scalars(select(User.created_at)))}
+    stats = await user_stats.get()
+    assert stats.total_users == 2
+    assert {day: count for day, count in stats.signups_per_day.items() if count} == {created_days.pop(): 2}
+
+
+async def test_case_variants_are_duplicates_on_case_insensitive_collation(db, monkeypatch):
+    monkeypatch.setattr(db.get_bind().dialect, "name", "mysql")
+    insert_calls = []
+    real_execute = db.execute
+
+    async def counting_execute(statement, *args, **kwargs):
+        if statement.is_insert:
+            insert_calls.append(len(args[0]) if args else 1)
+        return await real_execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", counting_execute)
+    results = await crud_async.bulk_create_users(db, [
+        _user("Kim@example.com", "kim"),
+        _user("kim@example.com", "kim2"),
+        _user("lee@example.com", "KIM"),
+    ])
+
+    assert [r["status"] for r in results] == ["created", "error", "error"]
+    # 사전 검사에서 걸러지므로 행 단위 재시도 없이 INSERT 한 번
+    assert insert_calls == [1]
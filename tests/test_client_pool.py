@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from client_pool import ClientPool, ClientPoolTimeoutError
+from fakes import FakeClientFactory
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_reuses_connected_client_per_user():
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory, max_clients=4)
+
+    async with pool.acquire("alice", options=None, options_key="calc") as first:
+        pass
+    async with pool.acquire("alice", options=None, options_key="calc") as second:
+        pass
+    async with pool.acquire("bob", options=None, options_key="calc") as other:
+        pass
+
+    assert first is second
+    assert other is not first
+    assert len(factory.clients) == 2
+    stats = pool.get_stats()
+    assert (stats["hits"], stats["misses"], stats["live_clients"]) == (1, 2, 2)
+    await pool.shutdown()
+    assert factory.disconnects == 2
+
+
+async def test_profile_change_replaces_client():
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory)
+
+    async with pool.acquire("alice", options=None, options_key=("calc", False)) as block_client:
+        pass
+    async with pool.acquire("alice", options=None, options_key=("calc", True)) as delta_client:
+        pass
+
+    assert block_client is not delta_client
+    await pool.shutdown()
+
+
+async def test_idle_clients_are_closed():
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory, idle_timeout=0.01)
+
+    async with pool.acquire("alice", options=None) as client:
+        pass
+    await asyncio.sleep(0.02)
+    await pool.close_idle()
+    await asyncio.gather(*pool._closing_tasks)
+
+    assert pool.get_stats()["idle_evictions"] == 1
+    assert "alice" not in pool.clients
+    assert not client.connected
+
+
+async def test_idle_reaper_task_closes_clients(monkeypatch):
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory, idle_timeout=0.01)
+    real_sleep = asyncio.sleep
+    # 정리 주기(최소 1초)를 기다리지 않도록 sleep을 짧게 바꿈
+    monkeypatch.setattr("client_pool.asyncio.sleep", lambda _: real_sleep(0.02))
+
+    async with pool.acquire("alice", options=None):
+        pass
+    pool.start()
+    for _ in range(50):
+        if "alice" not in pool.clients:
+            break
+        await real_sleep(0.01)
+
+    assert "alice" not in pool.clients
+    await pool.shutdown()
+
+
+async def test_acquire_times_out_when_pool_is_full():
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory, max_clients=1, acquire_timeout=0.05)
+
+    async with pool.acquire("alice", options=None):
+        with pytest.raises(ClientPoolTimeoutError):
+            async with pool.acquire("bob", options=None):
+                pass
+
+    assert pool.get_stats()["acquire_timeouts"] == 1
+    await pool.shutdown()
+
+
+async def test_waiter_gets_client_after_release():
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory, max_clients=1, acquire_timeout=1)
+    release = asyncio.Event()
+
+    async def hold_alice():
+        async with pool.acquire("alice", options=None):
+            await release.wait()
+
+    holder = asyncio.create_task(hold_alice())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_acquire_once(pool, "bob"))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    release.set()
+    await holder
+    bob_client = await waiter
+
+    # 자리를 만들기 위해 유휴 상태가 된 alice 클라이언트를 정리하고 bob에게 새로 연결
+    assert bob_client is factory.clients[-1]
+    assert pool.get_stats()["capacity_evictions"] == 1
+    await pool.shutdown()
+
+
+async def _acquire_once(pool: ClientPool, user_id: str):
+    async with pool.acquire(user_id, options=None) as client:
+        return client
+
+
+async def test_client_is_discarded_when_block_fails():
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory)
+
+    with pytest.raises(RuntimeError):
+        async with pool.acquire("alice", options=None):
+            raise RuntimeError("turn failed")
+    await asyncio.gather(*pool._closing_tasks)
+
+    assert "alice" not in pool.clients
+    assert factory.disconnects == 1
+
+
+async def test_discard_while_in_use_closes_on_release():
+    factory = FakeClientFactory()
+    pool = ClientPool(client_factory=factory)
+
+    async with pool.acquire("alice", options=None) as client:
+        await pool.discard("alice")
+        assert client.connected
+    await asyncio.gather(*pool._closing_tasks)
+
+    assert "alice" not in pool.clients
+    assert not client.connected
+
+
+async def test_connect_failure_is_raised_and_not_pooled():
+    pool = ClientPool(client_factory=FakeClientFactory(fail_connect=True))
+
+    with pytest.raises(ConnectionError):
+        async with pool.acquire("alice", options=None):
+            pass
+
+    assert pool.clients == {}
+    await pool.shutdown()
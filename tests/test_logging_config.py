@@ -0,0 +1,34 @@
+import logging
+import queue
+
+from logging_config import TEXT_FORMAT, _DeferredQueueHandler
+
+
+def test_record_is_formatted_when_logged():
+    handler = _DeferredQueueHandler(queue.Queue())
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    logger = logging.getLogger("tests.logging_config")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        values = {"a": 1}
+        logger.warning("values %s", values)
+        values["a"] = 2
+    finally:
+        logger.removeHandler(handler)
+
+    record = handler.queue.get_nowait()
+    assert record.getMessage().endswith("values {'a': 1}")
+    assert record.args is None
+
+
+def test_full_queue_drops_records():
+    handler = _DeferredQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("tests", logging.INFO, __file__, 1, "message", None, None)
+    dropped = _DeferredQueueHandler.dropped
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.queue.qsize() == 1
+    assert _DeferredQueueHandler.dropped == dropped + 1
@@ -0,0 +1,29 @@
+import pytest
+
+from password_hasher import PasswordHasherBusyError, PasswordHasherPool
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def pool():
+    hasher = PasswordHasherPool(workers=1, max_pending=1)
+    yield hasher
+    hasher.shutdown()
+
+
+async def test_failed_jobs_are_not_counted_as_completed(pool):
+    assert await pool._submit(int, "42") == 42
+    with pytest.raises(ValueError):
+        await pool._submit(int, "not-a-number")
+
+    stats = pool.get_stats()
+    assert (stats["completed"], stats["failed"], stats["pending"]) == (1, 1, 0)
+
+
+async def test_full_queue_is_rejected(pool):
+    pool._pending = pool.max_pending
+
+    with pytest.raises(PasswordHasherBusyError):
+        await pool.hash("password123")
+    assert pool.get_stats()["rejected"] == 1
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from sse import HEARTBEAT_FRAME, ReplayStream, SSEEvent, keep_alive
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_upstream_idle_timeout_ends_stream_with_error():
+    async def stalled():
+        yield SSEEvent.text("a")
+        await asyncio.sleep(10)
+
+    stream = ReplayStream(owner="alice", idle_timeout=0.05).start(stalled())
+    await asyncio.wait_for(stream.task, timeout=1)
+
+    events = [event async for _, event in stream.subscribe()]
+    assert [event.type for event in events] == ["text", "error"]
+    assert events[-1].data["code"] == "upstream_timeout"
+
+
+async def test_keep_alive_sends_heartbeat_while_idle():
+    async def slow():
+        await asyncio.sleep(0.08)
+        yield "data: x\n\n"
+
+    frames = [frame async for frame in keep_alive(slow(), heartbeat_interval=0.03)]
+
+    assert frames[-1] == "data: x\n\n"
+    assert HEARTBEAT_FRAME in frames
+
+
+async def test_keep_alive_stops_when_client_disconnects():
+    async def endless():
+        while True:
+            await asyncio.sleep(1)
+            yield "data: x\n\n"
+
+    async def disconnected() -> bool:
+        return True
+
+    frames = [frame async for frame in keep_alive(endless(), disconnected, heartbeat_interval=0, poll_interval=0.01)]
+
+    assert frames == []
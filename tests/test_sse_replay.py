@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import pytest
+
+from sse import (
+    ReplayGapError,
+    ReplayStream,
+    ReplayStreamRegistry,
+    SSEEvent,
+    format_event,
+    parse_event_id,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def _events(*texts: str, final: bool = True):
+    for text in texts:
+        yield SSEEvent.text(text)
+    if final:
+        yield SSEEvent.done(" ".join(texts))
+
+
+def test_format_event_v2_and_v1():
+    event = SSEEvent.text("안녕")
+
+    assert format_event(event, 2, "run1:3") == 'event: text\nid: run1:3\ndata: {"text":"안녕"}\n\n'
+    assert json.loads(format_event(event, 1)[len("data: "):]) == {"status": "processing", "result": "안녕"}
+
+
+def test_parse_event_id():
+    assert parse_event_id("abc:12") == ("abc", 12)
+    with pytest.raises(ValueError):
+        parse_event_id("12")
+    with pytest.raises(ValueError):
+        parse_event_id("abc:x")
+
+
+async def test_subscribe_resumes_after_last_event_id():
+    stream = ReplayStream(owner="alice").start(_events("a", "b", "c"))
+    await stream.task
+
+    resumed = [(seq, event.type) async for seq, event in stream.subscribe(after=2)]
+
+    assert resumed == [(3, "text"), (4, "done")]
+
+
+async def test_live_subscriber_receives_new_events():
+    source: asyncio.Queue = asyncio.Queue()
+
+    async def queued():
+        while (event := await source.get()) is not None:
+            yield event
+
+    stream = ReplayStream(owner="alice").start(queued())
+    received = []
+
+    async def consume():
+        async for seq, event in stream.subscribe():
+            received.append((seq, event.data["text"]))
+
+    consumer = asyncio.create_task(consume())
+    for text in ("a", "b"):
+        await source.put(SSEEvent.text(text))
+    await source.put(None)
+    await asyncio.wait_for(consumer, timeout=1)
+
+    assert received == [(1, "a"), (2, "b")]
+
+
+async def test_resume_from_evicted_position_raises_gap():
+    stream = ReplayStream(owner="alice", max_events=2).start(_events("a", "b", "c"))
+    await stream.task
+
+    with pytest.raises(ReplayGapError):
+        async for _ in stream.subscribe(after=1):
+            pass
+
+
+async def test_finished_streams_expire_after_ttl():
+    registry = ReplayStreamRegistry(ttl=0)
+    stream = registry.add(ReplayStream(owner="alice")).start(_events("a"))
+    await stream.task
+
+    assert registry.get(stream.id) is None
+    assert registry.get_stats()["expired"] == 1
+
+
+def _parse_frame(frame: str) -> dict:
+    fields = {}
+    for line in frame.strip().splitlines():
+        name, _, value = line.partition(": ")
+        fields[name] = value
+    return fields
+
+
+async def test_registry_frames_start_with_run_event_and_resume_without_it():
+    registry = ReplayStreamRegistry()
+    stream = registry.add(ReplayStream(owner="alice")).start(_events("a", "b"))
+    await stream.task
+
+    frames = [_parse_frame(frame) async for frame in registry.iter_frames(stream, 0, heartbeat_interval=0)]
+    assert frames[0] == {"event": "run", "data": json.dumps({"run_id": stream.id}, separators=(",", ":"))}
+    assert [f.get("id") for f in frames[1:]] == [f"{stream.id}:1", f"{stream.id}:2", f"{stream.id}:3"]
+
+    resumed = [_parse_frame(frame) async for frame in registry.iter_frames(stream, 2, heartbeat_interval=0)]
+    assert [(f["event"], f["id"]) for f in resumed] == [("done", f"{stream.id}:3")]
+    assert registry.get_stats()["resumed"] == 1
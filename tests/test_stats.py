@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import insert
+
+import crud_async
+from models import User
+from stats import user_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def _add_users(db, rows):
+    await db.execute(insert(User), [{"hashed_password": "x", **row} for row in rows])
+    await db.commit()
+
+
+async def test_delete_updates_every_stats_counter(db):
+    await _add_users(db, [
+        {"email": "a@example.com", "username": "a", "is_active": True, "is_admin": True},
+        {"email": "b@example.com", "username": "b", "is_active": True, "is_admin": False},
+        {"email": "c@example.com", "username": "c", "is_active": False, "is_admin": False},
+    ])
+    before = await user_stats.get(fresh=True)
+    assert (before.total_users, before.active_users, before.admin_users) == (3, 2, 1)
+
+    assert await crud_async.delete_user(db, 1)
+    assert not await crud_async.delete_user(db, 1)
+
+    after = await user_stats.get()
+    assert (after.total_users, after.active_users, after.admin_users) == (2, 1, 0)
+    assert sum(after.signups_per_day.values()) == 2
+    recount = await user_stats.get(fresh=True)
+    assert (recount.total_users, recount.active_users, recount.admin_users) == (2, 1, 0)
@@ -0,0 +1,56 @@
+import time
+
+from ttl_store import LRUTTLStore
+
+
+def test_least_recently_used_entry_is_evicted():
+    evicted = []
+    store = LRUTTLStore(max_entries=2, on_evict=lambda key, value: evicted.append(key))
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+
+    assert evicted == ["b"]
+    assert store.get("a") == 1
+    assert store.get("b") is None
+    assert store.get_stats()["capacity_evictions"] == 1
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ttl_store.time.monotonic", lambda: now[0])
+    evicted = []
+    store = LRUTTLStore(max_entries=10, ttl=5, on_evict=lambda key, value: evicted.append(key))
+    store.set("a", 1)
+    store.set("b", 2)
+
+    now[0] += 3
+    assert store.get("a") == 1  # sliding: 조회하면 만료 시각 연장
+    now[0] += 3
+    assert store.purge_expired() == 1
+    assert evicted == ["b"]
+    assert store.get("a") == 1
+
+
+def test_fixed_ttl_is_not_extended_by_reads(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ttl_store.time.monotonic", lambda: now[0])
+    store = LRUTTLStore(max_entries=10, ttl=5, sliding=False)
+    store.set("a", 1)
+
+    now[0] += 3
+    assert store.get("a") == 1
+    now[0] += 3
+    assert store.get("a") is None
+    assert store.get_stats()["expired_evictions"] == 1
+
+
+def test_pop_does_not_call_on_evict():
+    evicted = []
+    store = LRUTTLStore(max_entries=10, ttl=60, on_evict=lambda key, value: evicted.append(key))
+    store.set("a", time.time())
+
+    assert store.pop("a") is not None
+    assert store.pop("a") is None
+    assert evicted == []
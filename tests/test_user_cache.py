@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import insert
+
+import crud_async
+from models import User
+from schemas import UserUpdate
+from user_cache import user_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def _add_user(db, **values) -> int:
+    row = {"email": "kim@example.com", "username": "kim", "full_name": "Kim", "hashed_password": "x"}
+    row.update(values)
+    result = await db.execute(insert(User).values(**row))
+    await db.commit()
+    return result.inserted_primary_key[0]
+
+
+async def test_lookup_is_cached_until_update(db):
+    user_id = await _add_user(db)
+
+    first = await crud_async.get_user_cached(db, user_id)
+    assert await user_cache.get_by_id(user_id) == first
+    await crud_async.update_user(db, user_id, UserUpdate(full_name="Kim Updated"))
+
+    assert await user_cache.get_by_id(user_id) is None
+    reloaded = await crud_async.get_user_cached(db, user_id)
+    assert reloaded.full_name == "Kim Updated"
+
+
+async def test_email_pointer_does_not_return_user_after_email_change(db):
+    user_id = await _add_user(db)
+    assert (await crud_async.get_user_by_email_cached(db, "kim@example.com")).id == user_id
+
+    await crud_async.update_user(db, user_id, UserUpdate(email="new@example.com"))
+
+    assert await crud_async.get_user_by_email_cached(db, "kim@example.com") is None
+    assert (await crud_async.get_user_by_email_cached(db, "new@example.com")).id == user_id
+
+
+async def test_email_lookup_hits_cache_regardless_of_case(db):
+    user_id = await _add_user(db, email="Kim@example.com")
+    await crud_async.get_user_cached(db, user_id)
+    stale_pointers = user_cache.get_stats()["stale_pointers"]
+
+    for email in ("Kim@example.com", "kim@example.com", "KIM@EXAMPLE.COM"):
+        assert (await user_cache.get_by_email(email)).id == user_id
+    assert user_cache.get_stats()["stale_pointers"] == stale_pointers
+
+
+async def test_etag_304_and_invalidation(db, client):
+    user_id = await _add_user(db)
+
+    first = await client.get(f"/api/users/{user_id}")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+
+    not_modified = await client.get(f"/api/users/{user_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    # 같은 초 안의 두 번 수정도 서로 다른 ETag가 되어야 함 (DATETIME은 초 단위)
+    await crud_async.update_user(db, user_id, UserUpdate(full_name="Kim 2"))
+    second = await client.get(f"/api/users/{user_id}", headers={"If-None-Match": etag})
+    await crud_async.update_user(db, user_id, UserUpdate(full_name="Kim 3"))
+    third = await client.get(f"/api/users/{user_id}", headers={"If-None-Match": second.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.json()["full_name"] == "Kim 2"
+    assert third.status_code == 200
+    assert third.json()["full_name"] == "Kim 3"
+    assert len({etag, second.headers["ETag"], third.headers["ETag"]}) == 3
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import insert
+
+import crud_async
+from models import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def _add_users(db, rows):
+    await db.execute(insert(User), [{"hashed_password": "x", **row} for row in rows])
+    await db.commit()
+
+
+async def test_prefix_search_is_case_insensitive_and_id_ordered(db):
+    await _add_users(db, [
+        {"email": f"user{i}@example.com", "username": f"{'Kim' if i % 2 else 'kim'}{i}", "full_name": f"Lee {i}"}
+        for i in range(10)
+    ] + [{"email": "kimchi@example.com", "username": "park", "full_name": "Park"}])
+
+    first_page = await crud_async.search_users(db, "KIM", limit=4)
+    next_page = await crud_async.search_users(db, "kim", limit=4, after_id=first_page[-1].id)
+    by_email = await crud_async.search_users(db, "kimchi", fields=["email"])
+
+    assert [u.username for u in first_page] == ["kim0", "Kim1", "kim2", "Kim3"]
+    assert [u.username for u in next_page] == ["kim4", "Kim5", "kim6", "Kim7"]
+    assert [u.username for u in by_email] == ["park"]
+
+
+async def test_prefix_search_escapes_like_wildcards(db):
+    await _add_users(db, [
+        {"email": "a@example.com", "username": "a_b"},
+        {"email": "b@example.com", "username": "axb"},
+    ])
+
+    assert [u.username for u in await crud_async.search_users(db, "a_", fields=["username"])] == ["a_b"]
+    assert await crud_async.search_users(db, "%", fields=["username"]) == []
+
+
+async def test_prefix_search_filters_active_users_per_branch(db):
+    await _add_users(db, [
+        {"email": f"kim{i}@example.com", "username": f"kim{i}", "is_active": i >= 5}
+        for i in range(8)
+    ])
+
+    users = await crud_async.search_users(db, "kim", limit=3, active_only=True)
+
+    assert [u.username for u in users] == ["kim5", "kim6", "kim7"]
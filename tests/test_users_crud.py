@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, insert, select
+
+import crud
+import crud_async
+from crud_async import UnsupportedDialectError
+from database import SessionLocal, async_engine, engine
+from models import User
+from schemas import UserCreate, UserUpdate
+from stats import user_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_mysql_only_features_raise_unsupported_dialect(db, monkeypatch):
+    with pytest.raises(UnsupportedDialectError):
+        await crud_async.search_users_fulltext(db, "kim")
+
+    monkeypatch.setattr(db.get_bind().dialect, "name", "postgresql")
+    monkeypatch.setattr(crud_async, "hash_password_async", _fake_hash)
+    with pytest.raises(UnsupportedDialectError):
+        await crud_async.upsert_user(db, UserCreate(email="kim@example.com", username="kim", password="password123"))
+
+
+async def test_unsupported_feature_is_501(db, client):
+    response = await client.get("/api/users/search", params={"q": "kim", "mode": "fulltext"})
+
+    assert response.status_code == 501
+    assert "sqlite" in response.json()["detail"]
+
+
+async def _fake_hash(password: str) -> str:
+    return f"hashed:{password}"
+
+
+async def test_update_response_matches_stored_row(db):
+    await db.execute(insert(User).values(email="kim@example.com", username="kim", hashed_password="x"))
+    await db.commit()
+
+    updated = await crud_async.update_user(db, 1, UserUpdate(full_name="Kim 2"))
+    stored_updated_at = await db.scalar(select(User.updated_at).where(User.id == 1))
+
+    assert updated.updated_at.microsecond == 0
+    assert updated.updated_at == stored_updated_at
+
+
+async def test_delete_without_returning_is_a_single_statement(db, monkeypatch):
+    await db.execute(insert(User), [
+        {"email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x", "is_admin": i == 0}
+        for i in range(2)
+    ])
+    await db.commit()
+    await user_stats.get(fresh=True)
+    monkeypatch.setattr(db.get_bind().dialect, "delete_returning", False)
+
+    with _recorded_statements(async_engine.sync_engine) as statements:
+        assert await crud_async.delete_user(db, 1)
+        assert not await crud_async.delete_user(db, 1)
+
+    assert [statement.split()[0] for statement in statements] == ["DELETE", "DELETE"]
+    assert (await user_stats.get()).total_users == 1
+    # 플래그를 모르는 카운터는 재집계로 맞춤
+    assert user_stats._dirty.is_set()
+    assert (await user_stats.get(fresh=True)).admin_users == 0
+
+
+async def test_sync_create_and_update_skip_refresh(db, monkeypatch):
+    monkeypatch.setattr(crud, "get_password_hash", lambda password: f"hashed:{password}")
+
+    with SessionLocal() as session, _recorded_statements(engine) as statements:
+        created = crud.create_user(session, UserCreate(email="kim@example.com", username="kim", password="password123"))
+        updated = crud.update_user(session, created.id, UserUpdate(full_name="Kim 2"))
+        missing = crud.update_user(session, created.id + 1, UserUpdate(full_name="nobody"))
+        stored = session.execute(select(User.full_name, User.updated_at).where(User.id == created.id)).one()
+
+    assert [statement.split()[0] for statement in statements[:3]] == ["INSERT", "UPDATE", "UPDATE"]
+    assert (created.id, created.is_active, created.is_admin) == (1, True, False)
+    assert (updated.full_name, updated.updated_at) == tuple(stored)
+    assert missing is None
+
+
+@contextmanager
+def _recorded_statements(sync_engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.strip())
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
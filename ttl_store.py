@@ -0,0 +1,119 @@
+"""
+LRU + TTL 저장소
+
+최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목을, 유효 시간이 지나면
+만료된 항목을 제거합니다. 제거될 때마다 on_evict 콜백을 호출하므로
+항목이 들고 있는 리소스(클라이언트 등)를 정리할 수 있습니다.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUTTLStore(Generic[K, V]):
+    """
+    크기 제한과 유효 시간을 가진 키-값 저장소
+
+    sliding=True이면 조회할 때마다 유효 시간이 연장됩니다(세션 용도),
+    False이면 저장 시점부터 ttl초 뒤에 만료됩니다(캐시 용도).
+    ttl이 None이면 시간 만료 없이 LRU로만 동작합니다.
+    """
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+        sliding: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.sliding = sliding
+        self._data: "OrderedDict[K, tuple[V, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._capacity_evictions = 0
+
+    def _deadline(self) -> float:
+        return time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+
+    def get(self, key: K) -> Optional[V]:
+        """항목 조회 (없거나 만료되었으면 None)"""
+        item = self._data.get(key)
+        if item is None:
+            self._misses += 1
+            return None
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            self._evict(key, expired=True)
+            self._misses += 1
+            return None
+        self._data.move_to_end(key)
+        if self.sliding:
+            self._data[key] = (value, self._deadline())
+        self._hits += 1
+        return value
+
+    def set(self, key: K, value: V):
+        """항목 저장 (최대 항목 수를 넘으면 가장 오래된 항목 제거)"""
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = (value, self._deadline())
+        while len(self._data) > self.max_entries:
+            oldest = next(iter(self._data))
+            self._evict(oldest, expired=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """항목을 직접 제거 (on_evict는 호출하지 않음)"""
+        item = self._data.pop(key, None)
+        return item[0] if item is not None else None
+
+    def purge_expired(self) -> int:
+        """만료된 항목을 모두 제거하고 제거한 개수를 반환"""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at <= now]
+        for key in expired:
+            self._evict(key, expired=True)
+        return len(expired)
+
+    def clear(self):
+        """모든 항목 제거 (on_evict 호출)"""
+        for key in list(self._data):
+            self._evict(key, expired=False, count=False)
+
+    def _evict(self, key: K, expired: bool, count: bool = True):
+        value, _ = self._data.pop(key)
+        if count:
+            if expired:
+                self._expired += 1
+            else:
+                self._capacity_evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def __contains__(self, key: K) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[1] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """크기/적중/미스/제거 지표 조회"""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "evictions": self._expired + self._capacity_evictions,
+            "expired_evictions": self._expired,
+            "capacity_evictions": self._capacity_evictions,
+        }
@@ -0,0 +1,175 @@
+"""
+사용자 조회 캐시 (id / email / username read-through)
+
+사용자 조회 API가 매번 DB를 읽지 않도록 응답에 필요한 공개 필드만 TTL 캐시에 보관합니다.
+- id 키에 사용자 정보를, email/username 키에는 id만 저장 (수정/삭제 시 id 키 하나만 지우면 됨)
+- email/username으로 찾은 항목은 값이 일치하는지 다시 확인하므로 이메일이 바뀌어도 잘못된 사용자를 돌려주지 않음
+  (이메일은 DB 비교처럼 대소문자를 구분하지 않음)
+- 쓰기는 crud_async에서 invalidate로 무효화
+
+- InMemoryUserCacheBackend: 단일 워커용 (기본값)
+- UserCacheBackend를 구현하면 워커 간 공유 캐시(예: Redis)로 바꿀 수 있음
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from dataclasses import astuple, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from ttl_store import LRUTTLStore
+from settings import settings
+
+# ==================== 사용자 캐시 설정 ====================
+USER_CACHE_BACKEND = settings.user_cache_backend  # memory
+USER_CACHE_TTL = settings.user_cache_ttl  # 캐시 유효 시간 (초)
+USER_CACHE_MAX_ENTRIES = settings.user_cache_max_entries  # 최대 항목 수 (id/email/username 키 합계)
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """캐시에 보관하는 사용자 공개 정보 (hashed_password 제외)"""
+    id: int
+    email: str
+    username: str
+    full_name: Optional[str]
+    is_active: bool
+    is_admin: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    @property
+    def etag(self) -> str:
+        """
+        공개 필드 내용 기반 ETag
+        updated_at은 초 단위로 저장되어 같은 초에 두 번 수정하면 값이 같으므로 필드 전체를 해시
+        """
+        digest = hashlib.blake2b(repr(astuple(self)).encode("utf-8"), digest_size=8).hexdigest()
+        return f'"{self.id}-{digest}"'
+
+
+class UserCacheBackend(ABC):
+    """사용자 캐시 저장소 인터페이스"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """키 조회 (없거나 만료됐으면 None)"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any):
+        """키 저장"""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """키 삭제"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장소 지표 조회"""
+        return {}
+
+
+class InMemoryUserCacheBackend(UserCacheBackend):
+    """프로세스 메모리에 보관하는 사용자 캐시 (워커 간 공유되지 않음)"""
+    def __init__(self, max_entries: int = USER_CACHE_MAX_ENTRIES, ttl: float = USER_CACHE_TTL):
+        self._store: LRUTTLStore[str, Any] = LRUTTLStore(max_entries=max_entries, ttl=ttl, sliding=False)
+
+    async def get(self, key: str) -> Any:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any):
+        self._store.set(key, value)
+
+    async def delete(self, key: str):
+        self._store.pop(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._store.get_stats()
+
+
+def create_user_cache_backend(kind: str = USER_CACHE_BACKEND) -> UserCacheBackend:
+    """설정값(memory)에 맞는 사용자 캐시 저장소 생성"""
+    if kind == "memory":
+        return InMemoryUserCacheBackend()
+    raise ValueError(f"지원하지 않는 사용자 캐시 저장소입니다: {kind}")
+
+
+def _email_key(email: str) -> str:
+    return f"email:{email.lower()}"
+
+
+class UserCache:
+    """
+    id/email/username -> CachedUser 캐시
+    """
+    def __init__(self, backend: Optional[UserCacheBackend] = None):
+        self.backend = backend or create_user_cache_backend()
+        # 조회 중에 무효화가 일어나면 DB에서 읽은 (이미 오래된) 값을 캐시하지 않도록 세대 번호 사용
+        self._generation = 0
+        self._invalidations = 0
+        self._stale_pointers = 0
+
+    async def get_by_id(self, user_id: int) -> Optional[CachedUser]:
+        return await self.backend.get(f"id:{user_id}")
+
+    async def get_by_email(self, email: str) -> Optional[CachedUser]:
+        # DB의 이메일 비교(MySQL 기본 콜레이션)처럼 대소문자를 구분하지 않음
+        return await self._get_by_pointer(_email_key(email), "email", email, str.lower)
+
+    async def get_by_username(self, username: str) -> Optional[CachedUser]:
+        return await self._get_by_pointer(f"username:{username}", "username", username)
+
+    async def _get_by_pointer(
+        self, key: str, field: str, value: str, normalize: Callable[[str], str] = str
+    ) -> Optional[CachedUser]:
+        user_id = await self.backend.get(key)
+        if user_id is None:
+            return None
+        user = await self.get_by_id(user_id)
+        if user is None or normalize(getattr(user, field)) != normalize(value):
+            self._stale_pointers += 1
+            return None
+        return user
+
+    def begin_load(self) -> int:
+        """DB 조회 직전에 호출, 반환값을 set()에 넘김"""
+        return self._generation
+
+    async def set(self, user, generation: Optional[int] = None) -> CachedUser:
+        """DB에서 읽은 사용자를 캐시 (조회 중 무효화가 있었으면 저장하지 않음)"""
+        cached = CachedUser.from_user(user)
+        if generation is not None and generation != self._generation:
+            return cached
+        await self.backend.set(f"id:{cached.id}", cached)
+        await self.backend.set(_email_key(cached.email), cached.id)
+        await self.backend.set(f"username:{cached.username}", cached.id)
+        return cached
+
+    async def invalidate(self, user_id: int):
+        """사용자 정보가 바뀌었을 때 캐시 제거 (email/username 키는 조회 시 검증되므로 id 키만 삭제)"""
+        self._generation += 1
+        self._invalidations += 1
+        await self.backend.delete(f"id:{user_id}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중률/무효화 지표 조회"""
+        stats = dict(self.backend.get_stats())
+        stats["backend"] = type(self.backend).__name__
+        stats["invalidations"] = self._invalidations
+        stats["stale_pointers"] = self._stale_pointers
+        return stats
+
+
+# 전역 사용자 캐시
+user_cache = UserCache()
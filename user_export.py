@@ -0,0 +1,91 @@
+"""
+사용자 대량 내보내기 (NDJSON / CSV 스트리밍)
+
+서버 측 커서(stream_results + yield_per)로 행을 배치 단위로 읽어 바로 내보내므로
+테이블 크기와 관계없이 메모리 사용량이 일정합니다.
+hashed_password는 내보내기 대상 컬럼에 포함되지 않습니다.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from sqlalchemy import select
+from database import AsyncSessionLocal
+from models import User
+
+# 내보낼 수 있는 컬럼 (hashed_password 제외)
+EXPORT_COLUMNS: Dict[str, object] = {
+    "id": User.id,
+    "email": User.email,
+    "username": User.username,
+    "full_name": User.full_name,
+    "is_active": User.is_active,
+    "is_admin": User.is_admin,
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+}
+
+EXPORT_BATCH_SIZE = 1000  # 한 번에 가져와 직렬화할 행 수
+
+
+def parse_export_fields(fields: Optional[str] = None) -> List[str]:
+    """쉼표로 구분된 필드 목록 검증 (없으면 전체 컬럼)"""
+    if not fields:
+        return list(EXPORT_COLUMNS)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"내보낼 수 없는 필드입니다: {', '.join(unknown)}")
+    return names
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"직렬화할 수 없는 값입니다: {type(value)}")
+
+
+def _format_ndjson(fields: Sequence[str], rows: Sequence[Sequence]) -> str:
+    return "".join(
+        json.dumps(dict(zip(fields, row)), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _format_csv(rows: Sequence[Sequence]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def iter_users_export(
+    export_format: str = "ndjson",
+    fields: Sequence[str] = tuple(EXPORT_COLUMNS),
+    active_only: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[str]:
+    """
+    사용자 행을 NDJSON 또는 CSV 문자열 조각으로 스트리밍
+    (응답이 끝날 때까지 유지되도록 요청 의존성과 별도의 DB 세션을 사용)
+    """
+    stmt = select(*(EXPORT_COLUMNS[name] for name in fields)).order_by(User.id)
+    if active_only:
+        stmt = stmt.where(User.is_active == True)
+    stmt = stmt.execution_options(yield_per=batch_size)
+
+    if export_format == "csv":
+        yield _format_csv([list(fields)])
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            if export_format == "csv":
+                yield _format_csv(rows)
+            else:
+                yield _format_ndjson(fields, rows)
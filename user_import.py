@@ -0,0 +1,87 @@
+"""
+사용자 대량 가져오기 요청 파싱 (JSON 배열 / NDJSON)
+
+JSON 배열은 한 번에 읽고, NDJSON은 요청 본문을 스트리밍으로 읽으면서 줄 단위로 검증합니다.
+형식이 잘못된 행은 요청 전체를 거절하지 않고 행별 오류로 돌려줍니다.
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+from fastapi import Request
+from pydantic import ValidationError
+from schemas import UserCreate
+from settings import settings
+
+BULK_CREATE_MAX_ROWS = settings.bulk_create_max_rows  # 요청 한 번에 받을 최대 행 수
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class BulkPayloadError(ValueError):
+    """요청 본문 자체를 처리할 수 없는 경우"""
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _validate_row(index: int, raw: Any, valid: List[Tuple[int, UserCreate]], errors: List[Dict[str, Any]]):
+    try:
+        valid.append((index, UserCreate.model_validate(raw)))
+    except ValidationError as e:
+        message = "; ".join(
+            f"{'.'.join(str(loc) for loc in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+        )
+        email = raw.get("email") if isinstance(raw, dict) else None
+        errors.append({"index": index, "status": "error", "email": email, "error": message})
+
+
+async def _iter_ndjson_lines(request: Request):
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def parse_bulk_users(
+    request: Request,
+    max_rows: int = BULK_CREATE_MAX_ROWS
+) -> Tuple[List[Tuple[int, UserCreate]], List[Dict[str, Any]]]:
+    """
+    요청 본문을 (행 번호, UserCreate) 목록과 행별 검증 오류 목록으로 변환
+    Content-Type이 NDJSON이면 줄 단위, 그 외에는 JSON 배열로 처리
+    """
+    valid: List[Tuple[int, UserCreate]] = []
+    errors: List[Dict[str, Any]] = []
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in NDJSON_MEDIA_TYPES:
+        index = 0
+        async for line in _iter_ndjson_lines(request):
+            if not line.strip():
+                continue
+            if index >= max_rows:
+                raise BulkPayloadError(f"한 번에 최대 {max_rows}건까지 생성할 수 있습니다.", status_code=413)
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                errors.append({"index": index, "status": "error", "email": None, "error": "JSON 형식이 아닙니다."})
+            else:
+                _validate_row(index, raw, valid, errors)
+            index += 1
+        return valid, errors
+
+    try:
+        payload = await request.json()
+    except ValueError as e:
+        raise BulkPayloadError("요청 본문이 올바른 JSON이 아닙니다.") from e
+    if not isinstance(payload, list):
+        raise BulkPayloadError("요청 본문은 사용자 객체의 JSON 배열이어야 합니다.")
+    if len(payload) > max_rows:
+        raise BulkPayloadError(f"한 번에 최대 {max_rows}건까지 생성할 수 있습니다.", status_code=413)
+    for index, raw in enumerate(payload):
+        _validate_row(index, raw, valid, errors)
+    return valid, errors